@@ -52,6 +52,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'recipes.middleware.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,6 +89,18 @@ DATABASES = {
     }
 }
 
+# Kept on disk rather than in process memory, so invalidating an entry in one worker process
+# clears it for every process on the host
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+    }
+}
+
+# Swaps in an in-memory cache while tests run, so they never touch the cache directory above
+TEST_RUNNER = 'recipes.tests.runner.TestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,6 +144,17 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    # Uploaded post, recipe and profile images, stored once per distinct content under MEDIA_ROOT
+    'images': {'BACKEND': 'recipes.storage.ContentAddressedStorage'},
+}
+
+# Show users without a profile picture a locally rendered initials avatar instead of their Gravatar.
+# Avatar URLs are stored per user, so run `python manage.py refresh_avatar_urls` after changing this
+LOCAL_AVATARS = os.environ.get('LOCAL_AVATARS', '').lower() in ('1', 'true', 'yes')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -139,6 +163,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # User model for authentication and login purposes
 AUTH_USER_MODEL = 'recipes.User'
 
+# Loads the signed-in user's profile in the same query as the user. ModelBackend stays listed
+# so sessions signed in before ProfileModelBackend existed, which name it, stay valid
+AUTHENTICATION_BACKENDS = [
+    'recipes.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Login URL for redirecting users from login protected views
 LOGIN_URL = 'log_in'
 
@@ -27,11 +27,15 @@ urlpatterns = [
     path('', views.welcome, name='home'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('tracker/', views.tracker, name='tracker'),
+    path('tracker/export/', views.export_tracker_data, name='export_tracker_data'),
+    path('tracker/import/', views.import_tracker_data, name='import_tracker_data'),
     path('water-history/', views.water_history, name='water_history'),
     path('fasting-history/', views.fasting_history, name='fasting_history'),
     path('nutrition-history/', views.nutrition_history, name='nutrition_history'),
+    path('api/history/<str:metric>/', views.history_api, name='history_api'),
     path('add-meal/', views.add_meal, name='add_meal'),
     path('delete-meal/<int:meal_id>/', views.delete_meal, name='delete_meal'),
+    path('api/meals/', views.log_meals, name='log_meals'),
     path('login/', views.LogInView.as_view(), name='log_in'),
     path('logout/', views.log_out, name='log_out'),
     path('password/', views.PasswordView.as_view(), name='password'),
@@ -39,6 +43,7 @@ urlpatterns = [
     path('settings/', views.SettingsView.as_view(), name='settings'),
     path('signup/', views.SignUpView.as_view(), name='sign_up'),
     path('feed/', views.feed, name='feed'),
+    path('feed/more/', views.feed_page, name='feed_page'),
     path('create-post/', views.create_post, name='create_post'),
     path('recipes/', views.recipes, name='recipes'),
     path('my-recipes/', views.my_recipes, name='my_recipes'),
@@ -51,6 +56,7 @@ urlpatterns = [
     path('post/<int:post_id>/save/', views.toggle_save, name='toggle_save'),
     path('post/<int:post_id>/rate/', views.submit_rating, name='submit_rating'),
     path('post/<int:post_id>/comment/', views.submit_comment, name='submit_comment'),
+    path('post/<int:post_id>/comments/', views.post_comments, name='post_comments'),
     path('post/<int:post_id>/delete/', views.delete_post, name='delete_post'),
     path('post/<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('user/<int:author_id>/follow/', views.toggle_follow, name='toggle_follow'),
@@ -87,4 +93,4 @@ urlpatterns = [
     ),
 ]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += static(settings.MEDIA_URL, view=views.serve_media, document_root=settings.MEDIA_ROOT)
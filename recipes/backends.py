@@ -0,0 +1,19 @@
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    Authentication backend that loads the signed-in user together with their Profile.
+
+    The profile is read on nearly every page, by the context processors and the
+    tracker views, so joining it onto the per-request user lookup saves a query.
+    """
+
+    def get_user(self, user_id):
+        from recipes.models import User
+
+        try:
+            user = User._default_manager.select_related('profile').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -1,19 +1,49 @@
-from django.core.exceptions import ObjectDoesNotExist
-from recipes.models import Profile
+from functools import lru_cache
+from recipes.helpers import get_user_profile
+
+
+# Default for non-authenticated users, which never touch a profile
+ANONYMOUS_THEME = {
+    'body_classes': '',
+    'body_styles': '',
+    'user_theme': 'light',
+}
 
 
 def user_profile(request):
     """Context processor to safely provide user profile settings."""
     context = {}
     if request.user.is_authenticated:
-        try:
-            context['user_profile'] = request.user.profile
-        except ObjectDoesNotExist:
-            # Profile doesn't exist yet, create it with defaults
-            context['user_profile'] = Profile.objects.create(user=request.user)
+        context['user_profile'] = get_user_profile(request.user)
     return context
 
 
+@lru_cache(maxsize=256)
+def theme_attributes(theme, color_blind_mode, font_scale):
+    """
+    Return the body classes and inline styles for a combination of display settings.
+
+    The result depends on nothing but the three settings, which have few
+    distinct values between them, so each combination is built once per process
+    and a settings change simply looks up a different entry.
+    """
+    body_classes = []
+    body_styles = ""
+
+    # Build classes list - only add dark-mode if explicitly set (not system)
+    if theme == 'dark':
+        body_classes.append('dark-mode')
+
+    if color_blind_mode != 'none':
+        body_classes.append(f'cb-{color_blind_mode}')
+
+    # Build styles string
+    if font_scale != 1.0:
+        body_styles = f"font-size: {font_scale}rem;"
+
+    return ' '.join(body_classes), body_styles
+
+
 def user_theme_context(request):
     """
     Context processor to provide theme-related classes and styles for the body tag.
@@ -23,32 +53,13 @@ def user_theme_context(request):
               'body_styles' (inline CSS styles string), and
               'user_theme' (the user's theme preference: 'system', 'light', or 'dark').
     """
-    body_classes = []
-    body_styles = ""
-    user_theme = "light"  # Default for non-authenticated users
-    
-    if request.user.is_authenticated:
-        try:
-            profile = request.user.profile
-        except ObjectDoesNotExist:
-            # Profile doesn't exist yet, create it with defaults
-            profile = Profile.objects.create(user=request.user)
-        
-        user_theme = profile.theme
-        
-        # Build classes list - only add dark-mode if explicitly set (not system)
-        if profile.theme == 'dark':
-            body_classes.append('dark-mode')
-        
-        if profile.color_blind_mode != 'none':
-            body_classes.append(f'cb-{profile.color_blind_mode}')
-        
-        # Build styles string
-        if profile.font_scale != 1.0:
-            body_styles = f"font-size: {profile.font_scale}rem;"
-    
+    if not request.user.is_authenticated:
+        return ANONYMOUS_THEME
+
+    profile = get_user_profile(request.user)
+    body_classes, body_styles = theme_attributes(profile.theme, profile.color_blind_mode, profile.font_scale)
     return {
-        'body_classes': ' '.join(body_classes),
+        'body_classes': body_classes,
         'body_styles': body_styles,
-        'user_theme': user_theme,
+        'user_theme': profile.theme,
     }
@@ -1,19 +1,70 @@
 ### Helper function and classes go here.
 
+import base64
+import binascii
+import json
+import re
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import QuerySet
+from django.utils.dateparse import parse_datetime
 
-def is_liked_util(post_id: int, liked_posts_set: set) -> bool:
-    """Checks if the post ID is in the set of liked posts."""
-    return post_id in liked_posts_set
+def get_user_profile(user):
+    """
+    Return the user's Profile, creating it with the default goals if missing.
 
-def is_saved_util(post_id: int, saved_posts_set: set) -> bool:
-    """Checks if the post ID is in the set of saved posts."""
-    return post_id in saved_posts_set
+    Reads through user.profile, which Django caches on the user instance, so the
+    view and the context processors of one request share a single fetched row.
+    Profiles are created at signup, so the fallback only covers a deleted one.
+    """
+    from recipes.models import Profile
 
-def is_followed_util(author_id: int, is_following_map: dict) -> bool:
-    """Checks if the author ID is in the following map."""
-    return is_following_map.get(author_id, False)
+    try:
+        return user.profile
+    except ObjectDoesNotExist:
+        profile, _ = Profile.objects.get_or_create(user=user)
+        user.profile = profile
+        return profile
 
-def get_rating_util(post_id: int, user_ratings_dict: dict) -> int:
-    """Returns the user's rating score for a given post ID."""
-    return user_ratings_dict.get(post_id, 0)
\ No newline at end of file
+def parse_total_minutes(total_time: str):
+    """
+    Returns the number of minutes in a recipe time like '25 min', '1.5 hours' or '1 hr 30 minutes'.
+    Hours may be written as 'hour', 'hr' or 'h'. A bare number counts as minutes.
+    Returns None if no duration can be read.
+    """
+    if not total_time:
+        return None
+
+    text = total_time.lower()
+    hours = re.search(r'(\d+(?:\.\d+)?)\s*h(?:(?:ou)?rs?)?\b', text)
+    minutes = re.search(r'(\d+(?:\.\d+)?)\s*min', text)
+    if hours or minutes:
+        return round((float(hours.group(1)) * 60 if hours else 0) + (float(minutes.group(1)) if minutes else 0))
+
+    bare_number = re.fullmatch(r'\s*(\d+)\s*', text)
+    return int(bare_number.group(1)) if bare_number else None
+
+def encode_feed_cursor(post, rating=None) -> str:
+    """Returns an opaque cursor pointing just after the given post in the feed ordering."""
+    payload = {'created_at': post.created_at.isoformat(), 'id': post.id}
+    if rating is not None:
+        payload['rating'] = float(rating)
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_feed_cursor(cursor: str):
+    """Returns the keyset values stored in a feed cursor, or None if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(payload['created_at'])
+        post_id = int(payload['id'])
+        rating = payload.get('rating')
+        if rating is not None:
+            rating = float(rating)
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    if created_at is None:
+        return None
+    return {'created_at': created_at, 'id': post_id, 'rating': rating}
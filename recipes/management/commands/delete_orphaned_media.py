@@ -0,0 +1,85 @@
+"""
+Management command to remove uploaded images that no row refers to.
+
+Deleting an image or its row queues the removal of its file, but files
+left behind by rows deleted before that, by failed tasks or by uploads
+whose row was never saved stay in the media directory. This command walks
+the upload directories of Post.image, Recipe.image and User.profile_picture
+one chunk of files at a time, asks the database which of each chunk are
+still referenced, and deletes the rest.
+"""
+
+import time
+from itertools import islice
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from recipes.services import MediaService
+from recipes.storage import select_image_storage
+
+
+class Command(BaseCommand):
+    """
+    Management command to garbage-collect orphaned media files.
+
+    Files modified within the grace period are never deleted, so an upload
+    that is stored but whose row isn't saved yet, or an image that is being
+    processed, is left alone. A rendition counts as referenced when the image
+    it was made from is.
+    """
+
+    help = 'Reports or deletes uploaded image files that no post, recipe or user refers to'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report orphaned files without deleting them.',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Leave files modified within this many hours alone (default: 24).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of files checked against the database per query (default: 500).',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the sweep."""
+        service = MediaService()
+        storage = select_image_storage()
+        cutoff = time.time() - options['grace_hours'] * 60 * 60
+        files = service.stored_files()
+        orphans = total_size = skipped = 0
+        while chunk := list(islice(files, options['chunk_size'])):
+            settled = []
+            for name, size, modified in chunk:
+                if modified > cutoff:
+                    skipped += 1
+                else:
+                    settled.append((name, size))
+            referenced = service.referenced([name for name, _ in settled])
+            for name, size in settled:
+                if name in referenced:
+                    continue
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"  {name} ({filesizeformat(size)})")
+                if not options['dry_run']:
+                    storage.delete(name)
+                orphans += 1
+                total_size += size
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f"Found {orphans} orphaned file(s) using {filesizeformat(total_size)}."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {orphans} orphaned file(s), freeing {filesizeformat(total_size)}."
+            ))
+        if skipped:
+            self.stdout.write(f"Left {skipped} file(s) modified within the grace period alone.")
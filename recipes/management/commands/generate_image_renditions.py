@@ -0,0 +1,53 @@
+"""
+Management command to run images uploaded before the rendition pipeline through it.
+
+New uploads to Post.image, Recipe.image and User.profile_picture are
+normalized and get their WebP renditions from a background task. This
+command does the same, in the foreground, for stored images that have no
+recorded source width, and removes each original once its normalized copy
+is stored.
+"""
+
+from django.core.management.base import BaseCommand
+from recipes.services import MediaService
+
+
+class Command(BaseCommand):
+    """
+    Management command to generate missing image renditions.
+
+    Images whose file is missing from media storage, such as the bundled
+    recipe photos served as static files, are left untouched.
+    """
+
+    help = 'Normalizes stored images and writes their renditions where they are missing'
+
+    def handle(self, *args, **options):
+        """Execute the backfill."""
+        processed = skipped = 0
+        for model, field in MediaService().image_fields():
+            pending = (
+                model.objects.filter(**{f'{field.source_width_field}__isnull': True})
+                .exclude(**{field.name: ''})
+                .exclude(**{f'{field.name}__isnull': True})
+            )
+            for instance in pending.iterator():
+                if self._process(instance, field):
+                    processed += 1
+                else:
+                    skipped += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Generated renditions for {processed} image(s)."))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"Skipped {skipped} image(s) that are missing or unreadable."))
+
+    def _process(self, instance, field):
+        image = getattr(instance, field.name)
+        if not image.storage.exists(image.name):
+            return False
+        try:
+            image.generate_renditions()
+        except OSError as error:
+            self.stdout.write(f"  {instance._meta.model_name} {instance.pk}: {image.name} could not be read ({error})")
+            return False
+        return True
@@ -0,0 +1,27 @@
+"""
+Management command to rebuild the per-day nutrition totals from the Meal table.
+
+DailyNutrition rows are maintained incrementally as meals are saved and
+deleted. This command recomputes all of them with a single grouped query,
+for backfilling or after meals were changed in bulk.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from recipes.services import NutritionRollupService
+
+
+class Command(BaseCommand):
+    """
+    Management command to rebuild DailyNutrition rollups.
+
+    Replaces every DailyNutrition row with totals summed from Meal.
+    """
+
+    help = 'Rebuilds the per-day consumed calorie and macro totals from logged meals'
+
+    def handle(self, *args, **options):
+        """Execute the rebuild."""
+        with transaction.atomic():
+            days = NutritionRollupService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt nutrition totals for {days} day(s)."))
@@ -0,0 +1,71 @@
+"""
+Management command to repair drifted like/comment/save counters on posts.
+
+The counters on Post are maintained incrementally by the social feed views.
+This command recomputes them from the interaction tables in a single bulk
+UPDATE and reports how many posts had drifted.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from recipes.models import Post, Like, Comment, Save
+
+
+COUNTED_RELATIONS = {
+    'like_count': Like,
+    'comment_count': Comment,
+    'save_count': Save,
+}
+
+
+def actual_count(model):
+    """Return a subquery expression counting a post's rows in the given interaction table."""
+    counts = (
+        model.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class Command(BaseCommand):
+    """
+    Management command to reconcile denormalised post counters.
+
+    Compares like_count, comment_count and save_count against the real
+    number of Like, Comment and Save rows and rewrites the drifted ones.
+    """
+
+    help = 'Recomputes drifted like/comment/save counters on posts in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted posts without updating them.',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the reconciliation."""
+        annotations = {f'actual_{field}': actual_count(model) for field, model in COUNTED_RELATIONS.items()}
+        drift = Q()
+        for field in COUNTED_RELATIONS:
+            drift |= ~Q(**{field: F(f'actual_{field}')})
+
+        drifted_ids = list(Post.objects.annotate(**annotations).filter(drift).values_list('pk', flat=True))
+
+        if not drifted_ids:
+            self.stdout.write(self.style.SUCCESS("All post counters are correct."))
+            return
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(drifted_ids)} post(s) have drifted counters."))
+            return
+
+        Post.objects.filter(pk__in=drifted_ids).update(
+            **{field: actual_count(model) for field, model in COUNTED_RELATIONS.items()}
+        )
+        self.stdout.write(self.style.SUCCESS(f"Reconciled counters on {len(drifted_ids)} post(s)."))
@@ -0,0 +1,42 @@
+"""
+Management command to recompute the avatar URL stored on every user.
+
+User.avatar_url is worked out when a user is saved, so it goes stale when
+LOCAL_AVATARS is switched or AvatarService changes how avatars are drawn.
+This command works it out again for every user and writes the ones that
+changed in bulk.
+"""
+
+from itertools import islice
+from django.core.management.base import BaseCommand
+from recipes.models import User
+from recipes.services import AvatarService
+
+
+class Command(BaseCommand):
+    """
+    Management command to refresh stored avatar URLs.
+
+    Users are read and written in chunks, so the whole table is never held
+    in memory. Initials avatars that aren't stored yet are rendered on the way.
+    """
+
+    help = 'Recomputes the stored avatar URL of every user, e.g. after changing LOCAL_AVATARS'
+
+    CHUNK_SIZE = 500
+
+    def handle(self, *args, **options):
+        """Execute the refresh."""
+        service = AvatarService()
+        users = User.objects.only('email', 'first_name', 'last_name', 'avatar_url').iterator(chunk_size=self.CHUNK_SIZE)
+        refreshed = 0
+        while chunk := list(islice(users, self.CHUNK_SIZE)):
+            changed = []
+            for user in chunk:
+                avatar_url = service.avatar_url(user)
+                if avatar_url != user.avatar_url:
+                    user.avatar_url = avatar_url
+                    changed.append(user)
+            User.objects.bulk_update(changed, ['avatar_url'])
+            refreshed += len(changed)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} avatar URL(s)."))
@@ -0,0 +1,81 @@
+"""
+Management command to run queued background tasks.
+
+Tasks are rows of the Task table, queued with TaskQueueService.enqueue, for
+work that shouldn't hold up a request such as processing uploaded images.
+The worker polls for due tasks and runs them on a pool of threads. Several
+workers can run at once, since each task is claimed with a conditional UPDATE.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from recipes.services import TaskQueueService
+
+
+class Command(BaseCommand):
+    """
+    Management command to process the task queue.
+
+    Runs until interrupted, or with --once until no task is due.
+    """
+
+    help = 'Runs queued background tasks such as image processing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=2,
+            help='Number of tasks to run at a time; 1 runs them in the worker thread itself.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait before checking again when no task is due.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no task is due instead of waiting for more.',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the worker loop."""
+        service = TaskQueueService()
+        threads = max(1, options['threads'])
+        executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+        succeeded = failed = 0
+        try:
+            while True:
+                tasks = service.claim(threads * 4)
+                if not tasks:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                if executor:
+                    results = list(executor.map(lambda task: self._run(service, task), tasks))
+                else:
+                    results = [service.run(task) for task in tasks]
+                succeeded += results.count(True)
+                failed += results.count(False)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping worker.")
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {succeeded} task(s)."))
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} task(s) failed and were retried or given up on."))
+
+    @staticmethod
+    def _run(service, task):
+        # Pool threads hold their own database connections, which Django doesn't close for them
+        try:
+            return service.run(task)
+        finally:
+            close_old_connections()
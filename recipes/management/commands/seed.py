@@ -13,6 +13,7 @@ from datetime import timedelta, date, datetime
 from django.conf import settings
 from django.core.files import File
 from recipes.models import User, Recipe, Profile, Meal, DailyLog, FastingSession, Tag, Post, Like, Comment, Rating
+from recipes.services import TimelineService
 
 
 # User fixtures
@@ -217,6 +218,7 @@ class Command(BaseCommand):
         self.create_post_interactions()
         
         self.stdout.write(self.style.SUCCESS("Seeding complete!"))
+        self.stdout.write("Run 'python manage.py run_worker --once' to process the seeded post images.")
 
     # ==================== USERS ====================
 
@@ -279,6 +281,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("  No users found. Skipping recipes."))
             return
         
+        base_recipes_created = self.create_base_recipes()
+
         # Create random recipes for each user (no base recipes)
         user_recipes_created = 0
         for user in users:
@@ -290,9 +294,23 @@ class Command(BaseCommand):
                 if recipe:
                     user_recipes_created += 1
         
+        self.stdout.write(f"  Base Recipes: {base_recipes_created}")
         self.stdout.write(f"  User Recipes: {user_recipes_created}")
         self.stdout.write(f"  Total Recipes: {Recipe.objects.count()}")
     
+    def create_base_recipes(self):
+        """Create the reference recipes, flagged so the browse page hides them."""
+        created_count = 0
+        for data in RECIPES_DATA:
+            _, created = Recipe.objects.get_or_create(
+                name=data['name'],
+                source=Recipe.Source.BASE,
+                defaults={**data, 'method': self.convert_method_to_newlines(data['method'])},
+            )
+            if created:
+                created_count += 1
+        return created_count
+
     def create_random_recipe_for_user(self, user):
         """Create a random recipe assigned to a specific user."""
         # Recipe name variations
@@ -417,9 +435,9 @@ class Command(BaseCommand):
         self.stdout.write(f"  Fasting Sessions: {FastingSession.objects.count()}")
 
     def create_profile_for_user(self, user):
-        """Create a Profile with random goals for a user."""
+        """Give a user's Profile, created at signup, random goals."""
         try:
-            Profile.objects.get_or_create(
+            Profile.objects.update_or_create(
                 user=user,
                 defaults={
                     'calorie_goal': randint(1500, 3000),
@@ -670,6 +688,8 @@ class Command(BaseCommand):
                 if tags:
                     random_tags = sample(tags, k=randint(1, 3))
                     post.tags.set(random_tags)
+
+                TimelineService(author).publish(post)
             except:
                 pass
         
@@ -703,12 +723,17 @@ class Command(BaseCommand):
             # Generate Comments
             num_comments = randint(0, 5)
             commenters = sample(users, k=min(num_comments, len(users)))
+            comment_count = 0
             for user in commenters:
                 try:
                     Comment.objects.create(user=user, post=post, text=choice(comments_list))
+                    comment_count += 1
                 except:
                     pass
 
+            post.like_count = len(likers)
+            post.comment_count = comment_count
+
             # Generate Ratings
             num_ratings = randint(0, 15)
             raters = sample(users, k=min(num_ratings, len(users)))
@@ -725,7 +750,8 @@ class Command(BaseCommand):
             if num_ratings > 0:
                 post.rating_count = num_ratings
                 post.rating_total_score = total_score
-                post.save()
+                post.ranking_score = Post.compute_ranking_score(total_score, num_ratings)
+            post.save()
 
         self.stdout.write(f"  Likes: {Like.objects.count()}")
         self.stdout.write(f"  Comments: {Comment.objects.count()}")
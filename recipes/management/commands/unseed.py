@@ -7,7 +7,7 @@ recipes, and non-staff users - essentially resetting the database to a clean sta
 
 from django.core.management.base import BaseCommand
 from recipes.models import (
-    User, FastingSession, Meal, DailyLog, Profile, 
+    User, FastingSession, Meal, DailyLog, DailyNutrition, MealStreak, Profile, 
     Post, Follow, Save, Like, Comment, Tag, Recipe, Rating
 )
 
@@ -42,6 +42,8 @@ class Command(BaseCommand):
         self.stdout.write("  Clearing tracker data...")
         FastingSession.objects.all().delete()
         Meal.objects.all().delete()
+        DailyNutrition.objects.all().delete()
+        MealStreak.objects.all().delete()
         DailyLog.objects.all().delete()
         
         # Clear recipes
@@ -0,0 +1,52 @@
+"""
+Management command to check the stored meal streaks against the Meal table.
+
+MealStreak rows are maintained incrementally as meals are saved and deleted.
+This command recomputes every user's streaks from their meal history and
+reports the users whose stored values disagree, optionally repairing them.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from recipes.services import MealStreakService
+
+
+class Command(BaseCommand):
+    """
+    Management command to verify MealStreak rows.
+
+    Compares each user's current streak, longest streak and last logged
+    date with a full recompute from their meals.
+    """
+
+    help = 'Compares stored meal streaks with a full recompute from logged meals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Rewrite the streaks that differ from the recompute.',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the verification."""
+        service = MealStreakService()
+        mismatches = service.verify()
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All meal streaks are correct."))
+            return
+
+        for user_id, stored, expected in mismatches:
+            self.stdout.write(
+                f"  User {user_id}: stored (current, longest, last) = {stored}, expected {expected}"
+            )
+
+        if not options['fix']:
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} user(s) have incorrect meal streaks."))
+            return
+
+        with transaction.atomic():
+            for user_id, _, _ in mismatches:
+                service.recompute(user_id)
+        self.stdout.write(self.style.SUCCESS(f"Repaired meal streaks for {len(mismatches)} user(s)."))
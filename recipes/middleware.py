@@ -0,0 +1,19 @@
+from django.utils.functional import SimpleLazyObject
+from recipes.helpers import get_user_profile
+
+
+class ProfileMiddleware:
+    """
+    Attach the signed-in user's Profile to the request as request.profile.
+
+    The profile is loaded on first use, through the same user instance the
+    context processors read, so a request fetches it at most once. Only read
+    it in views that require a signed-in user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(lambda: get_user_profile(request.user))
+        return self.get_response(request)
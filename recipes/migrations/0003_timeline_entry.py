@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_timelines(apps, schema_editor):
+    """Materialise existing timelines: each author's own posts plus posts by followed authors."""
+    Post = apps.get_model('recipes', 'Post')
+    Follow = apps.get_model('recipes', 'Follow')
+    TimelineEntry = apps.get_model('recipes', 'TimelineEntry')
+
+    followers_by_author = {}
+    for follower_id, followed_id in Follow.objects.values_list('follower_id', 'followed_id').iterator():
+        followers_by_author.setdefault(followed_id, []).append(follower_id)
+
+    batch = []
+    for post_id, author_id, created_at in Post.objects.values_list('id', 'author_id', 'created_at').iterator():
+        for user_id in [author_id, *followers_by_author.get(author_id, [])]:
+            batch.append(TimelineEntry(user_id=user_id, post_id=post_id, author_id=author_id, created_at=created_at))
+        if len(batch) >= 500:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0002_post_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='recipes.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-created_at', '-post'], name='timeline_user_recent_idx'), models.Index(fields=['user', 'author'], name='timeline_user_author_idx')],
+                'unique_together': {('user', 'post')},
+            },
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
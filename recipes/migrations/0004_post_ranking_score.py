@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:46
+
+from django.db import migrations, models
+from django.db.models import F, FloatField, Value
+
+
+def backfill_ranking_scores(apps, schema_editor):
+    """Score existing posts with the Bayesian average (prior mean 3.0, prior weight 5)."""
+    Post = apps.get_model('recipes', 'Post')
+    Post.objects.update(
+        ranking_score=(Value(15.0, output_field=FloatField()) + F('rating_total_score'))
+        / (Value(5.0, output_field=FloatField()) + F('rating_count'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_timeline_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='ranking_score',
+            field=models.FloatField(default=3.0),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-ranking_score', '-created_at', '-id'], name='post_ranking_idx'),
+        ),
+        migrations.RunPython(backfill_ranking_scores, migrations.RunPython.noop),
+    ]
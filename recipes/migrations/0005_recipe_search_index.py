@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:58
+
+from django.db import migrations
+
+# Frozen copies of the index definitions in recipes.services.recipe_search_service as of this migration
+FTS_TABLE = 'recipes_recipe_fts'
+POSTGRES_INDEX_NAME = 'recipe_search_idx'
+
+
+def postgres_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    vector = (
+        SearchVector('name', weight='A', config='english')
+        + SearchVector('ingredients', weight='B', config='english')
+        + SearchVector('method', weight='C', config='english')
+    )
+    return GinIndex(vector, name=POSTGRES_INDEX_NAME)
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index for this database and fill it with the existing recipes."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(name, ingredients, method, tokenize='unicode61 remove_diacritics 2')"
+        )
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, ingredients, method) VALUES (%s, %s, %s, %s)",
+                Recipe.objects.values_list('id', 'name', 'ingredients', 'method').iterator(),
+            )
+    elif vendor == 'postgresql':
+        # Postgres indexes an expression over the table itself, so there is nothing to fill
+        schema_editor.add_index(Recipe, postgres_search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(Recipe, postgres_search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_post_ranking_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
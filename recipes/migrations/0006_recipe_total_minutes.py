@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:05
+
+import re
+from django.db import migrations, models
+
+
+def parse_total_minutes(total_time):
+    """Frozen copy of recipes.helpers.parse_total_minutes, reading decimal and short hour units."""
+    if not total_time:
+        return None
+    text = total_time.lower()
+    hours = re.search(r'(\d+(?:\.\d+)?)\s*h(?:(?:ou)?rs?)?\b', text)
+    minutes = re.search(r'(\d+(?:\.\d+)?)\s*min', text)
+    if hours or minutes:
+        return round((float(hours.group(1)) * 60 if hours else 0) + (float(minutes.group(1)) if minutes else 0))
+    bare_number = re.fullmatch(r'\s*(\d+)\s*', text)
+    return int(bare_number.group(1)) if bare_number else None
+
+
+def backfill_total_minutes(apps, schema_editor):
+    """Parse total_time into minutes for every existing recipe."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    recipes = []
+    for recipe in Recipe.objects.only('id', 'total_time').iterator():
+        recipe.total_minutes = parse_total_minutes(recipe.total_time)
+        recipes.append(recipe)
+    Recipe.objects.bulk_update(recipes, ['total_minutes'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='total_minutes',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['total_minutes'], name='recipe_total_minutes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['created_by', 'total_minutes'], name='recipe_author_minutes_idx'),
+        ),
+        migrations.RunPython(backfill_total_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:08
+
+from django.db import migrations, models
+
+# The seed recipes the browse page used to hide by name
+BASE_RECIPE_NAMES = [
+    'Classic Margherita Pizza', 'Grilled Salmon with Lemon', 'Chocolate Chip Cookies',
+    'Caesar Salad', 'Chicken Curry', 'Spaghetti Carbonara', 'Beef Burger',
+    'Chocolate Brownies', 'Chicken Stir Fry', 'French Onion Soup', 'Pad Thai',
+    'Beef Steak', 'Chicken Wings', 'Vegetable Lasagna',
+]
+
+
+def mark_base_recipes(apps, schema_editor):
+    """Mark the existing seed recipes as base recipes; user recipes that share their names stay visible."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Recipe.objects.filter(name__in=BASE_RECIPE_NAMES, created_by__isnull=True).update(source=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_recipe_total_minutes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='recipe',
+            name='recipe_total_minutes_idx',
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='source',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'User'), (1, 'Base')], default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['source', '-id'], name='recipe_browse_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['source', 'total_minutes', '-id'], name='recipe_browse_minutes_idx'),
+        ),
+        migrations.RunPython(mark_base_recipes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:08
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    """Keep the first like of each (user, post) pair and recount the posts that had duplicates."""
+    Like = apps.get_model('recipes', 'Like')
+    Post = apps.get_model('recipes', 'Post')
+    duplicates = Like.objects.values('user_id', 'post_id').annotate(first_id=Min('id'), likes=Count('id')).filter(likes__gt=1)
+    post_ids = set()
+    for duplicate in duplicates:
+        Like.objects.filter(user_id=duplicate['user_id'], post_id=duplicate['post_id']).exclude(id=duplicate['first_id']).delete()
+        post_ids.add(duplicate['post_id'])
+    for post in Post.objects.filter(id__in=post_ids).annotate(total=Count('likes')):
+        Post.objects.filter(id=post.id).update(like_count=post.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_recipe_source'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='like',
+            unique_together={('user', 'post')},
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', '-created_at', '-id'], name='comment_post_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fastingsession',
+            index=models.Index(fields=['user', 'start_date_time'], name='fasting_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meal',
+            index=models.Index(fields=['user', 'date'], name='meal_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='post_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-created_at'], name='post_author_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['created_by', 'name'], name='recipe_author_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='save',
+            index=models.Index(fields=['user', '-created_at'], name='save_user_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_daily_nutrition(apps, schema_editor):
+    """Sum the existing meals into one DailyNutrition row per user and day."""
+    Meal = apps.get_model('recipes', 'Meal')
+    DailyNutrition = apps.get_model('recipes', 'DailyNutrition')
+    totals = Meal.objects.order_by().values('user_id', 'date').annotate(
+        calories=Sum('calories'), protein=Sum('protein_g'), carbs=Sum('carbs_g'), fat=Sum('fat_g'),
+    )
+    DailyNutrition.objects.bulk_create(
+        [
+            DailyNutrition(
+                user_id=row['user_id'], date=row['date'], calories=row['calories'],
+                protein_g=row['protein'], carbs_g=row['carbs'], fat_g=row['fat'],
+            )
+            for row in totals
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyNutrition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('calories', models.IntegerField(default=0)),
+                ('protein_g', models.FloatField(default=0)),
+                ('carbs_g', models.FloatField(default=0)),
+                ('fat_g', models.FloatField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_nutrition', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_nutrition, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:26
+
+import django.db.models.deletion
+from itertools import groupby
+from django.conf import settings
+from datetime import timedelta
+from django.db import migrations, models
+
+
+def measure_streaks(meal_dates):
+    """Frozen copy of recipes.services.meal_streak_service.measure_streaks: (final run, longest run)."""
+    if not meal_dates:
+        return 0, 0
+    longest = run = 1
+    for previous, current in zip(meal_dates, meal_dates[1:]):
+        run = run + 1 if current - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+    return run, longest
+
+
+def backfill_meal_streaks(apps, schema_editor):
+    """Measure each user's streaks from their distinct meal dates."""
+    Meal = apps.get_model('recipes', 'Meal')
+    MealStreak = apps.get_model('recipes', 'MealStreak')
+    rows = Meal.objects.order_by('user_id', 'date').values_list('user_id', 'date').distinct().iterator()
+    streaks = []
+    for user_id, user_rows in groupby(rows, key=lambda row: row[0]):
+        meal_dates = [meal_date for _, meal_date in user_rows]
+        current, longest = measure_streaks(meal_dates)
+        streaks.append(MealStreak(
+            user_id=user_id, current_streak=current, longest_streak=longest, last_logged_date=meal_dates[-1],
+        ))
+    MealStreak.objects.bulk_create(streaks, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_daily_nutrition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MealStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('longest_streak', models.PositiveIntegerField(default=0)),
+                ('last_logged_date', models.DateField(blank=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='meal_streak', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(backfill_meal_streaks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def backfill_profiles(apps, schema_editor):
+    """Give every user without a Profile one with the default goals."""
+    User = apps.get_model('recipes', 'User')
+    Profile = apps.get_model('recipes', 'Profile')
+    user_ids = User.objects.filter(profile__isnull=True).values_list('pk', flat=True).iterator()
+    Profile.objects.bulk_create((Profile(user_id=user_id) for user_id in user_ids), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_meal_streak'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profiles, migrations.RunPython.noop),
+    ]
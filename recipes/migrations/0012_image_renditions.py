@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:09
+
+import recipes.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_backfill_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='profile_picture_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=recipes.models.fields.RenditionImageField(blank=True, max_dimension=2048, null=True, source_width_field='image_width', upload_to='posts_images/', widths=(320, 640, 1280)),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=recipes.models.fields.RenditionImageField(default='images/food1.jpg', max_dimension=2048, source_width_field='image_width', upload_to='images/', widths=(320, 640, 1280)),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=recipes.models.fields.RenditionImageField(blank=True, max_dimension=512, null=True, source_width_field='profile_picture_width', upload_to='profile_pics/', widths=(64, 128, 256)),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:23
+
+import recipes.models.fields
+import recipes.storage
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0013_task_queue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=recipes.models.fields.RenditionImageField(blank=True, max_dimension=2048, null=True, source_width_field='image_width', storage=recipes.storage.select_image_storage, upload_to='posts_images/', widths=(320, 640, 1280)),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=recipes.models.fields.RenditionImageField(default='images/food1.jpg', max_dimension=2048, source_width_field='image_width', storage=recipes.storage.select_image_storage, upload_to='images/', widths=(320, 640, 1280)),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=recipes.models.fields.RenditionImageField(blank=True, max_dimension=512, null=True, source_width_field='profile_picture_width', storage=recipes.storage.select_image_storage, upload_to='profile_pics/', widths=(64, 128, 256)),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:36
+
+from hashlib import md5
+from django.db import migrations, models
+
+# Frozen copy of the Gravatar URL libgravatar builds, as stored by AvatarService when this migration was written
+GRAVATAR_URL = 'https://www.gravatar.com/avatar/'
+
+
+def backfill_avatar_urls(apps, schema_editor):
+    """
+    Store the Gravatar URL of every existing user.
+
+    With LOCAL_AVATARS set, run the refresh_avatar_urls command afterwards to
+    switch them to initials avatars.
+    """
+    User = apps.get_model('recipes', 'User')
+    batch = []
+    for user in User.objects.only('email').iterator(chunk_size=500):
+        user.avatar_url = GRAVATAR_URL + md5(user.email.strip().lower().encode('utf-8')).hexdigest()
+        batch.append(user)
+        if len(batch) == 500:
+            User.objects.bulk_update(batch, ['avatar_url'])
+            batch = []
+    User.objects.bulk_update(batch, ['avatar_url'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0014_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_url',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_avatar_urls, migrations.RunPython.noop),
+    ]
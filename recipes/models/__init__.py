@@ -3,7 +3,9 @@ from .recipe import *
 from .profile import Profile
 from .fasting_session import *
 from .daily_log import *
+from .daily_nutrition import *
 from .meal import *
+from .meal_streak import *
 from .comment import *
 from .like import *
 from .post import *
@@ -11,3 +13,5 @@ from .tag import *
 from .follow import *
 from .rating import *
 from .save import *
+from .timeline_entry import *
+from .task import *
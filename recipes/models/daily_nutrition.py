@@ -0,0 +1,25 @@
+from django.db import models
+from django.conf import settings
+
+
+class DailyNutrition(models.Model):
+    """Running totals of the macros a user logged on one day, kept in step with their meals."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='daily_nutrition'
+    )
+    date = models.DateField()
+
+    calories = models.IntegerField(default=0)
+    protein_g = models.FloatField(default=0)
+    carbs_g = models.FloatField(default=0)
+    fat_g = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'date']
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date}: {self.calories} cal consumed"
@@ -26,6 +26,9 @@ class FastingSession(models.Model):
 
     class Meta:
         ordering = ['-start_date_time']
+        indexes = [
+            models.Index(fields=['user', 'start_date_time'], name='fasting_user_start_idx'),
+        ]
         
     @property
     def duration(self):
@@ -0,0 +1,171 @@
+import os
+from django.db import models
+from django.db.models import signals
+from django.db.models.fields.files import ImageFieldFile
+
+
+class RenditionImageFieldFile(ImageFieldFile):
+    """Image file that is normalized by a background task and served through its WebP renditions."""
+
+    def _service(self):
+        from recipes.services import ImageRenditionService
+
+        return ImageRenditionService(self.field.max_dimension, self.field.widths)
+
+    @property
+    def source_width(self):
+        """Width of the normalized image; 0 while it is queued, None if stored before renditions existed."""
+        return getattr(self.instance, self.field.source_width_field)
+
+    @property
+    def is_processing(self):
+        return bool(self) and self.source_width == 0
+
+    def save(self, name, content, save=True):
+        # Store the upload as it came; the worker normalizes it once the row is saved
+        super().save(name, content, save=False)
+        setattr(self.instance, self.field.source_width_field, 0)
+        self.instance.__dict__.setdefault('_pending_renditions', set()).add(self.field.name)
+        if save:
+            self.instance.save()
+
+    save.alters_data = True
+
+    def generate_renditions(self):
+        """
+        Replace the stored upload with its normalized JPEG and write its renditions.
+
+        The new name and width are written to the row with update(), only if
+        it still refers to the upload, and the original upload is then removed
+        unless another row still refers to it. Returns whether the row was
+        updated; if the image was replaced meanwhile, the row is left alone and
+        the normalized copy is left for delete_orphaned_media.
+        """
+        service = self._service()
+        original = self.name
+        with self.storage.open(original) as content:
+            image = service.normalize(content)
+        name = self.storage.save(
+            self.field.generate_filename(self.instance, service.source_name(os.path.basename(original))),
+            service.encode(image),
+            max_length=self.field.max_length,
+        )
+        service.save_renditions(self.storage, name, image)
+
+        # Compare-and-set, so an image replaced while this ran isn't overwritten
+        updated = type(self.instance)._default_manager.filter(
+            pk=self.instance.pk, **{self.field.attname: original},
+        ).update(**{
+            self.field.attname: name,
+            self.field.source_width_field: image.width,
+        })
+        if not updated:
+            return False
+        self.name = name
+        setattr(self.instance, self.field.attname, name)
+        setattr(self.instance, self.field.source_width_field, image.width)
+        if name != original:
+            from recipes.services import MediaService
+
+            # Another row may still be waiting on the same upload
+            MediaService().delete_unreferenced([original])
+        return True
+
+    generate_renditions.alters_data = True
+
+    def delete(self, save=True):
+        # Files can be shared between rows, so the file is only released here and removed in the background
+        if not self:
+            return
+        from recipes.services import MediaService
+
+        if hasattr(self, '_file'):
+            self.close()
+            del self.file
+        name = self.name
+        self.name = None
+        setattr(self.instance, self.field.attname, self.name)
+        setattr(self.instance, self.field.source_width_field, None)
+        self._committed = False
+        if save:
+            self.instance.save()
+        MediaService().release([name])
+
+    delete.alters_data = True
+
+    @property
+    def rendition_widths(self):
+        return self._service().rendition_widths(self.source_width) if self else []
+
+    def rendition_url(self, width):
+        """Return the URL of the rendition at one of the field's widths."""
+        return self.storage.url(self._service().rendition_name(self.name, width))
+
+    def url_for_width(self, width):
+        """Return the URL of the smallest rendition at least the given width wide, or of the image itself."""
+        for rendition_width in self.rendition_widths:
+            if rendition_width >= width:
+                return self.rendition_url(rendition_width)
+        return self.url
+
+    @property
+    def srcset(self):
+        """Return a srcset of the renditions and the image itself, or '' for an unprocessed image."""
+        if not self or not self.source_width:
+            return ''
+        candidates = [f'{self.rendition_url(width)} {width}w' for width in self.rendition_widths]
+        candidates.append(f'{self.url} {self.source_width}w')
+        return ', '.join(candidates)
+
+
+class RenditionImageField(models.ImageField):
+    """
+    ImageField whose uploads are normalized and get WebP renditions at fixed widths.
+
+    Saving a new upload stores it as-is, sets source_width_field to 0 and
+    queues a generate_renditions task, which records the normalized width
+    there once it has run. Templates build a srcset from that width without
+    opening the file.
+    """
+
+    attr_class = RenditionImageFieldFile
+
+    def __init__(self, *args, source_width_field, widths=(320, 640, 1280), max_dimension=2048, **kwargs):
+        self.source_width_field = source_width_field
+        self.widths = tuple(widths)
+        self.max_dimension = max_dimension
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source_width_field'] = self.source_width_field
+        kwargs['widths'] = self.widths
+        kwargs['max_dimension'] = self.max_dimension
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not cls._meta.abstract:
+            signals.post_save.connect(self.queue_renditions, sender=cls)
+            signals.post_delete.connect(self.release_file, sender=cls)
+
+    def queue_renditions(self, instance, **kwargs):
+        """Queue the rendition task for an upload saved with the instance, now that it has a pk."""
+        pending = instance.__dict__.get('_pending_renditions')
+        if not pending or self.name not in pending:
+            return
+        from recipes.services import TaskQueueService
+
+        pending.discard(self.name)
+        TaskQueueService.enqueue(
+            'generate_renditions',
+            model=instance._meta.label, pk=instance.pk, field=self.name, name=getattr(instance, self.name).name,
+        )
+
+    def release_file(self, instance, **kwargs):
+        """Release a deleted row's image, which is removed once no other row refers to it."""
+        from recipes.services import MediaService
+
+        name = getattr(instance, self.attname).name
+        if name and name != self.default:
+            MediaService().release([name])
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from datetime import date
 
@@ -30,6 +30,35 @@ class Meal(models.Model):
 
     class Meta:
         ordering = ['-date', 'meal_type']
+        indexes = [
+            models.Index(fields=['user', 'date'], name='meal_user_date_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        from recipes.services import MealStreakService, NutritionRollupService
+
+        rollups = NutritionRollupService()
+        streaks = MealStreakService()
+        with transaction.atomic():
+            previous = Meal.objects.filter(pk=self.pk).first() if self.pk else None
+            if previous:
+                rollups.remove(previous)
+            super().save(*args, **kwargs)
+            rollups.add(self)
+            if previous is None:
+                streaks.record(self)
+            elif previous.date != self.date:
+                streaks.discard(previous)
+                streaks.record(self)
+
+    def delete(self, *args, **kwargs):
+        from recipes.services import MealStreakService, NutritionRollupService
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            NutritionRollupService().remove(self)
+            MealStreakService().discard(self)
+        return result
 
     def __str__(self):
         return f"{self.user.username} - {self.meal_type}: {self.name} ({self.date})"
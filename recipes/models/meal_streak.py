@@ -0,0 +1,26 @@
+from django.db import models
+from django.conf import settings
+from datetime import timedelta
+
+
+class MealStreak(models.Model):
+    """A user's run of consecutive days with meals logged, kept in step with their meals."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='meal_streak'
+    )
+    # Length of the run ending on last_logged_date, whether or not it is still going
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_logged_date = models.DateField(null=True, blank=True)
+
+    def streak_on(self, day):
+        """Return the current streak as of the given day, which stays alive until a full day is missed."""
+        if self.last_logged_date is None or self.last_logged_date < day - timedelta(days=1):
+            return 0
+        return self.current_streak
+
+    def __str__(self):
+        return f"{self.user.username} - {self.current_streak} day streak"
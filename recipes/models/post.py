@@ -1,14 +1,48 @@
 from django.db import models
+from django.db.models import Exists, F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from recipes.storage import select_image_storage
+from .fields import RenditionImageField
 from .tag import Tag
 
+
+class PostQuerySet(models.QuerySet):
+    def with_viewer_state(self, user):
+        """Annotate each post with the viewer's like, save, rating and follow state in the same query."""
+        from .follow import Follow
+        from .like import Like
+        from .rating import Rating
+        from .save import Save
+
+        user_rating = Rating.objects.filter(user=user, post=OuterRef('pk')).values('score')[:1]
+        return self.annotate(
+            is_liked_by_user=Exists(Like.objects.filter(user=user, post=OuterRef('pk'))),
+            is_saved_by_user=Exists(Save.objects.filter(user=user, post=OuterRef('pk'))),
+            user_rating_score=Coalesce(Subquery(user_rating), 0),
+            is_followed_by_user=Exists(Follow.objects.filter(follower=user, followed=OuterRef('author'))),
+        )
+
+
 class Post(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
     title = models.CharField(max_length=255)
     caption = models.TextField(blank = True)
-    image = models.ImageField(upload_to='posts_images/', blank=True, null=True) 
+    image = RenditionImageField(
+        upload_to='posts_images/', blank=True, null=True, source_width_field='image_width',
+        storage=select_image_storage,
+    )
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
     rating_total_score = models.PositiveIntegerField(default=0)
     rating_count = models.PositiveIntegerField(default=0)
+    # Bayesian average of the ratings: each post starts with RANKING_PRIOR_WEIGHT
+    # phantom votes of RANKING_PRIOR_MEAN, so a single 5-star vote can't top the feed
+    RANKING_PRIOR_MEAN = 3.0
+    RANKING_PRIOR_WEIGHT = 5
+    ranking_score = models.FloatField(default=RANKING_PRIOR_MEAN)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    save_count = models.PositiveIntegerField(default=0)
     prep_time = models.CharField(max_length=50, blank=True, help_text="e.g. 25 min")
     servings = models.PositiveIntegerField(default=1, blank=True)
     created_at = models.DateTimeField(auto_now_add= True)
@@ -18,6 +52,27 @@ class Post(models.Model):
     ]
     cuisine = models.CharField(max_length=50, choices=CUISINE_CHOICES, blank=True, null=True)
 
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-ranking_score', '-created_at', '-id'], name='post_ranking_idx'),
+            models.Index(fields=['-created_at', '-id'], name='post_recent_idx'),
+            models.Index(fields=['author', '-created_at'], name='post_author_recent_idx'),
+        ]
+
+    @classmethod
+    def compute_ranking_score(cls, total_score, count):
+        """Return the Bayesian ranking score for a rating total and vote count."""
+        return (cls.RANKING_PRIOR_MEAN * cls.RANKING_PRIOR_WEIGHT + total_score) / (cls.RANKING_PRIOR_WEIGHT + count)
+
+    @classmethod
+    def ranking_score_expression(cls):
+        """Return compute_ranking_score as a database expression over the stored rating columns."""
+        prior_total = Value(cls.RANKING_PRIOR_MEAN * cls.RANKING_PRIOR_WEIGHT, output_field=FloatField())
+        prior_count = Value(float(cls.RANKING_PRIOR_WEIGHT), output_field=FloatField())
+        return (prior_total + F('rating_total_score')) / (prior_count + F('rating_count'))
+
     def total_likes(self):
         return self.likes.count()
     
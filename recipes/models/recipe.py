@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings  
+from recipes.helpers import parse_total_minutes
+from recipes.storage import select_image_storage
+from .fields import RenditionImageField
 
 
 class Recipe(models.Model):
@@ -14,6 +17,9 @@ class Recipe(models.Model):
 
     total_time = models.CharField(max_length=50)
 
+    # total_time parsed on save, so time sorts and filters run in SQL; null if unreadable
+    total_minutes = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
     servings = models.PositiveIntegerField(default=1)
 
     calories = models.PositiveIntegerField(default=0, help_text="Calories per serving")
@@ -29,7 +35,34 @@ class Recipe(models.Model):
 
     personal_rating = models.IntegerField(default=0, null=True, blank=True)
 
-    image = models.ImageField(upload_to='images/', null=False, default='images/food1.jpg')
+    image = RenditionImageField(
+        upload_to='images/', null=False, default='images/food1.jpg', source_width_field='image_width',
+        storage=select_image_storage,
+    )
+    # Width of an uploaded image after normalization; null for the bundled static images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    class Source(models.IntegerChoices):
+        USER = 0, "User"
+        # Reference recipes created by the seed command; hidden from the browse page
+        BASE = 1, "Base"
+
+    source = models.PositiveSmallIntegerField(choices=Source.choices, default=Source.USER, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', '-id'], name='recipe_browse_idx'),
+            models.Index(fields=['source', 'total_minutes', '-id'], name='recipe_browse_minutes_idx'),
+            models.Index(fields=['created_by', 'total_minutes'], name='recipe_author_minutes_idx'),
+            models.Index(fields=['created_by', 'name'], name='recipe_author_name_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.total_minutes = parse_total_minutes(self.total_time)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'total_time' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'total_minutes'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -8,4 +8,7 @@ class Save(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ('user', 'post')
\ No newline at end of file
+        unique_together = ('user', 'post')
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='save_user_recent_idx'),
+        ]
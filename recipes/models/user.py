@@ -1,7 +1,8 @@
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from libgravatar import Gravatar
+from recipes.storage import select_image_storage
+from .fields import RenditionImageField
 
 class User(AbstractUser):
     """Model used for user authentication, and team member related information."""
@@ -20,7 +21,14 @@ class User(AbstractUser):
     
     # Profile fields
     bio = models.TextField(blank=True, max_length=500)
-    profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    profile_picture = RenditionImageField(
+        upload_to='profile_pics/', blank=True, null=True,
+        source_width_field='profile_picture_width', widths=(64, 128, 256), max_dimension=512,
+        storage=select_image_storage,
+    )
+    profile_picture_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    # Worked out from the fields in AVATAR_SOURCE_FIELDS on save, so rendering an avatar needs no hashing
+    avatar_url = models.CharField(max_length=255, blank=True, editable=False)
     DIETARY_CHOICES = [
         ('None', 'No Restriction'),
         ('Vegan', 'Vegan'),
@@ -31,11 +39,24 @@ class User(AbstractUser):
     dietary_preference = models.CharField(max_length=20, choices=DIETARY_CHOICES, default='None')
 
 
+    AVATAR_SOURCE_FIELDS = {'email', 'first_name', 'last_name'}
+
     class Meta:
         """Model options."""
 
         ordering = ['last_name', 'first_name']
 
+    def save(self, *args, **kwargs):
+        """Save the user, refreshing the stored avatar URL unless only unrelated fields are being saved."""
+        from recipes.services import AvatarService
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.AVATAR_SOURCE_FIELDS.intersection(update_fields):
+            self.avatar_url = AvatarService().avatar_url(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'avatar_url'}
+        super().save(*args, **kwargs)
+
     def full_name(self):
         """Return a string containing the user's full name."""
 
@@ -44,14 +65,14 @@ class User(AbstractUser):
     def gravatar(self, size=120):
         """Return a URL to the user's profile picture or gravatar."""
         
-        # If profile_picture is set, return its URL
-        if self.profile_picture:
-            return self.profile_picture.url
+        # If profile_picture is set and processed, return its smallest rendition that fills the size
+        if self.profile_picture and not self.profile_picture.is_processing:
+            return self.profile_picture.url_for_width(size)
         
-        # Otherwise, fall back to gravatar
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='mp')
-        return gravatar_url
+        # Otherwise, fall back to the avatar URL stored when the user was saved
+        from recipes.services import AvatarService
+
+        return AvatarService.sized_url(self.avatar_url or AvatarService().avatar_url(self), size)
 
     def mini_gravatar(self):
         """Return a URL to a miniature version of the user's gravatar."""
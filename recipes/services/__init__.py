@@ -1,2 +1,12 @@
 from .stats_service import UserStatsService
-
+from .timeline_service import TimelineService
+from .recipe_search_service import RecipeSearchService
+from .nutrition_rollup_service import NutritionRollupService
+from .meal_log_service import MealLogService
+from .meal_streak_service import MealStreakService
+from .time_series_service import TimeSeriesService
+from .tracker_transfer_service import TrackerTransferService
+from .image_rendition_service import ImageRenditionService
+from .task_queue_service import TaskQueueService
+from .media_service import MediaService
+from .avatar_service import AvatarService
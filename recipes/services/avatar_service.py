@@ -0,0 +1,68 @@
+import zlib
+from io import BytesIO
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from libgravatar import Gravatar
+from PIL import Image, ImageDraw, ImageFont
+
+
+GRAVATAR_URL = 'https://www.gravatar.com/avatar/'
+
+
+class AvatarService:
+    """
+    Service class to work out the avatar shown for a user without a profile picture.
+
+    The URL is worked out when the user is saved and stored on the row, so
+    rendering an avatar is string formatting rather than hashing the email.
+    By default it is the user's Gravatar; with LOCAL_AVATARS set it is a PNG
+    of their initials, rendered once per initials and colour and kept in
+    media storage, so pages don't depend on an external host.
+    """
+
+    SIZE = 256
+    DIRECTORY = 'avatars'
+    GRAVATAR_DEFAULT = 'mp'
+    COLORS = ['#2e7d32', '#00838f', '#1565c0', '#6a1b9a', '#ad1457', '#c62828', '#ef6c00', '#4e342e']
+
+    def avatar_url(self, user):
+        """Return the avatar URL to store on a user, without a size."""
+        if settings.LOCAL_AVATARS:
+            return self.initials_url(user)
+        return Gravatar(user.email).get_image()
+
+    @staticmethod
+    def sized_url(url, size):
+        """Return a stored avatar URL at the given size in pixels."""
+        if url.startswith(GRAVATAR_URL):
+            return f'{url}?{urlencode({"size": size, "default": AvatarService.GRAVATAR_DEFAULT})}'
+        # Initials avatars are rendered at SIZE and scaled by the browser
+        return url
+
+    @staticmethod
+    def initials(user):
+        """Return up to two capital letters from the user's first and last name."""
+        letters = [name[0] for name in (user.first_name, user.last_name) if name and name[0].isalnum()]
+        return ''.join(letters).upper()
+
+    def initials_url(self, user):
+        """Return the URL of the user's initials avatar, rendering it if it isn't stored yet."""
+        text = self.initials(user)
+        color = self.COLORS[zlib.crc32(user.email.lower().encode()) % len(self.COLORS)]
+        # The size is part of the name, so changing SIZE renders new files rather than reusing old ones
+        name = f'{self.DIRECTORY}/{text or "blank"}_{color[1:]}_{self.SIZE}.png'
+        if not default_storage.exists(name):
+            name = default_storage.save(name, self.render(text, color))
+        return default_storage.url(name)
+
+    def render(self, text, color):
+        """Draw the initials in white on a square of the given colour and return it as a PNG."""
+        image = Image.new('RGB', (self.SIZE, self.SIZE), color)
+        if text:
+            font = ImageFont.load_default(size=self.SIZE * 2 // 5)
+            ImageDraw.Draw(image).text((self.SIZE / 2, self.SIZE / 2), text, fill='white', font=font, anchor='mm')
+        buffer = BytesIO()
+        image.save(buffer, 'PNG', optimize=True)
+        return ContentFile(buffer.getvalue())
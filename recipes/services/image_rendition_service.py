@@ -0,0 +1,80 @@
+import os
+import re
+from io import BytesIO
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+RENDITION_NAME = re.compile(r'^(?P<root>.+)_\d+w\.webp$')
+
+
+class ImageRenditionService:
+    """
+    Service class to normalize uploaded images and write their resized renditions.
+
+    An upload is turned upright from its EXIF orientation, flattened to RGB,
+    capped at max_dimension on its longer side and re-encoded as a JPEG, which
+    drops its EXIF and other metadata. Each of the fixed widths narrower than
+    the result gets a WebP rendition stored next to it, for use in a srcset.
+    """
+
+    JPEG_QUALITY = 85
+    WEBP_QUALITY = 80
+
+    def __init__(self, max_dimension, widths):
+        self.max_dimension = max_dimension
+        self.widths = widths
+
+    @staticmethod
+    def source_name(name):
+        """Return the name the normalized JPEG of an upload is stored under."""
+        return f'{os.path.splitext(name)[0]}.jpg'
+
+    @staticmethod
+    def rendition_name(name, width):
+        """Return the name of the rendition of a stored image at the given width."""
+        return f'{os.path.splitext(name)[0]}_{width}w.webp'
+
+    @staticmethod
+    def rendition_source(name):
+        """Return the name of the image a rendition was made from, or None if name isn't a rendition."""
+        match = RENDITION_NAME.match(name)
+        return f'{match.group("root")}.jpg' if match else None
+
+    def rendition_widths(self, source_width):
+        """Return the fixed widths that are narrower than a source image, smallest first."""
+        if not source_width:
+            return []
+        return sorted(width for width in self.widths if width < source_width)
+
+    def normalize(self, content):
+        """Read an uploaded image, turn it upright, flatten it to RGB and cap its size."""
+        content.seek(0)
+        with Image.open(content) as upload:
+            image = ImageOps.exif_transpose(upload)
+            if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+                rgba = image.convert('RGBA')
+                image = Image.new('RGB', rgba.size, 'white')
+                image.paste(rgba, mask=rgba.getchannel('A'))
+            else:
+                image = image.convert('RGB')
+        image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+        return image
+
+    def encode(self, image, image_format='JPEG'):
+        """Encode an image without metadata, as JPEG or WebP."""
+        buffer = BytesIO()
+        if image_format == 'WEBP':
+            image.save(buffer, 'WEBP', quality=self.WEBP_QUALITY, method=4)
+        else:
+            image.save(buffer, 'JPEG', quality=self.JPEG_QUALITY, optimize=True, progressive=True)
+        return ContentFile(buffer.getvalue())
+
+    def save_renditions(self, storage, name, image):
+        """Write a WebP rendition of a normalized image for each width narrower than it."""
+        for width in self.rendition_widths(image.width):
+            height = max(1, round(image.height * width / image.width))
+            rendition_name = self.rendition_name(name, width)
+            # Sources are content-addressed, so an existing rendition is already the right one
+            if not storage.exists(rendition_name):
+                storage.save(rendition_name, self.encode(image.resize((width, height), Image.LANCZOS), 'WEBP'))
@@ -0,0 +1,40 @@
+from collections import defaultdict
+from django.db import transaction
+
+
+class MealLogService:
+    """
+    Service class to log a batch of meals in one transaction.
+
+    The meals are written with bulk_create, which skips Meal.save() and the
+    model signals, so the per-day totals, streaks and cached stats that
+    save() would have updated are brought in step here with one update per
+    affected day.
+    """
+
+    BATCH_SIZE = 500
+
+    def log_meals(self, user, meals):
+        """Save the unsaved meals for the user and return them with their ids set."""
+        from recipes.models import Meal
+        from recipes.services import MealStreakService, NutritionRollupService, UserStatsService
+
+        for meal in meals:
+            meal.user = user
+        with transaction.atomic():
+            meals = Meal.objects.bulk_create(meals, batch_size=self.BATCH_SIZE)
+            NutritionRollupService().add_many(meals)
+            MealStreakService().record_days(user.pk, [meal.date for meal in meals])
+        UserStatsService.invalidate(user.pk)
+        return meals
+
+    def daily_totals(self, user, days):
+        """Return the consumed totals of the given days, oldest first, in one query."""
+        from recipes.models import DailyNutrition
+        from recipes.services import NutritionRollupService
+
+        fields = NutritionRollupService.MACRO_FIELDS
+        totals = defaultdict(lambda: dict.fromkeys(fields, 0))
+        for row in DailyNutrition.objects.filter(user=user, date__in=set(days)).values('date', *fields):
+            totals[row.pop('date')] = row
+        return [{'date': day, **totals[day]} for day in sorted(set(days))]
@@ -0,0 +1,136 @@
+from datetime import timedelta
+from itertools import groupby
+
+
+def measure_streaks(meal_dates):
+    """
+    Measure the runs of consecutive days in an ascending list of distinct dates.
+
+    Returns the length of the final run and of the longest run.
+    """
+    if not meal_dates:
+        return 0, 0
+    longest = run = 1
+    for previous, current in zip(meal_dates, meal_dates[1:]):
+        run = run + 1 if current - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+    return run, longest
+
+
+class MealStreakService:
+    """Service class to keep each user's stored MealStreak in step with their meals."""
+
+    def record(self, meal):
+        """
+        Extend the user's streak with a newly logged meal.
+
+        Logging on the latest day or the day after it is handled from the stored
+        state alone. A meal back-dated outside the current run falls back to a recompute.
+        """
+        return self.record_days(meal.user_id, [meal.date])
+
+    def record_days(self, user_id, days):
+        """Extend the user's streak with several newly logged days, recomputing at most once."""
+        from recipes.models import MealStreak
+
+        streak, _ = MealStreak.objects.select_for_update().get_or_create(user_id=user_id)
+        changed = False
+        for day in sorted(set(days)):
+            last = streak.last_logged_date
+            if last is None or day > last + timedelta(days=1):
+                streak.current_streak = 1
+            elif day == last + timedelta(days=1):
+                streak.current_streak += 1
+            elif day >= last - timedelta(days=streak.current_streak - 1):
+                # Another meal on a day the current run already covers
+                continue
+            else:
+                # The recompute reads every logged day, including the rest of this batch
+                return self.recompute(user_id)
+            streak.last_logged_date = day
+            streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+            changed = True
+        if changed:
+            streak.save()
+        return streak
+
+    def streaks_on(self, user_id, day):
+        """
+        Return the user's current and longest streaks as of the given day.
+
+        These come from the stored MealStreak, unless the user has logged meals
+        dated after the day. The stored runs count those days, so the streaks are
+        then measured from the meals up to the day instead.
+        """
+        from recipes.models import MealStreak
+
+        streak = MealStreak.objects.filter(user_id=user_id).first()
+        if streak is None:
+            return 0, 0
+        if streak.last_logged_date is not None and streak.last_logged_date > day:
+            meal_dates = list(
+                self._meal_dates().filter(user_id=user_id, date__lte=day).values_list('date', flat=True)
+            )
+            current, longest = measure_streaks(meal_dates)
+            streak = MealStreak(
+                current_streak=current, longest_streak=longest, last_logged_date=meal_dates[-1] if meal_dates else None,
+            )
+        return streak.streak_on(day), streak.longest_streak
+
+    def discard(self, meal):
+        """Update the user's streak after a meal was deleted or moved off its day."""
+        from recipes.models import Meal
+
+        if Meal.objects.filter(user_id=meal.user_id, date=meal.date).exists():
+            # The day is still logged, so no run has changed
+            return
+        self.recompute(meal.user_id)
+
+    def recompute(self, user_id):
+        """Recompute a user's streak from their full meal history."""
+        from recipes.models import MealStreak
+
+        meal_dates = list(self._meal_dates().filter(user_id=user_id).values_list('date', flat=True))
+        current, longest = measure_streaks(meal_dates)
+        streak, _ = MealStreak.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                'current_streak': current,
+                'longest_streak': longest,
+                'last_logged_date': meal_dates[-1] if meal_dates else None,
+            },
+        )
+        return streak
+
+    def verify(self):
+        """
+        Compare every user's stored streak against a recompute from their meals.
+
+        Returns a list of (user_id, stored, expected) tuples for the users that
+        differ, each side as (current_streak, longest_streak, last_logged_date).
+        """
+        from recipes.models import MealStreak
+
+        stored = {
+            row[0]: row[1:]
+            for row in MealStreak.objects.values_list(
+                'user_id', 'current_streak', 'longest_streak', 'last_logged_date'
+            )
+        }
+        expected = {}
+        rows = self._meal_dates().values_list('user_id', 'date').iterator()
+        for user_id, user_rows in groupby(rows, key=lambda row: row[0]):
+            meal_dates = [meal_date for _, meal_date in user_rows]
+            expected[user_id] = (*measure_streaks(meal_dates), meal_dates[-1])
+
+        empty = (0, 0, None)
+        return [
+            (user_id, stored.get(user_id, empty), expected.get(user_id, empty))
+            for user_id in sorted(stored.keys() | expected.keys())
+            if stored.get(user_id, empty) != expected.get(user_id, empty)
+        ]
+
+    def _meal_dates(self):
+        from recipes.models import Meal
+
+        return Meal.objects.order_by('user_id', 'date').distinct()
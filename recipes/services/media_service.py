@@ -0,0 +1,87 @@
+import os
+
+
+class MediaService:
+    """
+    Service class to track which rows refer to stored images and remove the ones none do.
+
+    Uploaded images are content-addressed, so two rows can share a file. A
+    file is only deleted, with its renditions, once no image field refers to
+    it, and that count is taken when the deletion runs rather than when it is
+    queued, so a file that was uploaded again in between survives.
+    """
+
+    IMAGE_FIELDS = [
+        ('recipes.Post', 'image'),
+        ('recipes.Recipe', 'image'),
+        ('recipes.User', 'profile_picture'),
+    ]
+
+    def image_fields(self):
+        """Return (model, field) for every image field whose files are tracked."""
+        from django.apps import apps
+
+        fields = []
+        for label, field_name in self.IMAGE_FIELDS:
+            model = apps.get_model(label)
+            fields.append((model, model._meta.get_field(field_name)))
+        return fields
+
+    def reference_count(self, name):
+        """Return how many rows refer to a stored file."""
+        return sum(model._default_manager.filter(**{field.name: name}).count() for model, field in self.image_fields())
+
+    def referenced(self, names):
+        """Return the names that a row refers to, counting a rendition as referenced when its source is."""
+        from recipes.services import ImageRenditionService
+
+        sources = {name: ImageRenditionService.rendition_source(name) or name for name in names}
+        candidates = set(sources.values())
+        referenced = set()
+        for model, field in self.image_fields():
+            referenced.update(
+                model._default_manager.filter(**{f'{field.name}__in': candidates}).values_list(field.name, flat=True)
+            )
+        return {name for name, source in sources.items() if source in referenced}
+
+    def stored_files(self):
+        """Yield (name, size, modified timestamp) for each file in the tracked upload directories, one at a time."""
+        from recipes.storage import select_image_storage
+
+        storage = select_image_storage()
+        directories = sorted({field.upload_to for _, field in self.image_fields()})
+        pending = [storage.path(directory) for directory in directories if storage.exists(directory)]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat()
+                        name = os.path.relpath(entry.path, storage.location).replace(os.sep, '/')
+                        yield name, stat.st_size, stat.st_mtime
+
+    def release(self, names):
+        """Queue the removal of files that rows stopped referring to."""
+        from recipes.services import TaskQueueService
+
+        names = [name for name in names if name]
+        if names:
+            TaskQueueService.enqueue('release_media', names=names)
+
+    def delete_unreferenced(self, names):
+        """Delete the files, and their renditions, that no row refers to. Returns the names deleted."""
+        from recipes.services import ImageRenditionService
+        from recipes.storage import select_image_storage
+
+        storage = select_image_storage()
+        widths = sorted({width for _, field in self.image_fields() for width in field.widths})
+        deleted = []
+        for name in names:
+            if self.reference_count(name):
+                continue
+            for width in widths:
+                storage.delete(ImageRenditionService.rendition_name(name, width))
+            storage.delete(name)
+            deleted.append(name)
+        return deleted
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from django.db.models import F, Sum
+
+
+class NutritionRollupService:
+    """Service class to keep each user's per-day DailyNutrition totals in step with their meals."""
+
+    MACRO_FIELDS = ('calories', 'protein_g', 'carbs_g', 'fat_g')
+    BATCH_SIZE = 500
+
+    def add(self, meal):
+        """Add a meal's macros to the totals for its day."""
+        self._shift(meal.user_id, meal.date, self._macros(meal))
+
+    def add_many(self, meals):
+        """Add a batch of meals to the totals, with one update per user and day."""
+        totals = defaultdict(lambda: dict.fromkeys(self.MACRO_FIELDS, 0))
+        for meal in meals:
+            day_totals = totals[meal.user_id, meal.date]
+            for field, value in self._macros(meal).items():
+                day_totals[field] += value
+        for (user_id, day), day_totals in totals.items():
+            self._shift(user_id, day, day_totals)
+
+    def remove(self, meal):
+        """Take a meal's macros back off the totals for its day."""
+        self._shift(meal.user_id, meal.date, {field: -value for field, value in self._macros(meal).items()})
+
+    def _macros(self, meal):
+        return {field: getattr(meal, field) for field in self.MACRO_FIELDS}
+
+    def _shift(self, user_id, day, deltas):
+        from recipes.models import DailyNutrition
+        from recipes.services import TimeSeriesService
+
+        rollup, _ = DailyNutrition.objects.get_or_create(user_id=user_id, date=day)
+        DailyNutrition.objects.filter(pk=rollup.pk).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        TimeSeriesService.invalidate(user_id, 'nutrition')
+
+    def rebuild(self):
+        """Recompute every day's totals from the Meal table, returning the number of days written."""
+        from recipes.models import DailyNutrition, Meal
+        from recipes.services import TimeSeriesService
+
+        totals = (
+            Meal.objects.order_by()
+            .values('user_id', 'date')
+            .annotate(**{f'total_{field}': Sum(field) for field in self.MACRO_FIELDS})
+        )
+        rollups = [
+            DailyNutrition(
+                user_id=row['user_id'],
+                date=row['date'],
+                **{field: row[f'total_{field}'] for field in self.MACRO_FIELDS},
+            )
+            for row in totals
+        ]
+        stale_user_ids = set(DailyNutrition.objects.values_list('user_id', flat=True).distinct())
+        DailyNutrition.objects.all().delete()
+        DailyNutrition.objects.bulk_create(rollups, batch_size=self.BATCH_SIZE)
+        for user_id in stale_user_ids | {rollup.user_id for rollup in rollups}:
+            TimeSeriesService.invalidate(user_id, 'nutrition')
+        return len(rollups)
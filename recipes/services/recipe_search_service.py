@@ -0,0 +1,239 @@
+import re
+from django.db import connection
+from django.db.models import Q, Value
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
+# Snippets are built with control characters around each match so the recipe
+# text can be HTML-escaped before the matches are wrapped in <mark> tags
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+SNIPPET_WORDS = 16
+
+
+def search_terms(query):
+    """Split a free-text query into the bare words a full-text index can match."""
+    return re.findall(r'\w+', query.lower())
+
+
+def highlight_snippet(snippet):
+    """Escape a snippet and wrap each match marker pair in <mark> tags."""
+    if not snippet:
+        return ''
+    html = escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+    return mark_safe(html)
+
+
+class SQLiteSearchBackend:
+    """Searches a FTS5 table mirroring each recipe's name, ingredients and method."""
+
+    TABLE = 'recipes_recipe_fts'
+    # bm25 column weights: a hit in the name counts for more than one in the method
+    WEIGHTS = (10.0, 4.0, 1.0)
+
+    def create_index(self, schema_editor, model):
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.TABLE} "
+            "USING fts5(name, ingredients, method, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def drop_index(self, schema_editor, model):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.TABLE}")
+
+    def match_expression(self, terms):
+        # Quote every term so FTS5 operators typed by the user are matched literally,
+        # and prefix-match it so "grill" still finds "grilled"
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, terms):
+        table = queryset.model._meta.db_table
+        weights = ', '.join(str(w) for w in self.WEIGHTS)
+        # The index is joined once, so SQLite walks its matches and looks each recipe up by
+        # id, reading the rank and snippet off the same match instead of searching per row
+        return queryset.extra(
+            tables=[self.TABLE],
+            where=[f'{self.TABLE}.rowid = "{table}"."id"', f'{self.TABLE} MATCH %s'],
+            params=[self.match_expression(terms)],
+            select={
+                # bm25 scores are negative, best match first in ascending order
+                'search_rank': f'bm25({self.TABLE}, {weights})',
+                'search_snippet_text': f"snippet({self.TABLE}, -1, %s, %s, '…', %s)",
+            },
+            select_params=[MATCH_START, MATCH_END, SNIPPET_WORDS],
+        )
+
+    def snippets(self, recipes, terms):
+        snippets = {recipe.id: recipe.search_snippet_text for recipe in recipes if hasattr(recipe, 'search_snippet_text')}
+        missing = [recipe.id for recipe in recipes if recipe.id not in snippets]
+        if missing:
+            snippets.update(self._query_snippets(missing, terms))
+        return snippets
+
+    def _query_snippets(self, recipe_ids, terms):
+        placeholders = ', '.join('%s' for _ in recipe_ids)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, snippet({self.TABLE}, -1, %s, %s, '…', %s) FROM {self.TABLE} "
+                f"WHERE {self.TABLE} MATCH %s AND rowid IN ({placeholders})",
+                [MATCH_START, MATCH_END, SNIPPET_WORDS, self.match_expression(terms), *recipe_ids],
+            )
+            return dict(cursor.fetchall())
+
+    def index(self, recipe):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.TABLE} WHERE rowid = %s", [recipe.id])
+            cursor.execute(
+                f"INSERT INTO {self.TABLE} (rowid, name, ingredients, method) VALUES (%s, %s, %s, %s)",
+                [recipe.id, recipe.name, recipe.ingredients, recipe.method],
+            )
+
+    def remove(self, recipe_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.TABLE} WHERE rowid = %s", [recipe_id])
+
+    def rebuild(self, recipes):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.TABLE}")
+            cursor.executemany(
+                f"INSERT INTO {self.TABLE} (rowid, name, ingredients, method) VALUES (%s, %s, %s, %s)",
+                recipes.values_list('id', 'name', 'ingredients', 'method').iterator(),
+            )
+
+
+class PostgresSearchBackend:
+    """Searches a GIN expression index over a weighted tsvector of the recipe columns."""
+
+    INDEX_NAME = 'recipe_search_idx'
+    CONFIG = 'english'
+
+    def vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return (
+            SearchVector('name', weight='A', config=self.CONFIG)
+            + SearchVector('ingredients', weight='B', config=self.CONFIG)
+            + SearchVector('method', weight='C', config=self.CONFIG)
+        )
+
+    def query(self, terms):
+        from django.contrib.postgres.search import SearchQuery
+
+        return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=self.CONFIG)
+
+    def _index(self):
+        from django.contrib.postgres.indexes import GinIndex
+
+        return GinIndex(self.vector(), name=self.INDEX_NAME)
+
+    def create_index(self, schema_editor, model):
+        schema_editor.add_index(model, self._index())
+
+    def drop_index(self, schema_editor, model):
+        schema_editor.remove_index(model, self._index())
+
+    def search(self, queryset, terms):
+        from django.contrib.postgres.search import SearchRank
+
+        query = self.query(terms)
+        # Filtering on the same expression the index was built from lets the planner use it
+        return queryset.annotate(search_document=self.vector()).filter(
+            search_document=query
+        ).annotate(search_rank=-SearchRank(self.vector(), query))
+
+    def snippets(self, recipes, terms):
+        from django.contrib.postgres.search import SearchHeadline
+        from django.db.models.functions import Concat
+        from recipes.models import Recipe
+
+        text = Concat('name', Value('. '), 'ingredients', Value('. '), 'method')
+        headlines = Recipe.objects.filter(id__in=[recipe.id for recipe in recipes]).annotate(
+            snippet=SearchHeadline(
+                text, self.query(terms), config=self.CONFIG,
+                start_sel=MATCH_START, stop_sel=MATCH_END, max_words=SNIPPET_WORDS,
+            )
+        )
+        return dict(headlines.values_list('id', 'snippet'))
+
+    def index(self, recipe):
+        pass
+
+    def remove(self, recipe_id):
+        pass
+
+    def rebuild(self, recipes):
+        pass
+
+
+class SubstringSearchBackend:
+    """Fallback for databases without a supported full-text index: plain substring matching."""
+
+    def create_index(self, schema_editor, model):
+        pass
+
+    def drop_index(self, schema_editor, model):
+        pass
+
+    def search(self, queryset, terms):
+        condition = Q()
+        for term in terms:
+            condition &= Q(name__icontains=term) | Q(ingredients__icontains=term) | Q(method__icontains=term)
+        return queryset.filter(condition).annotate(search_rank=Value(0))
+
+    def snippets(self, recipes, terms):
+        return {}
+
+    def index(self, recipe):
+        pass
+
+    def remove(self, recipe_id):
+        pass
+
+    def rebuild(self, recipes):
+        pass
+
+
+class RecipeSearchService:
+    """Service class for full-text recipe search, backed by whichever index the database supports."""
+
+    BACKENDS = {
+        'sqlite': SQLiteSearchBackend,
+        'postgresql': PostgresSearchBackend,
+    }
+
+    def __init__(self, vendor=None):
+        backend_class = self.BACKENDS.get(vendor or connection.vendor, SubstringSearchBackend)
+        self.backend = backend_class()
+
+    def search(self, queryset, query):
+        """
+        Narrow the queryset to recipes matching every word of the query.
+
+        Each recipe is annotated with search_rank, which sorts the best match
+        first in ascending order. A query with no searchable words matches nothing.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none().annotate(search_rank=Value(0))
+        return self.backend.search(queryset, terms)
+
+    def attach_snippets(self, recipes, query):
+        """Set search_snippet on each recipe to highlighted text around its matches."""
+        terms = search_terms(query)
+        snippets = self.backend.snippets(recipes, terms) if recipes and terms else {}
+        for recipe in recipes:
+            recipe.search_snippet = highlight_snippet(snippets.get(recipe.id))
+
+    def index(self, recipe):
+        """Add the recipe to the search index, replacing any stale copy."""
+        self.backend.index(recipe)
+
+    def remove(self, recipe_id):
+        """Drop a deleted recipe from the search index."""
+        self.backend.remove(recipe_id)
+
+    def rebuild(self, recipes=None):
+        """Re-index every recipe from scratch."""
+        from recipes.models import Recipe
+
+        self.backend.rebuild(Recipe.objects.all() if recipes is None else recipes)
@@ -0,0 +1,90 @@
+import traceback
+from datetime import timedelta
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+class TaskQueueService:
+    """
+    Service class to queue background work in the Task table and run it.
+
+    Handlers are plain functions registered under a name; a task stores that
+    name and the keyword arguments to call it with. Workers claim due tasks
+    with a conditional UPDATE, so several workers can share the table. A task
+    that raises is retried with a growing delay until MAX_ATTEMPTS, and a
+    task left running past LEASE by a worker that died is claimed again.
+    """
+
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY = timedelta(minutes=1)
+    LEASE = timedelta(minutes=10)
+    handlers = {}
+
+    @classmethod
+    def register(cls, name):
+        """Decorator registering a function as the handler of the named task."""
+        def decorator(function):
+            cls.handlers[name] = function
+            return function
+        return decorator
+
+    @classmethod
+    def enqueue(cls, name, /, **payload):
+        """Queue a task for the workers; it becomes visible to them when the current transaction commits."""
+        from recipes.models import Task
+
+        if name not in cls.handlers:
+            raise KeyError(f"No task handler registered as {name!r}")
+        return Task.objects.create(name=name, payload=payload)
+
+    def _due(self, now):
+        from recipes.models import Task
+
+        return (
+            Q(status=Task.Status.PENDING, run_after__lte=now)
+            | Q(status=Task.Status.RUNNING, started_at__lt=now - self.LEASE)
+        )
+
+    def claim(self, limit):
+        """Mark up to limit due tasks as running for this worker and return them, oldest first."""
+        from recipes.models import Task
+
+        now = timezone.now()
+        candidates = Task.objects.filter(self._due(now)).order_by('run_after', 'id').values_list('pk', flat=True)
+        claimed = []
+        for pk in candidates[:limit]:
+            # Only one worker's UPDATE can still match a task that is due
+            if Task.objects.filter(self._due(now), pk=pk).update(
+                status=Task.Status.RUNNING, started_at=now, attempts=F('attempts') + 1,
+            ):
+                claimed.append(pk)
+        return list(Task.objects.filter(pk__in=claimed).order_by('run_after', 'id'))
+
+    def run(self, task):
+        """Run a claimed task and record its outcome. Returns True if it succeeded."""
+        from recipes.models import Task
+
+        try:
+            handler = self.handlers[task.name]
+            handler(**task.payload)
+        except Exception:
+            retry = task.attempts < self.MAX_ATTEMPTS
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.Status.PENDING if retry else Task.Status.FAILED,
+                run_after=timezone.now() + self.RETRY_DELAY * 2 ** (task.attempts - 1),
+                finished_at=None if retry else timezone.now(),
+                last_error=traceback.format_exc(),
+            )
+            return False
+
+        Task.objects.filter(pk=task.pk).update(status=Task.Status.DONE, finished_at=timezone.now(), last_error='')
+        return True
+
+    def run_pending(self, limit=100):
+        """Claim and run due tasks in this thread until none are left. Returns how many ran."""
+        count = 0
+        while tasks := self.claim(limit):
+            for task in tasks:
+                self.run(task)
+                count += 1
+        return count
@@ -0,0 +1,173 @@
+import time as clock
+from datetime import datetime, time, timedelta
+from django.core.cache import cache
+from django.db.models import Avg, Count, DateField, DateTimeField, DurationField, F, Max, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+
+BUCKETS = ('day', 'week', 'month')
+
+
+def bucket_start(day, bucket):
+    """Return the first date of the day, week (from Monday) or month containing the given date."""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket_start(start, bucket):
+    """Return the first date of the bucket after the one starting on the given date."""
+    if bucket == 'week':
+        return start + timedelta(weeks=1)
+    if bucket == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_ranges(start, end, bucket):
+    """Yield the (first, last) dates of every bucket overlapping start..end, clipped to that range."""
+    current = bucket_start(start, bucket)
+    while current <= end:
+        following = next_bucket_start(current, bucket)
+        yield max(current, start), min(following - timedelta(days=1), end)
+        current = following
+
+
+def _hours(duration):
+    return round(duration.total_seconds() / 3600, 1) if duration else 0
+
+
+class WaterMetric:
+    """Water drunk per bucket, from the daily logs."""
+
+    date_field = 'date'
+
+    def queryset(self, user):
+        from recipes.models import DailyLog
+
+        return DailyLog.objects.filter(user=user)
+
+    def aggregates(self):
+        return {'total_ml': Sum('amount_ml')}
+
+    def point(self, values, days):
+        total = values.get('total_ml') or 0
+        return {'total_ml': total, 'average_ml': int(total / days)}
+
+
+class FastingMetric:
+    """Completed fasts per bucket, attributed to the local day they started."""
+
+    date_field = 'start_date_time'
+
+    def queryset(self, user):
+        from recipes.models import FastingSession
+
+        return FastingSession.objects.filter(user=user, is_active=False, end_date_time__isnull=False)
+
+    def aggregates(self):
+        duration = F('end_date_time') - F('start_date_time')
+        return {
+            'fasts': Count('pk'),
+            'average': Avg(duration, output_field=DurationField()),
+            'longest': Max(duration, output_field=DurationField()),
+        }
+
+    def point(self, values, days):
+        return {
+            'fasts': values.get('fasts', 0),
+            'average_hours': _hours(values.get('average')),
+            'longest_hours': _hours(values.get('longest')),
+        }
+
+
+class NutritionMetric:
+    """Calories and macros consumed per bucket, from the DailyNutrition rollups."""
+
+    date_field = 'date'
+    FIELDS = ('calories', 'protein_g', 'carbs_g', 'fat_g')
+
+    def queryset(self, user):
+        from recipes.models import DailyNutrition
+
+        return DailyNutrition.objects.filter(user=user)
+
+    def aggregates(self):
+        return {field: Sum(field) for field in self.FIELDS}
+
+    def point(self, values, days):
+        point = {field: round(values.get(field) or 0, 1) for field in self.FIELDS}
+        point['calories'] = int(point['calories'])
+        return point
+
+
+class TimeSeriesService:
+    """
+    Service class to bucket a user's tracker history into day, week or month totals.
+
+    Each metric is grouped by bucket in a single query over the requested
+    range, then empty buckets are filled in. Results are cached per user and
+    metric until a write to that metric calls invalidate().
+    """
+
+    METRICS = {
+        'water': WaterMetric,
+        'fasting': FastingMetric,
+        'nutrition': NutritionMetric,
+    }
+    CACHE_TIMEOUT = 60 * 60
+
+    def __init__(self, user):
+        self.user = user
+
+    @staticmethod
+    def _version_key(user_id, metric):
+        return f'history-version:{user_id}:{metric}'
+
+    @classmethod
+    def invalidate(cls, user_id, metric):
+        """Drop the cached series of one of a user's metrics after a write to it."""
+        cache.set(cls._version_key(user_id, metric), clock.time_ns(), None)
+
+    def series(self, metric, start, end, bucket='day'):
+        """
+        Return one point per bucket from start to end inclusive, oldest first.
+
+        Every point has the start and end dates of its bucket, clipped to the
+        range, the number of days it covers, and the metric's values.
+        """
+        version = cache.get_or_set(self._version_key(self.user.pk, metric), clock.time_ns, None)
+        key = f'history:{self.user.pk}:{metric}:{version}:{start.isoformat()}:{end.isoformat()}:{bucket}'
+        points = cache.get(key)
+        if points is None:
+            points = self._build_series(self.METRICS[metric](), start, end, bucket)
+            cache.set(key, points, self.CACHE_TIMEOUT)
+        return points
+
+    def _build_series(self, metric, start, end, bucket):
+        field = metric.date_field
+        queryset = metric.queryset(self.user)
+        if isinstance(queryset.model._meta.get_field(field), DateTimeField):
+            # Compare against local midnights so the range can be read off the (user, start) index
+            tz = timezone.get_current_timezone()
+            queryset = queryset.filter(**{
+                f'{field}__gte': timezone.make_aware(datetime.combine(start, time.min), tz),
+                f'{field}__lt': timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+            })
+            truncated = Trunc(field, bucket, output_field=DateField(), tzinfo=tz)
+        else:
+            queryset = queryset.filter(**{f'{field}__range': (start, end)})
+            truncated = Trunc(field, bucket, output_field=DateField())
+
+        rows = queryset.order_by().annotate(bucket=truncated).values('bucket').annotate(**metric.aggregates())
+        by_bucket = {row.pop('bucket'): row for row in rows}
+
+        points = []
+        for first, last in bucket_ranges(start, end, bucket):
+            days = (last - first).days + 1
+            values = by_bucket.get(bucket_start(first, bucket), {})
+            points.append({'start': first, 'end': last, 'days': days, **metric.point(values, days)})
+        return points
@@ -0,0 +1,35 @@
+class TimelineService:
+    """Service class to maintain a user's materialised followed-only timeline."""
+
+    BATCH_SIZE = 500
+
+    def __init__(self, user):
+        self.user = user
+
+    def publish(self, post):
+        """Fan a new post out to the author's own timeline and every follower's."""
+        from recipes.models import Follow, TimelineEntry
+
+        follower_ids = Follow.objects.filter(followed=self.user).values_list('follower_id', flat=True)
+        entries = [
+            TimelineEntry(user_id=user_id, post=post, author=self.user, created_at=post.created_at)
+            for user_id in [self.user.id, *follower_ids]
+        ]
+        TimelineEntry.objects.bulk_create(entries, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+
+    def follow(self, author):
+        """Backfill the timeline with every existing post by a newly followed author."""
+        from recipes.models import Post, TimelineEntry
+
+        posts = Post.objects.filter(author=author).values_list('id', 'created_at')
+        entries = [
+            TimelineEntry(user=self.user, post_id=post_id, author=author, created_at=created_at)
+            for post_id, created_at in posts
+        ]
+        TimelineEntry.objects.bulk_create(entries, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+
+    def unfollow(self, author):
+        """Drop an unfollowed author's posts from the timeline."""
+        from recipes.models import TimelineEntry
+
+        TimelineEntry.objects.filter(user=self.user, author=author).delete()
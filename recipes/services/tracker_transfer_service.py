@@ -0,0 +1,187 @@
+import csv
+import json
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+
+class TrackerImportError(ValueError):
+    """Raised when an imported record can't be read, with the line it came from."""
+
+    def __init__(self, line, message):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+def _text(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+class _Echo:
+    """File-like object whose write() hands back the line, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+class TrackerTransferService:
+    """
+    Service class to export a user's tracker history and import it back.
+
+    Exports stream rows straight from a database iterator. Imports consume
+    records in chunks of CHUNK_SIZE, so neither holds the full history in
+    memory. Daily logs are upserted on (user, date), and meals and fasts that
+    already exist are skipped, so importing the same file twice is harmless.
+    """
+
+    CHUNK_SIZE = 1000
+    DATASETS = {
+        'meals': ('Meal', ['date', 'meal_type', 'name', 'calories', 'protein_g', 'carbs_g', 'fat_g']),
+        'daily_logs': (
+            'DailyLog',
+            ['date', 'amount_ml', 'water_goal', 'calorie_goal', 'protein_goal', 'carbs_goal', 'fat_goal'],
+        ),
+        'fasting_sessions': ('FastingSession', ['start_date_time', 'end_date_time', 'target_duration', 'is_active']),
+    }
+
+    def __init__(self, user):
+        self.user = user
+
+    def _model(self, dataset):
+        from django.apps import apps
+
+        return apps.get_model('recipes', self.DATASETS[dataset][0])
+
+    def rows(self, dataset):
+        """Iterate over the user's rows of a dataset as tuples, oldest first."""
+        fields = self.DATASETS[dataset][1]
+        queryset = self._model(dataset).objects.filter(user=self.user).order_by(fields[0], 'id')
+        return queryset.values_list(*fields).iterator(chunk_size=self.CHUNK_SIZE)
+
+    def export_csv(self, dataset):
+        """Yield one dataset as CSV, a line at a time, starting with the header."""
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.DATASETS[dataset][1])
+        for row in self.rows(dataset):
+            yield writer.writerow(['' if value is None else _text(value) for value in row])
+
+    def export_jsonl(self):
+        """Yield every dataset as JSON Lines, one record per line tagged with its dataset."""
+        for dataset, (_, fields) in self.DATASETS.items():
+            for row in self.rows(dataset):
+                yield json.dumps({'dataset': dataset, **dict(zip(fields, row))}, cls=DjangoJSONEncoder) + '\n'
+
+    def import_csv(self, dataset, lines):
+        """Import one dataset from lines of CSV text with a header row."""
+        reader = csv.DictReader(lines)
+        missing = set(self.DATASETS[dataset][1]) - set(reader.fieldnames or [])
+        if missing:
+            raise TrackerImportError(1, f"missing columns: {', '.join(sorted(missing))}")
+        return self.import_records((reader.line_num, dataset, row) for row in reader)
+
+    def import_jsonl(self, lines):
+        """Import records from lines of JSON, each naming its dataset."""
+        return self.import_records(self._parse_jsonl(lines))
+
+    def _parse_jsonl(self, lines):
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict) or not isinstance(record.get('dataset'), str):
+                raise TrackerImportError(number, "expected a JSON object with a dataset")
+            dataset = record.pop('dataset')
+            if dataset not in self.DATASETS:
+                raise TrackerImportError(number, f"unknown dataset {dataset!r}")
+            yield number, dataset, record
+
+    def import_records(self, records):
+        """
+        Import (line, dataset, fields) records in chunks, all or nothing.
+
+        Returns how many records of each dataset were written, and how many
+        were skipped as already present or still in progress.
+        """
+        from recipes.services import TimeSeriesService, UserStatsService
+
+        counts = dict.fromkeys([*self.DATASETS, 'skipped'], 0)
+        form_classes = {dataset: self._form_class(dataset) for dataset in self.DATASETS}
+        records = iter(records)
+        with transaction.atomic():
+            while chunk := list(islice(records, self.CHUNK_SIZE)):
+                by_dataset = {dataset: [] for dataset in self.DATASETS}
+                for line, dataset, fields in chunk:
+                    by_dataset[dataset].append(self._validate(line, form_classes[dataset], fields))
+                for dataset, instances in by_dataset.items():
+                    if instances:
+                        written = getattr(self, f'_import_{dataset}')(instances)
+                        counts[dataset] += written
+                        counts['skipped'] += len(instances) - written
+
+        # Bulk writes send no signals, so drop the cached views of this history here
+        UserStatsService.invalidate(self.user.pk)
+        TimeSeriesService.invalidate(self.user.pk, 'water')
+        TimeSeriesService.invalidate(self.user.pk, 'fasting')
+        return counts
+
+    def _form_class(self, dataset):
+        from django.forms import modelform_factory
+        from recipes.forms.meal_form import MealForm
+
+        if dataset == 'meals':
+            return MealForm
+        return modelform_factory(self._model(dataset), fields=self.DATASETS[dataset][1])
+
+    def _validate(self, line, form_class, fields):
+        form = form_class(fields)
+        if not form.is_valid():
+            errors = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in form.errors.items())
+            raise TrackerImportError(line, errors)
+        instance = form.save(commit=False)
+        instance.user = self.user
+        return instance
+
+    def _import_meals(self, meals):
+        from recipes.models import Meal
+        from recipes.services import MealLogService
+
+        fields = self.DATASETS['meals'][1]
+        existing = set(
+            Meal.objects.filter(user=self.user, date__in={meal.date for meal in meals}).values_list(*fields)
+        )
+        new_meals = [meal for meal in meals if tuple(getattr(meal, field) for field in fields) not in existing]
+        if new_meals:
+            MealLogService().log_meals(self.user, new_meals)
+        return len(new_meals)
+
+    def _import_daily_logs(self, logs):
+        from recipes.models import DailyLog
+
+        # An upsert can't touch the same row twice in one statement, so the last log for a day wins
+        by_date = {log.date: log for log in logs}
+        fields = self.DATASETS['daily_logs'][1]
+        DailyLog.objects.bulk_create(
+            by_date.values(),
+            batch_size=self.CHUNK_SIZE,
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=[field for field in fields if field != 'date'],
+        )
+        return len(logs)
+
+    def _import_fasting_sessions(self, sessions):
+        from recipes.models import FastingSession
+
+        # Only finished fasts are imported, so an import can't start a second active fast
+        completed = [session for session in sessions if not session.is_active and session.end_date_time]
+        existing = set(
+            FastingSession.objects.filter(
+                user=self.user, start_date_time__in=[session.start_date_time for session in completed]
+            ).values_list('start_date_time', flat=True)
+        )
+        new_sessions = [session for session in completed if session.start_date_time not in existing]
+        FastingSession.objects.bulk_create(new_sessions, batch_size=self.CHUNK_SIZE)
+        return len(new_sessions)
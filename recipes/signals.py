@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from recipes.models import User, Profile, Recipe, Meal, Post, Follow, Save, DailyLog, FastingSession
+from recipes.services import RecipeSearchService, TimeSeriesService, UserStatsService
+
+
+@receiver(post_save, sender=User)
+def create_profile(sender, instance, created, raw=False, **kwargs):
+    """Give every new user a Profile with the default goals, so requests never have to create one."""
+    if created and not raw:
+        Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Recipe)
+def index_recipe(sender, instance, **kwargs):
+    """Keep the full-text search index in step with the saved recipe."""
+    RecipeSearchService().index(instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def unindex_recipe(sender, instance, **kwargs):
+    """Drop a deleted recipe from the full-text search index."""
+    RecipeSearchService().remove(instance.id)
+
+
+def _invalidate_user_stats(sender, instance, **kwargs):
+    """Drop the cached profile stats of every user the changed row counts towards."""
+    for field in STATS_USER_FIELDS[sender]:
+        UserStatsService.invalidate(getattr(instance, f'{field}_id'))
+
+
+STATS_USER_FIELDS = {
+    Meal: ['user'],
+    Post: ['author'],
+    Follow: ['follower', 'followed'],
+    Save: ['user'],
+    DailyLog: ['user'],
+    FastingSession: ['user'],
+}
+
+for model in STATS_USER_FIELDS:
+    post_save.connect(_invalidate_user_stats, sender=model, dispatch_uid=f'user-stats-{model.__name__}-save')
+    post_delete.connect(_invalidate_user_stats, sender=model, dispatch_uid=f'user-stats-{model.__name__}-delete')
+
+
+def _invalidate_history(sender, instance, **kwargs):
+    """Drop the cached time series the changed row is bucketed into."""
+    TimeSeriesService.invalidate(instance.user_id, HISTORY_METRICS[sender])
+
+
+# Nutrition history is invalidated by NutritionRollupService, which writes its rows with update()
+HISTORY_METRICS = {
+    DailyLog: 'water',
+    FastingSession: 'fasting',
+}
+
+for model in HISTORY_METRICS:
+    post_save.connect(_invalidate_history, sender=model, dispatch_uid=f'history-{model.__name__}-save')
+    post_delete.connect(_invalidate_history, sender=model, dispatch_uid=f'history-{model.__name__}-delete')
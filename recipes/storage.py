@@ -0,0 +1,65 @@
+import hashlib
+import os
+import re
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+
+
+CONTENT_ADDRESSED_NAME = re.compile(r'^[0-9a-f]{64}(_\d+w)?\.[a-z0-9]+$')
+
+
+def select_image_storage():
+    """Return the storage uploaded images are kept in, as configured under STORAGES['images']."""
+    return storages['images']
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that names every file after the SHA-256 of its content.
+
+    Saving bytes that are already stored returns the existing name instead of
+    writing a copy, so an image uploaded twice is kept once, and a name always
+    refers to the same content, which can be cached forever. Names already in
+    that form, such as the renditions named after their source, are kept;
+    upload names pass through generate_filename first, which drops them.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, *args, **kwargs):
+        # Two uploads racing to write the same name write the same bytes
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def is_content_addressed(name):
+        return bool(CONTENT_ADDRESSED_NAME.match(os.path.basename(name)))
+
+    def content_name(self, name, content):
+        """Return the name a file is stored under: its hash in the directory and with the extension of name."""
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks(self.CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, f'{digest.hexdigest()}{extension}').replace('\\', '/')
+
+    def generate_filename(self, filename):
+        # Drop the uploaded name, so a client can't pass off a name as the hash of other content
+        directory, name = os.path.split(filename)
+        return super().generate_filename(os.path.join(directory, f'upload{os.path.splitext(name)[1].lower()}'))
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        if not self.is_content_addressed(name):
+            name = self.content_name(name, content)
+        if self.exists(name):
+            # Count the reuse as a fresh upload, so the orphaned media sweep's grace period covers it
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length=max_length)
@@ -0,0 +1,22 @@
+"""Background task handlers, run by the run_worker management command."""
+
+from django.apps import apps
+from recipes.services import MediaService, TaskQueueService
+
+
+@TaskQueueService.register('generate_renditions')
+def generate_renditions(model, pk, field, name):
+    """Normalize an uploaded image and write its renditions, unless it has been replaced or deleted since."""
+    instance = apps.get_model(model)._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    image = getattr(instance, field)
+    if image.name != name:
+        return
+    image.generate_renditions()
+
+
+@TaskQueueService.register('release_media')
+def release_media(names):
+    """Remove stored images, and their renditions, that no row refers to any more."""
+    MediaService().delete_unreferenced(names)
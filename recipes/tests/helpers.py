@@ -1,3 +1,9 @@
+import shutil
+import tempfile
+from io import BytesIO
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 from with_asserts.mixin import AssertHTMLMixin
 
@@ -8,6 +14,26 @@ def reverse_with_next(url_name, next_url):
     return url
 
 
+def create_image_upload(width=100, height=100, name='photo.jpg', image_format='JPEG', mode='RGB', exif=None):
+    """Return an uploaded image file of the given size, optionally with EXIF data."""
+    buffer = BytesIO()
+    options = {'exif': exif} if exif is not None else {}
+    Image.new(mode, (width, height), color='red').save(buffer, format=image_format, **options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{image_format.lower()}')
+
+
+class TemporaryMediaMixin:
+    """Class to point MEDIA_ROOT at a temporary directory for the duration of each test."""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+
 class LogInTester:
     """Class support login in tests."""
  
@@ -0,0 +1,85 @@
+"""Tests for the delete_orphaned_media management command."""
+import os
+import time
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import User, Post
+from recipes.services import MediaService, TaskQueueService
+from recipes.storage import select_image_storage
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload
+
+
+class DeleteOrphanedMediaTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for the delete_orphaned_media command."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        """Set up a processed post and an orphaned image with a rendition, all past the grace period."""
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.storage = select_image_storage()
+        post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(800, 600))
+        TaskQueueService().run_pending()
+        self.post = Post.objects.get(pk=post.pk)
+        self.kept_rendition = self.post.image.name.replace('.jpg', '_320w.webp')
+        self.orphan = self.storage.save('posts_images/upload.jpg', ContentFile(b'orphan'))
+        self.orphan_rendition = self.orphan.replace('.jpg', '_320w.webp')
+        self.storage.save(self.orphan_rendition, ContentFile(b'orphan rendition'))
+        old = time.time() - 2 * 24 * 60 * 60
+        for name, _, _ in MediaService().stored_files():
+            os.utime(self.storage.path(name), (old, old))
+
+    def test_deletes_unreferenced_files_and_their_renditions(self):
+        """Test that orphaned files are deleted and referenced ones, with their renditions, are kept."""
+        out = StringIO()
+        call_command('delete_orphaned_media', stdout=out)
+        self.assertIn('Deleted 2 orphaned file(s)', out.getvalue())
+        self.assertFalse(self.storage.exists(self.orphan))
+        self.assertFalse(self.storage.exists(self.orphan_rendition))
+        self.assertTrue(self.storage.exists(self.post.image.name))
+        self.assertTrue(self.storage.exists(self.kept_rendition))
+
+    def test_dry_run_only_reports(self):
+        """Test that --dry-run reports orphaned files without deleting them."""
+        out = StringIO()
+        call_command('delete_orphaned_media', '--dry-run', '--verbosity', '2', stdout=out)
+        self.assertIn('Found 2 orphaned file(s)', out.getvalue())
+        self.assertIn(self.orphan, out.getvalue())
+        self.assertTrue(self.storage.exists(self.orphan))
+
+    def test_recent_files_are_left_alone(self):
+        """Test that files modified within the grace period are not deleted."""
+        name = self.storage.save('posts_images/upload.jpg', ContentFile(b'in flight'))
+        out = StringIO()
+        call_command('delete_orphaned_media', stdout=out)
+        self.assertTrue(self.storage.exists(name))
+        self.assertIn('Left 1 file(s) modified within the grace period alone.', out.getvalue())
+
+    def test_uploading_an_orphan_again_restarts_its_grace_period(self):
+        """Test that a new upload of an orphan's bytes keeps the shared file from being swept."""
+        self.assertEqual(self.storage.save('posts_images/upload.jpg', ContentFile(b'orphan')), self.orphan)
+        call_command('delete_orphaned_media', stdout=StringIO())
+        self.assertTrue(self.storage.exists(self.orphan))
+
+    def test_grace_period_can_be_shortened(self):
+        """Test that --grace-hours 0 sweeps files regardless of their age."""
+        name = self.storage.save('profile_pics/upload.jpg', ContentFile(b'just now'))
+        call_command('delete_orphaned_media', '--grace-hours', '0', stdout=StringIO())
+        self.assertFalse(self.storage.exists(name))
+
+    def test_small_chunks(self):
+        """Test that checking one file per query finds the same orphans."""
+        out = StringIO()
+        call_command('delete_orphaned_media', '--chunk-size', '1', stdout=out)
+        self.assertIn('Deleted 2 orphaned file(s)', out.getvalue())
+        self.assertTrue(self.storage.exists(self.post.image.name))
+
+    def test_files_outside_upload_directories_are_ignored(self):
+        """Test that media outside the tracked upload directories is never touched."""
+        name = default_storage.save('exports/report.csv', ContentFile(b'data'))
+        call_command('delete_orphaned_media', '--grace-hours', '0', stdout=StringIO())
+        self.assertTrue(default_storage.exists(name))
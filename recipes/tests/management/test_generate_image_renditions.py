@@ -0,0 +1,52 @@
+"""Tests for the generate_image_renditions management command."""
+from io import StringIO
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import User, Post, Recipe
+from recipes.storage import ContentAddressedStorage
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload
+
+
+class GenerateImageRenditionsTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for the generate_image_renditions command."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        """Set up a post whose image was stored before the rendition pipeline."""
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.original = default_storage.save('posts_images/legacy.png', create_image_upload(900, 600, image_format='PNG'))
+        self.post = Post.objects.create(author=self.user, title="Post")
+        Post.objects.filter(pk=self.post.pk).update(image=self.original)
+
+    def test_processes_legacy_images(self):
+        """Test that a stored image is normalized, gets renditions and replaces the original."""
+        out = StringIO()
+        call_command('generate_image_renditions', stdout=out)
+        self.assertIn('Generated renditions for 1 image(s).', out.getvalue())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertTrue(ContentAddressedStorage.is_content_addressed(post.image.name))
+        self.assertEqual(post.image_width, 900)
+        self.assertTrue(default_storage.exists(post.image.name.replace('.jpg', '_640w.webp')))
+        self.assertFalse(default_storage.exists(self.original))
+
+    def test_skips_missing_files(self):
+        """Test that an image that isn't in media storage is reported and left alone."""
+        recipe = Recipe.objects.create(
+            name="Soup", total_time="10 min", ingredients="Water", method="Boil", created_by=self.user,
+        )
+        out = StringIO()
+        call_command('generate_image_renditions', stdout=out)
+        self.assertIn('Skipped 1 image(s)', out.getvalue())
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.image.name, 'images/food1.jpg')
+        self.assertIsNone(recipe.image_width)
+
+    def test_second_run_does_nothing(self):
+        """Test that processed images are not processed again."""
+        call_command('generate_image_renditions', stdout=StringIO())
+        out = StringIO()
+        call_command('generate_image_renditions', stdout=out)
+        self.assertIn('Generated renditions for 0 image(s).', out.getvalue())
@@ -0,0 +1,30 @@
+"""Tests for the rebuild_nutrition_rollups management command."""
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import User, Meal, DailyNutrition
+
+
+class RebuildNutritionRollupsTestCase(TestCase):
+    """Tests for the rebuild_nutrition_rollups command."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        """Set up a day whose stored totals have drifted from its meals."""
+        self.user = User.objects.get(username='@johndoe')
+        Meal.objects.create(
+            user=self.user, name="Soup", meal_type='Lunch', date=date.today(),
+            calories=400, protein_g=20.0, carbs_g=30.0, fat_g=10.0,
+        )
+        DailyNutrition.objects.update(calories=0, protein_g=0)
+
+    def test_rebuild_restores_totals(self):
+        """Test that the command recomputes the totals from the meals."""
+        out = StringIO()
+        call_command('rebuild_nutrition_rollups', stdout=out)
+        rollup = DailyNutrition.objects.get(user=self.user, date=date.today())
+        self.assertEqual(rollup.calories, 400)
+        self.assertEqual(rollup.protein_g, 20.0)
+        self.assertIn('Rebuilt nutrition totals for 1 day(s).', out.getvalue())
@@ -0,0 +1,50 @@
+"""Tests for the reconcile_post_counters management command."""
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import User, Post, Like, Comment, Save
+
+
+class ReconcilePostCountersTestCase(TestCase):
+    """Tests for the reconcile_post_counters command."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        """Set up a post whose counters have drifted from its interactions."""
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.post = Post.objects.create(author=self.user, title="Drifted Post", like_count=7)
+        Like.objects.create(user=self.user, post=self.post)
+        Like.objects.create(user=self.other_user, post=self.post)
+        Comment.objects.create(user=self.other_user, post=self.post, text="Nice")
+        Save.objects.create(user=self.other_user, post=self.post)
+        self.accurate_post = Post.objects.create(author=self.other_user, title="Accurate Post")
+
+    def test_reconcile_fixes_drifted_counters(self):
+        """Test that the command rewrites counters from the interaction tables."""
+        out = StringIO()
+        call_command('reconcile_post_counters', stdout=out)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 2)
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.save_count, 1)
+        self.assertIn('Reconciled counters on 1 post(s).', out.getvalue())
+
+    def test_dry_run_does_not_update(self):
+        """Test that --dry-run only reports drifted posts."""
+        out = StringIO()
+        call_command('reconcile_post_counters', '--dry-run', stdout=out)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 7)
+        self.assertIn('1 post(s) have drifted counters.', out.getvalue())
+
+    def test_reports_when_nothing_drifted(self):
+        """Test that the command reports when all counters are correct."""
+        call_command('reconcile_post_counters', stdout=StringIO())
+        out = StringIO()
+        call_command('reconcile_post_counters', stdout=out)
+        self.assertIn('All post counters are correct.', out.getvalue())
@@ -0,0 +1,36 @@
+"""Tests for the refresh_avatar_urls management command."""
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from recipes.models import User
+from recipes.services import AvatarService
+from recipes.tests.helpers import TemporaryMediaMixin
+
+
+class RefreshAvatarUrlsTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for the refresh_avatar_urls command."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        super().setUp()
+        for user in User.objects.all():
+            user.save()
+
+    @override_settings(LOCAL_AVATARS=True)
+    def test_switching_to_local_avatars_refreshes_every_user(self):
+        """Test that stored Gravatar URLs are replaced by initials avatars."""
+        out = StringIO()
+        call_command('refresh_avatar_urls', stdout=out)
+        self.assertIn(f'Refreshed {User.objects.count()} avatar URL(s).', out.getvalue())
+        for user in User.objects.all():
+            self.assertEqual(user.avatar_url, AvatarService().initials_url(user))
+
+    def test_up_to_date_urls_are_left_alone(self):
+        """Test that users whose stored URL is current are not rewritten."""
+        out = StringIO()
+        call_command('refresh_avatar_urls', stdout=out)
+        self.assertIn('Refreshed 0 avatar URL(s).', out.getvalue())
@@ -0,0 +1,34 @@
+"""Tests for the run_worker management command."""
+from io import StringIO
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import User, Post, Task
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload
+
+
+class RunWorkerTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for the run_worker command."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+
+    def test_once_processes_queued_images_and_exits(self):
+        """Test that the worker runs the queued rendition task and stops when the queue is empty."""
+        post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(700, 400))
+        out = StringIO()
+        call_command('run_worker', '--once', '--threads', '1', stdout=out)
+        self.assertIn('Ran 1 task(s).', out.getvalue())
+        post.refresh_from_db()
+        self.assertEqual(post.image_width, 700)
+        self.assertTrue(default_storage.exists(post.image.name.replace('.jpg', '_320w.webp')))
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+
+    def test_once_with_empty_queue(self):
+        """Test that the worker exits straight away when nothing is queued."""
+        out = StringIO()
+        call_command('run_worker', '--once', '--threads', '1', stdout=out)
+        self.assertIn('Ran 0 task(s).', out.getvalue())
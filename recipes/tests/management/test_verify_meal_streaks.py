@@ -0,0 +1,43 @@
+"""Tests for the verify_meal_streaks management command."""
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import User, Meal, MealStreak
+
+
+class VerifyMealStreaksTestCase(TestCase):
+    """Tests for the verify_meal_streaks command."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        """Set up a user whose stored streak has drifted from their meals."""
+        self.user = User.objects.get(username='@johndoe')
+        Meal.objects.create(
+            user=self.user, name="Soup", meal_type='Lunch', date=date.today(),
+            calories=400, protein_g=20.0, carbs_g=30.0, fat_g=10.0,
+        )
+        MealStreak.objects.update(current_streak=5, longest_streak=5)
+
+    def test_reports_drift_without_fixing(self):
+        """Test that the command lists drifted users and leaves them alone by default."""
+        out = StringIO()
+        call_command('verify_meal_streaks', stdout=out)
+        self.assertIn('1 user(s) have incorrect meal streaks.', out.getvalue())
+        self.assertEqual(MealStreak.objects.get(user=self.user).current_streak, 5)
+
+    def test_fix_repairs_drift(self):
+        """Test that --fix recomputes the drifted streaks."""
+        out = StringIO()
+        call_command('verify_meal_streaks', fix=True, stdout=out)
+        streak = MealStreak.objects.get(user=self.user)
+        self.assertEqual((streak.current_streak, streak.longest_streak), (1, 1))
+        self.assertIn('Repaired meal streaks for 1 user(s).', out.getvalue())
+
+    def test_reports_correct_streaks(self):
+        """Test that the command reports success when nothing has drifted."""
+        MealStreak.objects.update(current_streak=1, longest_streak=1)
+        out = StringIO()
+        call_command('verify_meal_streaks', stdout=out)
+        self.assertIn('All meal streaks are correct.', out.getvalue())
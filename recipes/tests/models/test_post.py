@@ -1,6 +1,6 @@
 """Tests for the Post model."""
 from django.test import TestCase
-from recipes.models import User, Post, Like, Save, Comment
+from recipes.models import User, Post, Like, Save, Comment, Rating, Follow
 
 
 class PostModelTestCase(TestCase):
@@ -95,4 +95,44 @@ class PostModelTestCase(TestCase):
             author=self.user,
             title="New Post",
         )
-        self.assertEqual(post.servings, 1)
\ No newline at end of file
+        self.assertEqual(post.servings, 1)
+
+    def test_default_ranking_score_is_prior_mean(self):
+        """Test that an unrated post ranks at the prior mean."""
+        self.assertEqual(self.post.ranking_score, Post.RANKING_PRIOR_MEAN)
+
+    def test_compute_ranking_score_shrinks_few_votes(self):
+        """Test that a single 5-star vote scores below many 4.5-star votes."""
+        single_vote = Post.compute_ranking_score(5, 1)
+        many_votes = Post.compute_ranking_score(90, 20)
+        self.assertLess(single_vote, many_votes)
+        self.assertLess(single_vote, 5)
+
+    def test_ranking_score_expression_matches_python(self):
+        """Test that the database expression agrees with compute_ranking_score."""
+        Post.objects.filter(pk=self.post.pk).update(rating_total_score=13, rating_count=3)
+        Post.objects.filter(pk=self.post.pk).update(ranking_score=Post.ranking_score_expression())
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.ranking_score, Post.compute_ranking_score(13, 3))
+
+    def test_with_viewer_state_annotates_interactions(self):
+        """Test that with_viewer_state reflects the given user's interactions."""
+        Like.objects.create(user=self.other_user, post=self.post)
+        Save.objects.create(user=self.other_user, post=self.post)
+        Rating.objects.create(user=self.other_user, post=self.post, score=5)
+        Follow.objects.create(follower=self.other_user, followed=self.user)
+        post = Post.objects.with_viewer_state(self.other_user).get(pk=self.post.pk)
+        self.assertTrue(post.is_liked_by_user)
+        self.assertTrue(post.is_saved_by_user)
+        self.assertTrue(post.is_followed_by_user)
+        self.assertEqual(post.user_rating_score, 5)
+
+    def test_with_viewer_state_defaults_for_other_users(self):
+        """Test that another user's interactions don't leak into the annotations."""
+        Like.objects.create(user=self.other_user, post=self.post)
+        Rating.objects.create(user=self.other_user, post=self.post, score=5)
+        post = Post.objects.with_viewer_state(self.user).get(pk=self.post.pk)
+        self.assertFalse(post.is_liked_by_user)
+        self.assertFalse(post.is_saved_by_user)
+        self.assertFalse(post.is_followed_by_user)
+        self.assertEqual(post.user_rating_score, 0)
@@ -124,3 +124,8 @@ class ProfileModelTestCase(TestCase):
         with self.assertRaises(IntegrityError):
             Profile.objects.create(user=self.user)
 
+
+    def test_creating_a_user_creates_their_profile(self):
+        """Test that a newly created user gets a profile from the post_save signal."""
+        user = User.objects.create_user('@newuser', email='newuser@example.org', password='Password123')
+        self.assertTrue(Profile.objects.filter(user=user).exists())
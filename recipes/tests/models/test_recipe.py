@@ -0,0 +1,41 @@
+"""Tests for the Recipe model."""
+from django.test import TestCase
+from recipes.models import User, Recipe
+
+
+class RecipeModelTestCase(TestCase):
+    """Tests for the Recipe model."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.recipe = Recipe.objects.create(
+            name="Stew",
+            total_time="1 hour 15 minutes",
+            ingredients="beef, carrots",
+            method="Simmer.",
+            created_by=User.objects.get(username='@johndoe'),
+        )
+
+    def test_str_returns_name(self):
+        """Test that Recipe __str__ returns the name."""
+        self.assertEqual(str(self.recipe), "Stew")
+
+    def test_save_parses_total_minutes(self):
+        """Test that saving a recipe stores its total time in minutes."""
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.total_minutes, 75)
+
+    def test_save_with_update_fields_refreshes_total_minutes(self):
+        """Test that saving only total_time still keeps total_minutes in step."""
+        self.recipe.total_time = "20 min"
+        self.recipe.save(update_fields=['total_time'])
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.total_minutes, 20)
+
+    def test_unreadable_time_stores_null(self):
+        """Test that a total time without a duration leaves total_minutes empty."""
+        self.recipe.total_time = "overnight"
+        self.recipe.save()
+        self.recipe.refresh_from_db()
+        self.assertIsNone(self.recipe.total_minutes)
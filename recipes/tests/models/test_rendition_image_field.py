@@ -0,0 +1,117 @@
+"""Unit tests for RenditionImageField."""
+from django.test import TestCase
+from recipes.models import User, Post, Task
+from recipes.services import TaskQueueService
+from recipes.storage import ContentAddressedStorage
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload
+
+
+class RenditionImageFieldTestCase(TemporaryMediaMixin, TestCase):
+    """Unit tests for images stored through RenditionImageField."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+
+    def create_processed_post(self, upload):
+        post = Post.objects.create(author=self.user, title="Post", image=upload)
+        TaskQueueService().run_pending()
+        return Post.objects.get(pk=post.pk)
+
+    def test_saved_upload_is_queued_for_processing(self):
+        """Test that saving an upload stores it as-is and queues its renditions."""
+        post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(800, 600))
+        self.assertTrue(post.image.is_processing)
+        self.assertEqual(post.image.srcset, '')
+        task = Task.objects.get(name='generate_renditions')
+        self.assertEqual(task.payload, {
+            'model': 'recipes.Post', 'pk': post.pk, 'field': 'image', 'name': post.image.name,
+        })
+
+    def test_saving_without_a_new_upload_queues_nothing(self):
+        """Test that saving a row again doesn't queue its image a second time."""
+        post = self.create_processed_post(create_image_upload(800, 600))
+        post.title = "Renamed"
+        post.save()
+        self.assertEqual(Task.objects.filter(status=Task.Status.PENDING).count(), 0)
+
+    def test_processed_image_is_normalized_jpeg_with_renditions(self):
+        """Test that the worker stores the upload as a JPEG with a rendition per narrower width."""
+        upload = create_image_upload(800, 600, name='dish.png', image_format='PNG')
+        post = Post.objects.create(author=self.user, title="Post", image=upload)
+        raw_name = post.image.name
+        TaskQueueService().run_pending()
+        post.refresh_from_db()
+        self.assertTrue(post.image.name.startswith('posts_images/'))
+        self.assertTrue(post.image.name.endswith('.jpg'))
+        self.assertTrue(ContentAddressedStorage.is_content_addressed(post.image.name))
+        self.assertFalse(post.image.storage.exists(raw_name))
+        self.assertEqual(post.image_width, 800)
+        self.assertFalse(post.image.is_processing)
+        self.assertEqual(post.image.rendition_widths, [320, 640])
+        for width in (320, 640):
+            self.assertTrue(post.image.storage.exists(post.image.name.replace('.jpg', f'_{width}w.webp')))
+
+    def test_replaced_upload_is_not_processed(self):
+        """Test that a queued task skips an image that was replaced before it ran."""
+        post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(800, 600, name='old.jpg'))
+        post.image = create_image_upload(700, 500, name='new.jpg')
+        post.save()
+        TaskQueueService().run_pending()
+        post.refresh_from_db()
+        self.assertEqual(post.image_width, 700)
+        self.assertEqual(Task.objects.filter(status=Task.Status.DONE).count(), 2)
+
+    def test_image_replaced_while_processing_is_kept(self):
+        """Test that a task finishing after the image was replaced leaves the new image and its file alone."""
+        post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(800, 600, name='old.jpg'))
+        stale = Post.objects.get(pk=post.pk)
+        post.image = create_image_upload(700, 500, name='new.jpg')
+        post.save()
+        self.assertFalse(stale.image.generate_renditions())
+        post.refresh_from_db()
+        self.assertTrue(post.image.is_processing)
+        self.assertTrue(post.image.storage.exists(post.image.name))
+        self.assertNotEqual(stale.image.name, post.image.name)
+
+    def test_srcset_lists_renditions_and_source(self):
+        """Test that the srcset names each rendition and the image itself with their widths."""
+        post = self.create_processed_post(create_image_upload(800, 600))
+        stem = post.image.url[:-len('.jpg')]
+        self.assertEqual(post.image.srcset, f'{stem}_320w.webp 320w, {stem}_640w.webp 640w, {post.image.url} 800w')
+
+    def test_srcset_is_empty_for_unprocessed_image(self):
+        """Test that an image stored before the pipeline has no srcset and isn't shown as processing."""
+        post = Post.objects.create(author=self.user, title="Post")
+        Post.objects.filter(pk=post.pk).update(image='posts_images/legacy.jpg')
+        image = Post.objects.get(pk=post.pk).image
+        self.assertEqual(image.srcset, '')
+        self.assertFalse(image.is_processing)
+
+    def test_delete_queues_removal_of_file_and_renditions(self):
+        """Test that deleting the image clears the row and removes its files in the background."""
+        post = self.create_processed_post(create_image_upload(800, 600))
+        name = post.image.name
+        rendition = name.replace('.jpg', '_320w.webp')
+        post.image.delete()
+        post = Post.objects.get(pk=post.pk)
+        self.assertFalse(post.image)
+        self.assertIsNone(post.image_width)
+        self.assertTrue(post.image.storage.exists(rendition))
+        TaskQueueService().run_pending()
+        self.assertFalse(post.image.storage.exists(name))
+        self.assertFalse(post.image.storage.exists(rendition))
+
+    def test_avatar_uses_smallest_rendition_that_fills_the_size(self):
+        """Test that a profile picture avatar is served from a rendition instead of the original."""
+        self.user.profile_picture = create_image_upload(1000, 1000, name='me.jpg')
+        self.user.save()
+        self.assertIn('gravatar.com', self.user.mini_gravatar())
+        TaskQueueService().run_pending()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_width, 512)
+        self.assertTrue(self.user.mini_gravatar().endswith('_64w.webp'))
+        self.assertTrue(self.user.gravatar(size=200).endswith('_256w.webp'))
+        self.assertEqual(self.user.gravatar(size=600), self.user.profile_picture.url)
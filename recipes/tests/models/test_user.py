@@ -1,6 +1,7 @@
 """Unit tests for the User model."""
 from django.core.exceptions import ValidationError
 from django.test import TestCase
+from libgravatar import Gravatar
 from recipes.models import User
 
 class UserModelTestCase(TestCase):
@@ -143,6 +144,29 @@ class UserModelTestCase(TestCase):
         expected_gravatar_url = self._gravatar_url(size=60)
         self.assertEqual(actual_gravatar_url, expected_gravatar_url)
 
+    def test_avatar_url_is_stored_on_save(self):
+        self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar_url, UserModelTestCase.GRAVATAR_URL)
+
+    def test_avatar_url_is_refreshed_when_email_changes(self):
+        self.user.email = 'johnny@example.org'
+        self.user.save(update_fields=['email'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar_url, Gravatar('johnny@example.org').get_image())
+
+    def test_saving_unrelated_fields_keeps_avatar_url(self):
+        User.objects.filter(pk=self.user.pk).update(avatar_url='https://example.org/avatar.png')
+        self.user.refresh_from_db()
+        self.user.bio = 'Hello'
+        self.user.save(update_fields=['bio'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar_url, 'https://example.org/avatar.png')
+
+    def test_gravatar_uses_stored_avatar_url(self):
+        self.user.avatar_url = 'https://example.org/avatar.png'
+        self.assertEqual(self.user.mini_gravatar(), 'https://example.org/avatar.png')
+
     def _gravatar_url(self, size):
         gravatar_url = f"{UserModelTestCase.GRAVATAR_URL}?size={size}&default=mp"
         return gravatar_url
@@ -0,0 +1,25 @@
+"""Test runner for the Foodle project."""
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that gives the tests a cache of their own.
+
+    The default cache is a directory shared by every process on the host,
+    so tests that clear or fill it would otherwise touch the development
+    server's entries. Tests use a per-process in-memory cache instead.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_settings = override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        })
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,55 @@
+"""Tests for the avatar service."""
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from recipes.models import User
+from recipes.services import AvatarService
+from recipes.tests.helpers import TemporaryMediaMixin
+
+
+@override_settings(LOCAL_AVATARS=True)
+class AvatarServiceTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for AvatarService."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.service = AvatarService()
+
+    def stored_name(self, url):
+        return url[len(default_storage.base_url):]
+
+    def test_initials(self):
+        """Test that the initials are the first letters of the first and last name, in capitals."""
+        self.user.first_name, self.user.last_name = 'john', 'doe'
+        self.assertEqual(AvatarService.initials(self.user), 'JD')
+        self.user.last_name = '(Jr)'
+        self.assertEqual(AvatarService.initials(self.user), 'J')
+
+    def test_local_avatar_is_rendered_and_stored(self):
+        """Test that a user saved with local avatars gets a PNG of their initials in media storage."""
+        self.user.save()
+        self.assertTrue(self.user.avatar_url.startswith('/media/avatars/JD_'))
+        with default_storage.open(self.stored_name(self.user.avatar_url)) as content, Image.open(content) as image:
+            self.assertEqual(image.format, 'PNG')
+            self.assertEqual(image.size, (AvatarService.SIZE, AvatarService.SIZE))
+
+    def test_local_avatar_is_rendered_once(self):
+        """Test that users with the same initials and colour share one stored avatar."""
+        first = self.service.avatar_url(self.user)
+        second = self.service.avatar_url(self.user)
+        self.assertEqual(first, second)
+        self.assertEqual(len(default_storage.listdir('avatars')[1]), 1)
+
+    def test_local_avatar_ignores_size(self):
+        """Test that a local avatar URL is served as-is at every size."""
+        self.user.save()
+        self.assertEqual(self.user.gravatar(size=200), self.user.avatar_url)
+
+    @override_settings(LOCAL_AVATARS=False)
+    def test_gravatar_url_gets_size(self):
+        """Test that a stored Gravatar URL is given the requested size and default image."""
+        url = self.service.avatar_url(self.user)
+        self.assertEqual(AvatarService.sized_url(url, 60), f'{url}?size=60&default=mp')
@@ -0,0 +1,72 @@
+"""Tests for the image rendition service."""
+from io import BytesIO
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.test import TestCase
+from recipes.services import ImageRenditionService
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload
+
+
+def exif_with_orientation(orientation):
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x010F] = 'Test Camera'
+    return exif
+
+
+class ImageRenditionServiceTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for ImageRenditionService."""
+
+    def setUp(self):
+        super().setUp()
+        self.service = ImageRenditionService(max_dimension=1000, widths=(100, 200, 400))
+
+    def test_normalize_applies_exif_orientation(self):
+        """Test that a photo taken on its side is turned upright."""
+        upload = create_image_upload(300, 200, exif=exif_with_orientation(6))
+        image = self.service.normalize(upload)
+        self.assertEqual(image.size, (200, 300))
+
+    def test_normalize_caps_longer_side(self):
+        """Test that a large image is scaled down to the maximum dimension, keeping its aspect ratio."""
+        image = self.service.normalize(create_image_upload(3000, 1500))
+        self.assertEqual(image.size, (1000, 500))
+
+    def test_normalize_does_not_upscale(self):
+        """Test that a small image keeps its size."""
+        image = self.service.normalize(create_image_upload(150, 80))
+        self.assertEqual(image.size, (150, 80))
+
+    def test_normalize_flattens_transparency(self):
+        """Test that an image with an alpha channel is flattened to RGB."""
+        image = self.service.normalize(create_image_upload(50, 50, name='logo.png', image_format='PNG', mode='RGBA'))
+        self.assertEqual(image.mode, 'RGB')
+
+    def test_encoded_image_has_no_metadata(self):
+        """Test that the re-encoded JPEG carries none of the upload's EXIF data."""
+        upload = create_image_upload(300, 200, exif=exif_with_orientation(6))
+        encoded = self.service.encode(self.service.normalize(upload))
+        with Image.open(BytesIO(encoded.read())) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_rendition_widths_skip_widths_not_narrower_than_source(self):
+        """Test that only widths narrower than the source get a rendition."""
+        self.assertEqual(self.service.rendition_widths(250), [100, 200])
+        self.assertEqual(self.service.rendition_widths(90), [])
+        self.assertEqual(self.service.rendition_widths(None), [])
+
+    def test_save_renditions_writes_webp_at_each_width(self):
+        """Test that a WebP rendition is stored next to the image for each narrower width."""
+        image = self.service.normalize(create_image_upload(300, 150))
+        self.service.save_renditions(default_storage, 'posts_images/photo.jpg', image)
+        with default_storage.open('posts_images/photo_100w.webp') as content, Image.open(content) as rendition:
+            self.assertEqual(rendition.format, 'WEBP')
+            self.assertEqual(rendition.size, (100, 50))
+        self.assertTrue(default_storage.exists('posts_images/photo_200w.webp'))
+        self.assertFalse(default_storage.exists('posts_images/photo_400w.webp'))
+
+    def test_rendition_source(self):
+        """Test that a rendition name maps back to its source image and other names don't."""
+        self.assertEqual(ImageRenditionService.rendition_source('posts_images/photo_320w.webp'), 'posts_images/photo.jpg')
+        self.assertIsNone(ImageRenditionService.rendition_source('posts_images/photo.jpg'))
@@ -0,0 +1,121 @@
+"""Tests for the MealStreakService and the Meal hooks that drive it."""
+from datetime import date, timedelta
+from django.test import TestCase
+from recipes.models import User, Meal, MealStreak
+from recipes.services.meal_streak_service import MealStreakService, measure_streaks
+
+
+class MealStreakServiceTestCase(TestCase):
+    """Tests for the MealStreakService."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.today = date.today()
+        self.service = MealStreakService()
+
+    def create_meal(self, days_ago=0):
+        return Meal.objects.create(
+            user=self.user, name="Oats", meal_type='Breakfast', date=self.today - timedelta(days=days_ago),
+            calories=300, protein_g=10.0, carbs_g=50.0, fat_g=5.0,
+        )
+
+    def streak(self):
+        streak = MealStreak.objects.get(user=self.user)
+        return streak.current_streak, streak.longest_streak, streak.last_logged_date
+
+    def test_measure_streaks(self):
+        """Test that the final and longest runs are measured from sorted dates."""
+        days = [self.today - timedelta(days=n) for n in (9, 8, 7, 3, 2)]
+        self.assertEqual(measure_streaks(days), (2, 3))
+        self.assertEqual(measure_streaks([]), (0, 0))
+
+    def test_consecutive_meals_extend_streak(self):
+        """Test that logging on the following day extends the stored streak."""
+        self.create_meal(days_ago=2)
+        self.create_meal(days_ago=1)
+        self.create_meal(days_ago=0)
+        self.assertEqual(self.streak(), (3, 3, self.today))
+
+    def test_extending_streak_reads_no_meals(self):
+        """Test that logging on the following day is handled without reading the meal history."""
+        self.create_meal(days_ago=1)
+        meal = Meal(
+            user=self.user, name="Oats", meal_type='Breakfast', date=self.today,
+            calories=300, protein_g=10.0, carbs_g=50.0, fat_g=5.0,
+        )
+        with self.assertNumQueries(2):
+            self.service.record(meal)
+
+    def test_gap_restarts_current_streak(self):
+        """Test that a missed day starts a new run but keeps the longest one."""
+        self.create_meal(days_ago=5)
+        self.create_meal(days_ago=4)
+        self.create_meal(days_ago=0)
+        self.assertEqual(self.streak(), (1, 2, self.today))
+
+    def test_second_meal_on_a_day_changes_nothing(self):
+        """Test that another meal on an already logged day leaves the streak alone."""
+        self.create_meal(days_ago=1)
+        self.create_meal(days_ago=0)
+        self.create_meal(days_ago=1)
+        self.assertEqual(self.streak(), (2, 2, self.today))
+
+    def test_back_dated_meal_bridges_gap(self):
+        """Test that a meal filling a missed day joins the runs on either side."""
+        self.create_meal(days_ago=2)
+        self.create_meal(days_ago=0)
+        self.create_meal(days_ago=1)
+        self.assertEqual(self.streak(), (3, 3, self.today))
+
+    def test_deleting_last_meal_of_a_day_recomputes(self):
+        """Test that removing a day's only meal shortens the streak."""
+        self.create_meal(days_ago=1)
+        meal = self.create_meal(days_ago=0)
+        meal.delete()
+        self.assertEqual(self.streak(), (1, 1, self.today - timedelta(days=1)))
+
+    def test_deleting_every_meal_clears_streak(self):
+        """Test that a user with no meals left has an empty streak."""
+        self.create_meal().delete()
+        self.assertEqual(self.streak(), (0, 0, None))
+
+    def test_moving_meal_to_another_day_recomputes(self):
+        """Test that editing a meal's date updates the runs of both days."""
+        self.create_meal(days_ago=1)
+        meal = self.create_meal(days_ago=0)
+        meal.date = self.today - timedelta(days=5)
+        meal.save()
+        self.assertEqual(self.streak(), (1, 1, self.today - timedelta(days=1)))
+
+    def test_streak_on_expires_after_a_missed_day(self):
+        """Test that the current streak counts until a full day passes without a meal."""
+        self.create_meal(days_ago=1)
+        streak = MealStreak.objects.get(user=self.user)
+        self.assertEqual(streak.streak_on(self.today), 1)
+        self.assertEqual(streak.streak_on(self.today + timedelta(days=1)), 0)
+
+    def test_future_meal_is_not_counted_before_its_day(self):
+        """Test that a meal dated ahead gives today the streaks the per-request calculation gave without it."""
+        for days_ago in (2, 1, 0, -3):
+            self.create_meal(days_ago=days_ago)
+        meal_dates = list(
+            Meal.objects.filter(user=self.user, date__lte=self.today).order_by('date').values_list('date', flat=True).distinct()
+        )
+        current, longest = measure_streaks(meal_dates)
+        expected = (current if meal_dates[-1] >= self.today - timedelta(days=1) else 0, longest)
+        self.assertEqual(expected, (3, 3))
+        self.assertEqual(self.service.streaks_on(self.user.pk, self.today), expected)
+        self.assertEqual(self.service.streaks_on(self.user.pk, self.today + timedelta(days=3)), (1, 3))
+
+    def test_verify_reports_drifted_streaks(self):
+        """Test that verify lists users whose stored streak differs from a recompute."""
+        self.create_meal(days_ago=1)
+        self.create_meal(days_ago=0)
+        self.assertEqual(self.service.verify(), [])
+        MealStreak.objects.filter(user=self.user).update(current_streak=7)
+        self.assertEqual(
+            self.service.verify(),
+            [(self.user.id, (7, 2, self.today), (2, 2, self.today))],
+        )
@@ -0,0 +1,79 @@
+"""Tests for the media service."""
+from django.test import TestCase
+from recipes.models import User, Post
+from recipes.services import MediaService, TaskQueueService
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload
+
+
+class MediaServiceTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for MediaService."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.service = MediaService()
+
+    def create_processed_post(self):
+        post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(800, 600))
+        TaskQueueService().run_pending()
+        return Post.objects.get(pk=post.pk)
+
+    def test_identical_uploads_share_a_file(self):
+        """Test that two posts with the same image refer to one stored file."""
+        first = self.create_processed_post()
+        second = self.create_processed_post()
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(self.service.reference_count(first.image.name), 2)
+
+    def test_shared_file_survives_deleting_one_row(self):
+        """Test that deleting one of two posts keeps the image the other still shows."""
+        first = self.create_processed_post()
+        second = self.create_processed_post()
+        first.delete()
+        TaskQueueService().run_pending()
+        self.assertTrue(second.image.storage.exists(second.image.name))
+        self.assertTrue(second.image.storage.exists(second.image.name.replace('.jpg', '_320w.webp')))
+
+    def test_file_is_deleted_with_its_last_reference(self):
+        """Test that the file and its renditions go once no post refers to them."""
+        first = self.create_processed_post()
+        second = self.create_processed_post()
+        name = first.image.name
+        first.delete()
+        second.delete()
+        TaskQueueService().run_pending()
+        self.assertFalse(first.image.storage.exists(name))
+        self.assertFalse(first.image.storage.exists(name.replace('.jpg', '_320w.webp')))
+
+    def test_file_referenced_again_before_release_runs_is_kept(self):
+        """Test that the reference count is taken when the release runs, not when it is queued."""
+        post = self.create_processed_post()
+        name = post.image.name
+        post.delete()
+        Post.objects.create(author=self.user, title="Again", image=name, image_width=800)
+        TaskQueueService().run_pending()
+        self.assertTrue(post.image.storage.exists(name))
+
+    def test_delete_unreferenced_returns_deleted_names(self):
+        """Test that only unreferenced files are deleted and reported."""
+        post = self.create_processed_post()
+        self.assertEqual(self.service.delete_unreferenced([post.image.name]), [])
+        Post.objects.filter(pk=post.pk).update(image='')
+        self.assertEqual(self.service.delete_unreferenced([post.image.name]), [post.image.name])
+
+    def test_referenced_counts_renditions_of_referenced_images(self):
+        """Test that a rendition is referenced through its source and unknown names aren't."""
+        post = self.create_processed_post()
+        rendition = post.image.name.replace('.jpg', '_320w.webp')
+        names = [post.image.name, rendition, 'posts_images/other.jpg', 'posts_images/other_320w.webp']
+        self.assertEqual(self.service.referenced(names), {post.image.name, rendition})
+
+    def test_stored_files_lists_upload_directories(self):
+        """Test that every file in the tracked upload directories is listed with its size."""
+        post = self.create_processed_post()
+        files = {name: size for name, size, _ in self.service.stored_files()}
+        self.assertIn(post.image.name, files)
+        self.assertIn(post.image.name.replace('.jpg', '_640w.webp'), files)
+        self.assertEqual(files[post.image.name], post.image.size)
@@ -0,0 +1,68 @@
+"""Tests for the NutritionRollupService and the Meal hooks that drive it."""
+from datetime import date, timedelta
+from django.test import TestCase
+from recipes.models import User, Meal, DailyNutrition
+from recipes.services.nutrition_rollup_service import NutritionRollupService
+
+
+class NutritionRollupServiceTestCase(TestCase):
+    """Tests for the NutritionRollupService."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.today = date.today()
+
+    def create_meal(self, **kwargs):
+        data = {
+            'user': self.user, 'name': "Oats", 'meal_type': 'Breakfast', 'date': self.today,
+            'calories': 300, 'protein_g': 10.0, 'carbs_g': 50.0, 'fat_g': 5.0,
+        }
+        data.update(kwargs)
+        return Meal.objects.create(**data)
+
+    def rollup(self, day=None):
+        return DailyNutrition.objects.get(user=self.user, date=day or self.today)
+
+    def test_adding_meals_sums_their_macros(self):
+        """Test that each saved meal is added to its day's totals."""
+        self.create_meal()
+        self.create_meal(calories=200, protein_g=20.0, carbs_g=5.0, fat_g=8.0)
+        rollup = self.rollup()
+        self.assertEqual(rollup.calories, 500)
+        self.assertEqual(rollup.protein_g, 30.0)
+        self.assertEqual(rollup.carbs_g, 55.0)
+        self.assertEqual(rollup.fat_g, 13.0)
+
+    def test_deleting_meal_subtracts_its_macros(self):
+        """Test that deleting a meal takes it back off the totals."""
+        self.create_meal()
+        meal = self.create_meal(calories=200)
+        meal.delete()
+        self.assertEqual(self.rollup().calories, 300)
+
+    def test_editing_meal_replaces_its_macros(self):
+        """Test that re-saving a meal swaps its old values for the new ones."""
+        meal = self.create_meal()
+        meal.calories = 450
+        meal.save()
+        self.assertEqual(self.rollup().calories, 450)
+
+    def test_moving_meal_to_another_day_moves_its_macros(self):
+        """Test that changing a meal's date moves it between days."""
+        meal = self.create_meal()
+        yesterday = self.today - timedelta(days=1)
+        meal.date = yesterday
+        meal.save()
+        self.assertEqual(self.rollup().calories, 0)
+        self.assertEqual(self.rollup(yesterday).calories, 300)
+
+    def test_rebuild_recomputes_from_meals(self):
+        """Test that rebuild rewrites drifted totals and drops stale days."""
+        self.create_meal()
+        DailyNutrition.objects.filter(user=self.user).update(calories=9999)
+        DailyNutrition.objects.create(user=self.user, date=self.today - timedelta(days=3), calories=50)
+        days = NutritionRollupService().rebuild()
+        self.assertEqual(days, 1)
+        self.assertEqual(self.rollup().calories, 300)
@@ -0,0 +1,89 @@
+"""Tests for the RecipeSearchService."""
+from django.test import TestCase
+from recipes.models import User, Recipe
+from recipes.services.recipe_search_service import RecipeSearchService, highlight_snippet, MATCH_START, MATCH_END
+
+
+class RecipeSearchServiceTestCase(TestCase):
+    """Tests for the RecipeSearchService."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.service = RecipeSearchService()
+        self.soup = Recipe.objects.create(
+            name="Tomato Soup",
+            total_time="30 minutes",
+            ingredients="tomatoes, onion, basil",
+            method="Simmer the tomatoes with the onion.",
+            created_by=self.user,
+        )
+        self.pasta = Recipe.objects.create(
+            name="Basil Pasta",
+            total_time="20 minutes",
+            ingredients="pasta, garlic, olive oil",
+            method="Toss the pasta with tomato and basil.",
+            created_by=self.user,
+        )
+
+    def search_names(self, query):
+        results = self.service.search(Recipe.objects.all(), query).order_by('search_rank')
+        return [recipe.name for recipe in results]
+
+    def test_search_matches_word_prefixes(self):
+        """Test that a query matches longer words it is a prefix of."""
+        self.assertEqual(self.search_names('simm'), ["Tomato Soup"])
+
+    def test_search_requires_every_word(self):
+        """Test that every word of the query has to match."""
+        self.assertEqual(self.search_names('basil garlic'), ["Basil Pasta"])
+
+    def test_search_ranks_name_matches_first(self):
+        """Test that a match in the name outranks a match in the method."""
+        self.assertEqual(self.search_names('tomato'), ["Tomato Soup", "Basil Pasta"])
+
+    def test_search_treats_operators_as_text(self):
+        """Test that full-text query syntax in the input can't break the query."""
+        self.assertEqual(self.search_names('"garlic* -('), ["Basil Pasta"])
+
+    def test_search_without_words_matches_nothing(self):
+        """Test that a query of only punctuation returns no recipes."""
+        self.assertEqual(self.search_names('?!'), [])
+
+    def test_saving_recipe_updates_index(self):
+        """Test that an edited recipe is found by its new text only."""
+        self.soup.name = "Gazpacho"
+        self.soup.method = "Blend and chill."
+        self.soup.save()
+        self.assertEqual(self.search_names('gazpacho'), ["Gazpacho"])
+        self.assertEqual(self.search_names('simmer'), [])
+
+    def test_deleting_recipe_removes_it_from_index(self):
+        """Test that a deleted recipe no longer matches."""
+        self.soup.delete()
+        self.assertEqual(self.search_names('onion'), [])
+
+    def test_rebuild_restores_index(self):
+        """Test that rebuilding re-indexes every recipe."""
+        self.service.backend.remove(self.pasta.id)
+        self.service.rebuild()
+        self.assertEqual(self.search_names('garlic'), ["Basil Pasta"])
+
+    def test_attach_snippets_highlights_matches(self):
+        """Test that snippets mark each matched word."""
+        recipes = list(self.service.search(Recipe.objects.all(), 'garlic'))
+        self.service.attach_snippets(recipes, 'garlic')
+        self.assertIn('<mark>garlic</mark>', recipes[0].search_snippet)
+
+    def test_snippets_are_read_with_the_results(self):
+        """Test that results and their snippets come from a single query."""
+        with self.assertNumQueries(1):
+            recipes = list(self.service.search(Recipe.objects.all(), 'tomato').order_by('search_rank'))
+            self.service.attach_snippets(recipes, 'tomato')
+        self.assertIn('<mark>Tomato</mark>', recipes[0].search_snippet)
+
+    def test_highlight_snippet_escapes_recipe_text(self):
+        """Test that recipe text is escaped while the match markers become tags."""
+        snippet = highlight_snippet(f"<b>{MATCH_START}salt{MATCH_END}</b>")
+        self.assertEqual(snippet, "&lt;b&gt;<mark>salt</mark>&lt;/b&gt;")
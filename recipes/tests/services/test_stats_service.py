@@ -1,4 +1,5 @@
 """Tests for the UserStatsService."""
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from datetime import date, timedelta
@@ -18,6 +19,7 @@ class UserStatsServiceTestCase(TestCase):
         self.user = User.objects.get(username='@johndoe')
         self.other_user = User.objects.get(username='@janedoe')
         self.service = UserStatsService(self.user)
+        cache.clear()
 
     def test_get_stats_returns_all_expected_keys(self):
         """Test that get_stats returns all expected statistics keys."""
@@ -223,32 +225,55 @@ class UserStatsServiceTestCase(TestCase):
         stats = self.service.get_stats()
         self.assertEqual(stats['member_since'], self.user.date_joined)
 
-    def test_caching_meals_count(self):
-        """Test that meals count is cached."""
-        # First call
-        stats1 = self.service.get_stats()
-        meals1 = stats1['total_meals_logged']
-        
-        # Add a meal
-        Meal.objects.create(
+    def test_get_stats_runs_three_queries(self):
+        """Test that computing the stats takes a fixed number of queries."""
+        for day in range(5):
+            Meal.objects.create(
+                user=self.user, name='Meal', meal_type='Lunch', date=date.today() - timedelta(days=day),
+                calories=500, protein_g=30, carbs_g=50, fat_g=20
+            )
+        FastingSession.objects.create(
             user=self.user,
-            name='New Meal',
-            meal_type='Lunch',
-            date=date.today(),
-            calories=500,
-            protein_g=30,
-            carbs_g=50,
-            fat_g=20
+            start_date_time=timezone.now() - timedelta(hours=16),
+            end_date_time=timezone.now(),
+            is_active=False
         )
-        
-        # Second call on same service instance should return cached value
-        stats2 = self.service.get_stats()
-        meals2 = stats2['total_meals_logged']
-        self.assertEqual(meals1, meals2)
-        
-        # New service instance should get updated count
-        new_service = UserStatsService(self.user)
-        stats3 = new_service.get_stats()
-        meals3 = stats3['total_meals_logged']
-        self.assertEqual(meals3, meals1 + 1)
+        cache.clear()
+        with self.assertNumQueries(3):
+            self.service.get_stats()
 
+    def test_stats_are_cached(self):
+        """Test that repeated calls are served from the cache."""
+        self.service.get_stats()
+        with self.assertNumQueries(0):
+            UserStatsService(self.user).get_stats()
+
+    def test_new_meal_invalidates_cached_stats(self):
+        """Test that logging a meal refreshes the cached meal count."""
+        meals = self.service.get_stats()['total_meals_logged']
+        Meal.objects.create(
+            user=self.user, name='New Meal', meal_type='Lunch', date=date.today(),
+            calories=500, protein_g=30, carbs_g=50, fat_g=20
+        )
+        self.assertEqual(self.service.get_stats()['total_meals_logged'], meals + 1)
+
+    def test_follow_invalidates_both_users(self):
+        """Test that a follow refreshes the stats of the follower and the followed user."""
+        other_service = UserStatsService(self.other_user)
+        self.service.get_stats()
+        other_service.get_stats()
+        Follow.objects.create(follower=self.user, followed=self.other_user)
+        self.assertEqual(self.service.get_stats()['total_following'], 1)
+        self.assertEqual(other_service.get_stats()['total_followers'], 1)
+
+    def test_deleting_fast_invalidates_cached_stats(self):
+        """Test that deleting a completed fast refreshes the cached fasting stats."""
+        fast = FastingSession.objects.create(
+            user=self.user,
+            start_date_time=timezone.now() - timedelta(hours=16),
+            end_date_time=timezone.now(),
+            is_active=False
+        )
+        self.assertEqual(self.service.get_stats()['completed_fasts'], 1)
+        fast.delete()
+        self.assertEqual(self.service.get_stats()['completed_fasts'], 0)
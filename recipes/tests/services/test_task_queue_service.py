@@ -0,0 +1,88 @@
+"""Tests for the task queue service."""
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from recipes.models import Task
+from recipes.services import TaskQueueService
+
+
+calls = []
+
+
+@TaskQueueService.register('test_record')
+def record(value):
+    calls.append(value)
+
+
+@TaskQueueService.register('test_fail')
+def fail():
+    raise RuntimeError("boom")
+
+
+class TaskQueueServiceTestCase(TestCase):
+    """Tests for TaskQueueService."""
+
+    def setUp(self):
+        calls.clear()
+        self.service = TaskQueueService()
+
+    def test_enqueue_stores_pending_task(self):
+        """Test that enqueueing writes a pending task with its payload."""
+        task = TaskQueueService.enqueue('test_record', value=3)
+        self.assertEqual(task.status, Task.Status.PENDING)
+        self.assertEqual(task.payload, {'value': 3})
+
+    def test_enqueue_rejects_unknown_task(self):
+        """Test that a task without a registered handler can't be queued."""
+        with self.assertRaises(KeyError):
+            TaskQueueService.enqueue('no_such_task')
+
+    def test_run_pending_runs_tasks_in_order(self):
+        """Test that due tasks run oldest first and are marked done."""
+        TaskQueueService.enqueue('test_record', value=1)
+        TaskQueueService.enqueue('test_record', value=2)
+        self.assertEqual(self.service.run_pending(), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(Task.objects.filter(status=Task.Status.DONE).count(), 2)
+
+    def test_claim_skips_tasks_not_yet_due(self):
+        """Test that a task scheduled for later is not claimed."""
+        task = TaskQueueService.enqueue('test_record', value=1)
+        Task.objects.filter(pk=task.pk).update(run_after=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(self.service.claim(10), [])
+
+    def test_claimed_task_is_not_claimed_again(self):
+        """Test that a task claimed by one worker is invisible to the next."""
+        TaskQueueService.enqueue('test_record', value=1)
+        claimed = self.service.claim(10)
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(claimed[0].status, Task.Status.RUNNING)
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(TaskQueueService().claim(10), [])
+
+    def test_abandoned_task_is_claimed_after_lease(self):
+        """Test that a task left running by a dead worker is claimed again once its lease runs out."""
+        TaskQueueService.enqueue('test_record', value=1)
+        task = self.service.claim(10)[0]
+        Task.objects.filter(pk=task.pk).update(started_at=timezone.now() - TaskQueueService.LEASE - timedelta(seconds=1))
+        self.assertEqual([claimed.pk for claimed in self.service.claim(10)], [task.pk])
+
+    def test_failed_task_is_retried_later(self):
+        """Test that a failing task goes back to pending with a delay and its error."""
+        TaskQueueService.enqueue('test_fail')
+        self.assertFalse(self.service.run(self.service.claim(10)[0]))
+        task = Task.objects.get()
+        self.assertEqual(task.status, Task.Status.PENDING)
+        self.assertGreater(task.run_after, timezone.now())
+        self.assertIn('RuntimeError: boom', task.last_error)
+
+    def test_task_fails_after_max_attempts(self):
+        """Test that a task is given up on once it has failed MAX_ATTEMPTS times."""
+        TaskQueueService.enqueue('test_fail')
+        for _ in range(TaskQueueService.MAX_ATTEMPTS):
+            Task.objects.update(run_after=timezone.now())
+            self.service.run_pending()
+        task = Task.objects.get()
+        self.assertEqual(task.status, Task.Status.FAILED)
+        self.assertEqual(task.attempts, TaskQueueService.MAX_ATTEMPTS)
+        self.assertIsNotNone(task.finished_at)
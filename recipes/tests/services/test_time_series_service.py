@@ -0,0 +1,123 @@
+"""Tests for the TimeSeriesService and its bucketing helpers."""
+from datetime import date, datetime, timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from recipes.models import User, DailyLog, FastingSession, Meal
+from recipes.services.time_series_service import TimeSeriesService, bucket_ranges
+
+
+class BucketRangesTestCase(TestCase):
+    """Tests for bucket_ranges."""
+
+    def test_weeks_are_clipped_to_range(self):
+        """Test that the first and last weeks only cover days inside the range."""
+        ranges = list(bucket_ranges(date(2025, 1, 1), date(2025, 1, 31), 'week'))
+        self.assertEqual(ranges[0], (date(2025, 1, 1), date(2025, 1, 5)))
+        self.assertEqual(ranges[1], (date(2025, 1, 6), date(2025, 1, 12)))
+        self.assertEqual(ranges[-1], (date(2025, 1, 27), date(2025, 1, 31)))
+
+    def test_months_cross_year_end(self):
+        """Test that month buckets roll over from December into January."""
+        ranges = list(bucket_ranges(date(2024, 12, 15), date(2025, 2, 10), 'month'))
+        self.assertEqual(ranges, [
+            (date(2024, 12, 15), date(2024, 12, 31)),
+            (date(2025, 1, 1), date(2025, 1, 31)),
+            (date(2025, 2, 1), date(2025, 2, 10)),
+        ])
+
+    def test_days(self):
+        """Test that day buckets cover one date each."""
+        ranges = list(bucket_ranges(date(2025, 3, 1), date(2025, 3, 3), 'day'))
+        self.assertEqual([first for first, _ in ranges], [date(2025, 3, 1), date(2025, 3, 2), date(2025, 3, 3)])
+
+
+class TimeSeriesServiceTestCase(TestCase):
+    """Tests for the TimeSeriesService."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.get(username='@johndoe')
+        self.service = TimeSeriesService(self.user)
+        # A Monday, so week buckets line up with the start of the range
+        self.monday = date(2025, 1, 6)
+
+    def create_fast(self, start, hours, **kwargs):
+        start = timezone.make_aware(start)
+        return FastingSession.objects.create(
+            user=self.user, start_date_time=start, end_date_time=start + timedelta(hours=hours),
+            is_active=False, **kwargs
+        )
+
+    def test_water_by_day_fills_missing_days(self):
+        """Test that days without a log are returned with zero intake."""
+        DailyLog.objects.create(user=self.user, date=self.monday, amount_ml=1500)
+        points = self.service.series('water', self.monday, self.monday + timedelta(days=2), 'day')
+        self.assertEqual([point['total_ml'] for point in points], [1500, 0, 0])
+
+    def test_water_by_week_averages_per_day(self):
+        """Test that a week's average divides its total by the days it covers."""
+        DailyLog.objects.create(user=self.user, date=self.monday, amount_ml=2100)
+        DailyLog.objects.create(user=self.user, date=self.monday + timedelta(days=1), amount_ml=1400)
+        points = self.service.series('water', self.monday, self.monday + timedelta(days=13), 'week')
+        self.assertEqual(len(points), 2)
+        self.assertEqual(points[0]['total_ml'], 3500)
+        self.assertEqual(points[0]['average_ml'], 500)
+        self.assertEqual(points[1]['total_ml'], 0)
+
+    def test_fasting_counts_completed_fasts_by_start_day(self):
+        """Test that completed fasts are grouped by the day they started."""
+        self.create_fast(datetime(2025, 1, 6, 20, 0), 16)
+        self.create_fast(datetime(2025, 1, 7, 20, 0), 14)
+        FastingSession.objects.create(
+            user=self.user, start_date_time=timezone.make_aware(datetime(2025, 1, 8, 20, 0)), is_active=True
+        )
+        points = self.service.series('fasting', self.monday, self.monday + timedelta(days=6), 'week')
+        self.assertEqual(points[0]['fasts'], 2)
+        self.assertEqual(points[0]['average_hours'], 15.0)
+        self.assertEqual(points[0]['longest_hours'], 16.0)
+
+    def test_fasting_range_excludes_neighbouring_days(self):
+        """Test that fasts started just outside the range are left out."""
+        self.create_fast(datetime(2025, 1, 5, 23, 59), 16)
+        self.create_fast(datetime(2025, 1, 7, 0, 0), 16)
+        points = self.service.series('fasting', self.monday, self.monday, 'day')
+        self.assertEqual(points[0]['fasts'], 0)
+
+    def test_nutrition_by_month_sums_rollups(self):
+        """Test that a month's point sums the consumed totals of its days."""
+        for day in (self.monday, self.monday + timedelta(days=10)):
+            Meal.objects.create(
+                user=self.user, name="Oats", meal_type='Breakfast', date=day,
+                calories=300, protein_g=10.5, carbs_g=50.0, fat_g=5.0,
+            )
+        points = self.service.series('nutrition', date(2025, 1, 1), date(2025, 2, 28), 'month')
+        self.assertEqual(points[0]['calories'], 600)
+        self.assertEqual(points[0]['protein_g'], 21.0)
+        self.assertEqual(points[1]['calories'], 0)
+
+    def test_series_is_one_query_then_cached(self):
+        """Test that a series is built in one query and then served from the cache."""
+        with self.assertNumQueries(1):
+            self.service.series('water', self.monday, self.monday + timedelta(days=30), 'week')
+        with self.assertNumQueries(0):
+            self.service.series('water', self.monday, self.monday + timedelta(days=30), 'week')
+
+    def test_write_invalidates_cached_series(self):
+        """Test that logging water refreshes the cached series."""
+        self.service.series('water', self.monday, self.monday, 'day')
+        DailyLog.objects.create(user=self.user, date=self.monday, amount_ml=900)
+        points = self.service.series('water', self.monday, self.monday, 'day')
+        self.assertEqual(points[0]['total_ml'], 900)
+
+    def test_meal_invalidates_cached_nutrition(self):
+        """Test that logging a meal refreshes the cached nutrition series."""
+        self.service.series('nutrition', self.monday, self.monday, 'day')
+        Meal.objects.create(
+            user=self.user, name="Oats", meal_type='Breakfast', date=self.monday,
+            calories=300, protein_g=10.0, carbs_g=50.0, fat_g=5.0,
+        )
+        points = self.service.series('nutrition', self.monday, self.monday, 'day')
+        self.assertEqual(points[0]['calories'], 300)
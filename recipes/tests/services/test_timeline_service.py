@@ -0,0 +1,63 @@
+"""Tests for the TimelineService."""
+from django.test import TestCase
+from recipes.models import User, Post, Follow, TimelineEntry
+from recipes.services.timeline_service import TimelineService
+
+
+class TimelineServiceTestCase(TestCase):
+    """Tests for the TimelineService."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.service = TimelineService(self.user)
+
+    def timeline_post_ids(self, user):
+        return set(TimelineEntry.objects.filter(user=user).values_list('post_id', flat=True))
+
+    def test_publish_adds_post_to_author_timeline(self):
+        """Test that publishing a post adds it to the author's own timeline."""
+        post = Post.objects.create(author=self.user, title="Mine")
+        self.service.publish(post)
+        self.assertEqual(self.timeline_post_ids(self.user), {post.id})
+
+    def test_publish_fans_out_to_followers(self):
+        """Test that publishing a post adds it to every follower's timeline."""
+        Follow.objects.create(follower=self.other_user, followed=self.user)
+        post = Post.objects.create(author=self.user, title="Mine")
+        self.service.publish(post)
+        self.assertEqual(self.timeline_post_ids(self.other_user), {post.id})
+
+    def test_publish_copies_created_at(self):
+        """Test that timeline entries carry the post's creation time."""
+        post = Post.objects.create(author=self.user, title="Mine")
+        self.service.publish(post)
+        entry = TimelineEntry.objects.get(user=self.user, post=post)
+        self.assertEqual(entry.created_at, post.created_at)
+
+    def test_follow_backfills_existing_posts(self):
+        """Test that following an author backfills their earlier posts."""
+        posts = [Post.objects.create(author=self.other_user, title=f"Theirs {i}") for i in range(3)]
+        self.service.follow(self.other_user)
+        self.assertEqual(self.timeline_post_ids(self.user), {p.id for p in posts})
+
+    def test_follow_twice_does_not_duplicate(self):
+        """Test that a repeated backfill leaves one entry per post."""
+        Post.objects.create(author=self.other_user, title="Theirs")
+        self.service.follow(self.other_user)
+        self.service.follow(self.other_user)
+        self.assertEqual(TimelineEntry.objects.filter(user=self.user).count(), 1)
+
+    def test_unfollow_removes_author_posts(self):
+        """Test that unfollowing an author removes only their posts."""
+        own = Post.objects.create(author=self.user, title="Mine")
+        self.service.publish(own)
+        Post.objects.create(author=self.other_user, title="Theirs")
+        self.service.follow(self.other_user)
+        self.service.unfollow(self.other_user)
+        self.assertEqual(self.timeline_post_ids(self.user), {own.id})
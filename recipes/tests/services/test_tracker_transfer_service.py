@@ -0,0 +1,138 @@
+"""Tests for the TrackerTransferService."""
+from datetime import date, timedelta
+from django.test import TestCase
+from django.utils import timezone
+from recipes.models import User, Meal, DailyLog, DailyNutrition, FastingSession, MealStreak
+from recipes.services.tracker_transfer_service import TrackerTransferService, TrackerImportError
+
+
+class TrackerTransferServiceTestCase(TestCase):
+    """Tests for the TrackerTransferService."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.service = TrackerTransferService(self.user)
+        self.today = date.today()
+        self.start = timezone.now().replace(microsecond=0) - timedelta(days=1)
+
+    def create_history(self):
+        for days_ago in (1, 0):
+            Meal.objects.create(
+                user=self.user, name="Oats, with milk", meal_type='Breakfast',
+                date=self.today - timedelta(days=days_ago),
+                calories=300, protein_g=10.5, carbs_g=50.0, fat_g=5.0,
+            )
+        DailyLog.objects.create(user=self.user, date=self.today, amount_ml=1800, calorie_goal=2100)
+        FastingSession.objects.create(
+            user=self.user, start_date_time=self.start, end_date_time=self.start + timedelta(hours=16),
+            target_duration=16, is_active=False,
+        )
+
+    def test_export_csv_writes_header_and_rows(self):
+        """Test that a CSV export starts with the column names and quotes values as needed."""
+        self.create_history()
+        lines = list(self.service.export_csv('meals'))
+        self.assertEqual(lines[0].strip(), 'date,meal_type,name,calories,protein_g,carbs_g,fat_g')
+        self.assertEqual(len(lines), 3)
+        self.assertIn('"Oats, with milk"', lines[1])
+        self.assertTrue(lines[1].startswith((self.today - timedelta(days=1)).isoformat()))
+
+    def test_export_only_includes_own_history(self):
+        """Test that other users' rows are left out of the export."""
+        self.create_history()
+        self.assertEqual(list(TrackerTransferService(self.other_user).export_jsonl()), [])
+
+    def test_jsonl_round_trip_copies_history(self):
+        """Test that importing an export recreates the history and its derived totals."""
+        self.create_history()
+        counts = TrackerTransferService(self.other_user).import_jsonl(self.service.export_jsonl())
+        self.assertEqual(counts, {'meals': 2, 'daily_logs': 1, 'fasting_sessions': 1, 'skipped': 0})
+        self.assertEqual(DailyLog.objects.get(user=self.other_user).calorie_goal, 2100)
+        self.assertEqual(FastingSession.objects.get(user=self.other_user).start_date_time, self.start)
+        self.assertEqual(DailyNutrition.objects.get(user=self.other_user, date=self.today).calories, 300)
+        self.assertEqual(MealStreak.objects.get(user=self.other_user).current_streak, 2)
+
+    def test_importing_twice_skips_existing_records(self):
+        """Test that re-importing a file doesn't duplicate meals or fasts."""
+        self.create_history()
+        export = list(self.service.export_jsonl())
+        counts = self.service.import_jsonl(export)
+        self.assertEqual(counts, {'meals': 0, 'daily_logs': 1, 'fasting_sessions': 0, 'skipped': 3})
+        self.assertEqual(Meal.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(FastingSession.objects.filter(user=self.user).count(), 1)
+
+    def test_csv_import_upserts_daily_logs(self):
+        """Test that a daily log for an existing day replaces its values."""
+        DailyLog.objects.create(user=self.user, date=self.today, amount_ml=500)
+        csv_lines = [
+            'date,amount_ml,water_goal,calorie_goal,protein_goal,carbs_goal,fat_goal\n',
+            f'{self.today},2000,2500,1900,150,200,60\n',
+            f'{self.today - timedelta(days=1)},1500,2500,1900,150,200,60\n',
+        ]
+        self.service.import_csv('daily_logs', csv_lines)
+        self.assertEqual(DailyLog.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(DailyLog.objects.get(user=self.user, date=self.today).amount_ml, 2000)
+
+    def test_import_is_chunked(self):
+        """Test that records spanning several chunks are all imported."""
+        self.service.CHUNK_SIZE = 2
+        csv_lines = ['date,meal_type,name,calories,protein_g,carbs_g,fat_g\n'] + [
+            f'{self.today - timedelta(days=n)},Lunch,Soup,{100 + n},5,10,2\n' for n in range(5)
+        ]
+        counts = self.service.import_csv('meals', csv_lines)
+        self.assertEqual(counts['meals'], 5)
+        self.assertEqual(DailyNutrition.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(MealStreak.objects.get(user=self.user).current_streak, 5)
+
+    def test_invalid_record_rolls_back_import(self):
+        """Test that a bad record aborts the whole import and names its line."""
+        csv_lines = [
+            'date,meal_type,name,calories,protein_g,carbs_g,fat_g\n',
+            f'{self.today},Lunch,Soup,100,5,10,2\n',
+            f'{self.today},Brunch,Soup,lots,5,10,2\n',
+        ]
+        with self.assertRaises(TrackerImportError) as raised:
+            self.service.import_csv('meals', csv_lines)
+        self.assertEqual(raised.exception.line, 3)
+        self.assertIn('meal_type', str(raised.exception))
+        self.assertFalse(Meal.objects.exists())
+
+    def test_csv_import_requires_every_column(self):
+        """Test that a CSV missing columns is rejected up front."""
+        with self.assertRaises(TrackerImportError) as raised:
+            self.service.import_csv('meals', ['date,name\n', f'{self.today},Soup\n'])
+        self.assertIn('calories', str(raised.exception))
+
+    def test_jsonl_import_rejects_unknown_dataset(self):
+        """Test that a JSON line naming an unknown dataset is rejected."""
+        with self.assertRaises(TrackerImportError) as raised:
+            self.service.import_jsonl(['\n', '{"dataset": "steps", "count": 3}\n'])
+        self.assertEqual(raised.exception.line, 2)
+
+    def test_jsonl_import_rejects_lines_that_are_not_objects(self):
+        """Test that a JSON line holding a list rather than an object is rejected."""
+        with self.assertRaises(TrackerImportError) as raised:
+            self.service.import_jsonl(['[1]\n'])
+        self.assertEqual(raised.exception.line, 1)
+
+    def test_jsonl_import_rejects_dataset_that_is_not_a_string(self):
+        """Test that a JSON line whose dataset isn't a name is rejected."""
+        with self.assertRaises(TrackerImportError) as raised:
+            self.service.import_jsonl(['{"dataset": [1]}\n'])
+        self.assertEqual(raised.exception.line, 1)
+
+    def test_active_fasts_are_not_imported(self):
+        """Test that an in-progress fast is skipped so it can't clash with the tracker's own."""
+        csv_lines = [
+            'start_date_time,end_date_time,target_duration,is_active\n',
+            f'{self.start.isoformat()},,16,True\n',
+        ]
+        counts = self.service.import_csv('fasting_sessions', csv_lines)
+        self.assertEqual(counts['skipped'], 1)
+        self.assertFalse(FastingSession.objects.exists())
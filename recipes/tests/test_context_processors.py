@@ -2,7 +2,7 @@
 from django.test import TestCase, RequestFactory
 from django.contrib.auth.models import AnonymousUser
 from recipes.models import User, Profile
-from recipes.context_processors import user_profile, user_theme_context
+from recipes.context_processors import theme_attributes, user_profile, user_theme_context
 
 
 class UserProfileContextProcessorTestCase(TestCase):
@@ -41,6 +41,16 @@ class UserProfileContextProcessorTestCase(TestCase):
         self.assertTrue(Profile.objects.filter(user=self.user).exists())
 
 
+    def test_processors_share_one_profile_query(self):
+        """Test that both context processors of a request read the profile once between them."""
+        Profile.objects.get_or_create(user=self.user)
+        request = self.factory.get('/')
+        request.user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            user_profile(request)
+            user_theme_context(request)
+
+
 class UserThemeContextProcessorTestCase(TestCase):
     """Tests for the user_theme_context context processor."""
 
@@ -161,3 +171,33 @@ class UserThemeContextProcessorTestCase(TestCase):
         self.assertIn('dark-mode', context['body_classes'])
         self.assertIn('cb-deuteranopia', context['body_classes'])
 
+
+    def test_unauthenticated_user_runs_no_queries(self):
+        """Test that anonymous pages get the default theme without any query."""
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        with self.assertNumQueries(0):
+            user_theme_context(request)
+
+    def test_theme_attributes_are_built_once_per_combination(self):
+        """Test that repeated renders with the same settings reuse the built attributes."""
+        Profile.objects.get_or_create(user=self.user)
+        request = self.factory.get('/')
+        request.user = self.user
+        user_theme_context(request)
+        hits = theme_attributes.cache_info().hits
+        user_theme_context(request)
+        self.assertEqual(theme_attributes.cache_info().hits, hits + 1)
+
+    def test_settings_change_applies_to_next_render(self):
+        """Test that saving new settings changes the attributes of the next render."""
+        profile, _ = Profile.objects.get_or_create(user=self.user)
+        request = self.factory.get('/')
+        request.user = self.user
+        self.assertEqual(user_theme_context(request)['body_classes'], '')
+        profile.theme = 'dark'
+        profile.font_scale = 1.1
+        profile.save()
+        context = user_theme_context(request)
+        self.assertEqual(context['body_classes'], 'dark-mode')
+        self.assertEqual(context['body_styles'], 'font-size: 1.1rem;')
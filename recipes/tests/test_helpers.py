@@ -1,108 +1,92 @@
 """Tests for the helper functions in recipes/helpers.py."""
 from django.test import TestCase
-from recipes.helpers import (
-    is_liked_util,
-    is_saved_util,
-    is_followed_util,
-    get_rating_util,
-)
-
-
-class IsLikedUtilTestCase(TestCase):
-    """Tests for the is_liked_util function."""
-
-    def test_is_liked_util_returns_true_when_post_in_set(self):
-        """is_liked_util should return True when post_id is in the set."""
-        liked_posts_set = {1, 2, 3, 4, 5}
-        result = is_liked_util(3, liked_posts_set)
-        self.assertTrue(result)
-
-    def test_is_liked_util_returns_false_when_post_not_in_set(self):
-        """is_liked_util should return False when post_id is not in the set."""
-        liked_posts_set = {1, 2, 3}
-        result = is_liked_util(99, liked_posts_set)
-        self.assertFalse(result)
-
-    def test_is_liked_util_returns_false_for_empty_set(self):
-        """is_liked_util should return False for empty set."""
-        liked_posts_set = set()
-        result = is_liked_util(1, liked_posts_set)
-        self.assertFalse(result)
-
-
-class IsSavedUtilTestCase(TestCase):
-    """Tests for the is_saved_util function."""
-
-    def test_is_saved_util_returns_true_when_post_in_set(self):
-        """is_saved_util should return True when post_id is in the set."""
-        saved_posts_set = {10, 20, 30}
-        result = is_saved_util(20, saved_posts_set)
-        self.assertTrue(result)
-
-    def test_is_saved_util_returns_false_when_post_not_in_set(self):
-        """is_saved_util should return False when post_id is not in the set."""
-        saved_posts_set = {10, 20, 30}
-        result = is_saved_util(50, saved_posts_set)
-        self.assertFalse(result)
-
-    def test_is_saved_util_returns_false_for_empty_set(self):
-        """is_saved_util should return False for empty set."""
-        saved_posts_set = set()
-        result = is_saved_util(1, saved_posts_set)
-        self.assertFalse(result)
-
-
-class IsFollowedUtilTestCase(TestCase):
-    """Tests for the is_followed_util function."""
-
-    def test_is_followed_util_returns_true_when_author_in_map(self):
-        """is_followed_util should return True when author_id is in the map with True."""
-        is_following_map = {1: True, 2: True, 3: True}
-        result = is_followed_util(2, is_following_map)
-        self.assertTrue(result)
-
-    def test_is_followed_util_returns_false_when_author_not_in_map(self):
-        """is_followed_util should return False when author_id is not in the map."""
-        is_following_map = {1: True, 2: True}
-        result = is_followed_util(99, is_following_map)
-        self.assertFalse(result)
-
-    def test_is_followed_util_returns_false_for_empty_map(self):
-        """is_followed_util should return False for empty map."""
-        is_following_map = {}
-        result = is_followed_util(1, is_following_map)
-        self.assertFalse(result)
-
-    def test_is_followed_util_returns_value_from_map(self):
-        """is_followed_util should return the actual value from the map."""
-        is_following_map = {1: True, 2: False}
-        self.assertTrue(is_followed_util(1, is_following_map))
-        self.assertFalse(is_followed_util(2, is_following_map))
-
-
-class GetRatingUtilTestCase(TestCase):
-    """Tests for the get_rating_util function."""
-
-    def test_get_rating_util_returns_rating_when_post_in_dict(self):
-        """get_rating_util should return rating when post_id is in the dict."""
-        user_ratings_dict = {1: 5, 2: 4, 3: 3}
-        result = get_rating_util(2, user_ratings_dict)
-        self.assertEqual(result, 4)
-
-    def test_get_rating_util_returns_zero_when_post_not_in_dict(self):
-        """get_rating_util should return 0 when post_id is not in the dict."""
-        user_ratings_dict = {1: 5, 2: 4}
-        result = get_rating_util(99, user_ratings_dict)
-        self.assertEqual(result, 0)
-
-    def test_get_rating_util_returns_zero_for_empty_dict(self):
-        """get_rating_util should return 0 for empty dict."""
-        user_ratings_dict = {}
-        result = get_rating_util(1, user_ratings_dict)
-        self.assertEqual(result, 0)
-
-    def test_get_rating_util_returns_various_ratings(self):
-        """get_rating_util should return correct rating values."""
-        user_ratings_dict = {1: 1, 2: 2, 3: 3, 4: 4, 5: 5}
-        for post_id in range(1, 6):
-            self.assertEqual(get_rating_util(post_id, user_ratings_dict), post_id)
+from recipes.models import User, Post
+from recipes.helpers import encode_feed_cursor, decode_feed_cursor, parse_total_minutes
+
+
+class ParseTotalMinutesTestCase(TestCase):
+    """Tests for the parse_total_minutes function."""
+
+    def test_returns_none_for_empty_input(self):
+        """parse_total_minutes should return None for None, empty or blank input."""
+        for value in (None, '', '   '):
+            self.assertIsNone(parse_total_minutes(value))
+
+    def test_parses_minutes(self):
+        """parse_total_minutes should read both 'min' and 'minutes'."""
+        self.assertEqual(parse_total_minutes('25 minutes'), 25)
+        self.assertEqual(parse_total_minutes('15 min'), 15)
+
+    def test_parses_hours(self):
+        """parse_total_minutes should convert hours to minutes."""
+        self.assertEqual(parse_total_minutes('1 hour'), 60)
+        self.assertEqual(parse_total_minutes('2 hours'), 120)
+
+    def test_parses_hours_and_minutes(self):
+        """parse_total_minutes should add hours and minutes together."""
+        self.assertEqual(parse_total_minutes('1 hours 30 minutes'), 90)
+        self.assertEqual(parse_total_minutes('2 hours 45 min'), 165)
+
+    def test_parses_decimal_hours(self):
+        """parse_total_minutes should read fractional hours."""
+        self.assertEqual(parse_total_minutes('1.5 hours'), 90)
+        self.assertEqual(parse_total_minutes('0.75 hr'), 45)
+
+    def test_parses_short_hour_units(self):
+        """parse_total_minutes should read 'hr', 'hrs' and 'h' as hours."""
+        self.assertEqual(parse_total_minutes('1 hr 30 min'), 90)
+        self.assertEqual(parse_total_minutes('2 hrs'), 120)
+        self.assertEqual(parse_total_minutes('3h'), 180)
+        self.assertEqual(parse_total_minutes('1 h 15 mins'), 75)
+
+    def test_is_case_and_space_insensitive(self):
+        """parse_total_minutes should ignore case and extra whitespace."""
+        self.assertEqual(parse_total_minutes('1 HOURS 30 MINUTES'), 90)
+        self.assertEqual(parse_total_minutes('  1   hour    30   min  '), 90)
+
+    def test_bare_number_is_minutes(self):
+        """parse_total_minutes should treat a lone number as minutes."""
+        self.assertEqual(parse_total_minutes('45'), 45)
+
+    def test_reads_durations_inside_other_words(self):
+        """parse_total_minutes should find a duration surrounded by other words."""
+        self.assertEqual(parse_total_minutes('about 30 mins'), 30)
+        self.assertEqual(parse_total_minutes('30 min total'), 30)
+
+    def test_returns_none_without_duration(self):
+        """parse_total_minutes should return None when no minutes or hours are given."""
+        self.assertIsNone(parse_total_minutes('quick'))
+        self.assertIsNone(parse_total_minutes('30 seconds'))
+
+
+class FeedCursorTestCase(TestCase):
+    """Tests for encode_feed_cursor and decode_feed_cursor."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            author=User.objects.get(username='@johndoe'),
+            title="Cursor Post",
+        )
+
+    def test_cursor_round_trips_position(self):
+        """decode_feed_cursor should return the created_at and id that were encoded."""
+        position = decode_feed_cursor(encode_feed_cursor(self.post))
+        self.assertEqual(position['created_at'], self.post.created_at)
+        self.assertEqual(position['id'], self.post.id)
+        self.assertIsNone(position['rating'])
+
+    def test_cursor_round_trips_rating(self):
+        """decode_feed_cursor should return the rating that was encoded."""
+        position = decode_feed_cursor(encode_feed_cursor(self.post, 4.333333333333333))
+        self.assertEqual(position['rating'], 4.333333333333333)
+
+    def test_decode_returns_none_for_empty_cursor(self):
+        """decode_feed_cursor should return None for an empty cursor."""
+        self.assertIsNone(decode_feed_cursor(''))
+
+    def test_decode_returns_none_for_garbage(self):
+        """decode_feed_cursor should return None for malformed cursors."""
+        self.assertIsNone(decode_feed_cursor('not-a-cursor'))
+        self.assertIsNone(decode_feed_cursor('W10'))
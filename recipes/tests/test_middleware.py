@@ -0,0 +1,76 @@
+"""Tests for the profile middleware and authentication backend."""
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+from recipes.backends import ProfileModelBackend
+from recipes.middleware import ProfileMiddleware
+from recipes.models import User, Profile
+
+
+class ProfileMiddlewareTestCase(TestCase):
+    """Tests for ProfileMiddleware."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.profile = Profile.objects.create(user=self.user, calorie_goal=1800)
+        self.request = RequestFactory().get('/')
+        self.request.user = User.objects.get(pk=self.user.pk)
+        ProfileMiddleware(lambda request: HttpResponse())(self.request)
+
+    def test_profile_is_loaded_on_first_use(self):
+        """Test that the middleware runs no queries until the profile is read."""
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with self.assertNumQueries(0):
+            ProfileMiddleware(lambda request: HttpResponse())(request)
+
+    def test_request_profile_is_the_users_profile(self):
+        """Test that request.profile is the signed-in user's profile."""
+        self.assertEqual(self.request.profile.pk, self.profile.pk)
+        self.assertEqual(self.request.profile.calorie_goal, 1800)
+
+    def test_request_profile_is_shared_with_the_user(self):
+        """Test that the profile is read once and cached on the request's user."""
+        with self.assertNumQueries(1):
+            self.request.profile.calorie_goal
+            self.request.user.profile.calorie_goal
+
+
+class ProfileModelBackendTestCase(TestCase):
+    """Tests for ProfileModelBackend."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        Profile.objects.create(user=self.user)
+
+    def test_get_user_loads_profile_in_the_same_query(self):
+        """Test that the user and their profile are read in one query."""
+        with self.assertNumQueries(1):
+            user = ProfileModelBackend().get_user(self.user.pk)
+            self.assertEqual(user.profile.user_id, self.user.pk)
+
+    def test_get_user_returns_none_for_unknown_user(self):
+        """Test that an unknown user id gives no user."""
+        self.assertIsNone(ProfileModelBackend().get_user(0))
+
+    def test_get_user_returns_none_for_inactive_user(self):
+        """Test that an inactive user can't be loaded into a session."""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(ProfileModelBackend().get_user(self.user.pk))
+
+    def test_session_from_model_backend_stays_signed_in(self):
+        """Test that a session signed in with the plain ModelBackend still authenticates."""
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user.pk, self.user.pk)
+
+    def test_new_sign_in_uses_profile_backend(self):
+        """Test that signing in with a password stores ProfileModelBackend in the session."""
+        self.client.login(username='@johndoe', password='Password123')
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'recipes.backends.ProfileModelBackend')
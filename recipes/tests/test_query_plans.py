@@ -0,0 +1,118 @@
+"""Tests that the hot lookups in the views are served by their indexes."""
+from unittest import skipUnless
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from recipes.models import User, Post, Like, Comment, Save, Recipe
+
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTestCase(TestCase):
+    """Checks EXPLAIN QUERY PLAN output for the queries the views actually run."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.post = Post.objects.create(author=self.other_user, title="Post")
+        Comment.objects.create(user=self.user, post=self.post, text="Nice")
+        Save.objects.create(user=self.user, post=self.post)
+        Recipe.objects.create(
+            name="Soup", total_time="10 min", ingredients="Water", method="Boil", created_by=self.user,
+        )
+        self.client.login(username=self.user.username, password='Password123')
+
+    def view_plans(self, url, method='get', data=None):
+        """Request a view and return the query plan of each SELECT it ran."""
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data or {}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertLess(response.status_code, 400)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if query['sql'].startswith('SELECT'):
+                    cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+                    plans.append('\n'.join(row[-1] for row in cursor.fetchall()))
+        return plans
+
+    def assertViewUsesIndex(self, url, index_name, method='get', data=None, sorts_in_index=True):
+        plans = [plan for plan in self.view_plans(url, method, data) if index_name in plan]
+        self.assertTrue(plans, f"No query run by {url} uses {index_name}")
+        if sorts_in_index:
+            self.assertNotIn('TEMP B-TREE', plans[0])
+
+    def test_tracker_meals_use_user_date_index(self):
+        """Test that the tracker reads today's meals through the (user, date) index."""
+        # The handful of meals in a day are sorted by meal type after the lookup
+        self.assertViewUsesIndex(reverse('tracker'), 'meal_user_date_idx', sorts_in_index=False)
+
+    def test_tracker_active_fast_uses_user_start_index(self):
+        """Test that the tracker finds the active fast through the (user, start) index."""
+        self.assertViewUsesIndex(reverse('tracker'), 'fasting_user_start_idx')
+
+    def test_fasting_history_uses_user_start_index(self):
+        """Test that the fasting history reads its range through the (user, start) index."""
+        self.assertViewUsesIndex(reverse('fasting_history'), 'fasting_user_start_idx')
+
+    def test_feed_uses_recent_index(self):
+        """Test that the newest-first feed reads posts in index order."""
+        self.assertViewUsesIndex(reverse('feed'), 'post_recent_idx')
+
+    def test_feed_saved_posts_use_user_recent_index(self):
+        """Test that the feed's saved posts are read through the (user, created_at) index."""
+        self.assertViewUsesIndex(reverse('feed'), 'save_user_recent_idx')
+
+    def test_follow_reads_author_posts_from_author_recent_index(self):
+        """Test that following a user copies their posts from the (author, created_at) index."""
+        self.assertViewUsesIndex(
+            reverse('toggle_follow', args=[self.other_user.pk]), 'post_author_recent_idx', method='post',
+        )
+
+    def test_like_lookup_uses_unique_index(self):
+        """Test that toggling a like checks it through the (user, post) unique index."""
+        self.assertViewUsesIndex(
+            reverse('toggle_like', args=[self.post.pk]), 'recipes_like_user_id_post_id', method='post',
+        )
+
+    def test_post_comments_use_post_recent_index(self):
+        """Test that a post's comments are paged through the (post, created_at, id) index."""
+        self.assertViewUsesIndex(reverse('post_comments', args=[self.post.pk]), 'comment_post_recent_idx')
+
+    def test_my_recipes_use_author_name_index(self):
+        """Test that a user's recipes are listed by name through the (created_by, name) index."""
+        self.assertViewUsesIndex(reverse('my_recipes'), 'recipe_author_name_idx')
+
+    def test_browse_recipes_use_source_index(self):
+        """Test that the browse page reads user recipes through the (source, id) index."""
+        self.assertViewUsesIndex(reverse('recipes'), 'recipe_browse_idx')
+
+    def test_quick_meals_use_source_minutes_index(self):
+        """Test that quick meals are a range read on the (source, total_minutes, id) index."""
+        self.assertViewUsesIndex(reverse('recipes'), 'recipe_browse_minutes_idx', data={'sort_by': 'quick-meals'})
+
+    def test_recipe_search_joins_the_full_text_index_once(self):
+        """Test that search walks the full-text matches and looks recipes up by id, without a search per row."""
+        plans = [plan for plan in self.view_plans(reverse('recipes'), data={'q': 'soup'}) if 'recipes_recipe_fts' in plan]
+        self.assertTrue(plans)
+        for plan in plans:
+            self.assertIn('VIRTUAL TABLE INDEX', plan)
+            self.assertNotIn('CORRELATED', plan)
+
+
+class LikeUniquenessTestCase(TestCase):
+    """Tests the unique constraint on likes."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def test_user_cannot_like_a_post_twice(self):
+        """Test that a second like of the same post by the same user is rejected."""
+        user = User.objects.get(username='@johndoe')
+        post = Post.objects.create(author=user, title="Post")
+        Like.objects.create(user=user, post=post)
+        with self.assertRaises(IntegrityError):
+            Like.objects.create(user=user, post=post)
@@ -0,0 +1,57 @@
+"""Tests for the content-addressed image storage."""
+import hashlib
+import os
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from recipes.storage import ContentAddressedStorage, select_image_storage
+from recipes.tests.helpers import TemporaryMediaMixin
+
+
+class ContentAddressedStorageTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for ContentAddressedStorage."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = select_image_storage()
+
+    def test_image_storage_is_content_addressed(self):
+        """Test that uploaded images are kept in the content-addressed storage."""
+        self.assertIsInstance(self.storage, ContentAddressedStorage)
+
+    def test_file_is_named_after_its_content(self):
+        """Test that a saved file is named after the hash of its bytes, keeping its directory and extension."""
+        name = self.storage.save('posts_images/dish.JPG', ContentFile(b'dish'))
+        self.assertEqual(name, f'posts_images/{hashlib.sha256(b"dish").hexdigest()}.jpg')
+        self.assertTrue(ContentAddressedStorage.is_content_addressed(name))
+
+    def test_identical_content_is_stored_once(self):
+        """Test that saving the same bytes twice returns the same name and writes one file."""
+        first = self.storage.save('posts_images/a.jpg', ContentFile(b'same'))
+        second = self.storage.save('posts_images/b.jpg', ContentFile(b'same'))
+        self.assertEqual(first, second)
+        self.assertEqual(self.storage.listdir('posts_images')[1], [os.path.basename(first)])
+
+    def test_different_content_gets_different_names(self):
+        """Test that different bytes are stored under different names."""
+        first = self.storage.save('posts_images/a.jpg', ContentFile(b'one'))
+        second = self.storage.save('posts_images/a.jpg', ContentFile(b'two'))
+        self.assertNotEqual(first, second)
+
+    def test_upload_name_is_dropped(self):
+        """Test that the name a client uploads under isn't kept, even if it looks like a hash."""
+        forged = f'{hashlib.sha256(b"other").hexdigest()}.jpg'
+        self.assertEqual(self.storage.generate_filename(f'posts_images/{forged}'), 'posts_images/upload.jpg')
+        name = self.storage.save(self.storage.generate_filename(f'posts_images/{forged}'), ContentFile(b'mine'))
+        self.assertEqual(name, f'posts_images/{hashlib.sha256(b"mine").hexdigest()}.jpg')
+
+    def test_content_addressed_names_are_kept(self):
+        """Test that a rendition named after its source keeps that name."""
+        name = f'posts_images/{hashlib.sha256(b"source").hexdigest()}_320w.webp'
+        self.assertEqual(self.storage.save(name, ContentFile(b'rendition')), name)
+
+    def test_saving_stored_content_again_refreshes_its_modified_time(self):
+        """Test that a deduplicated upload counts as recently written."""
+        name = self.storage.save('posts_images/a.jpg', ContentFile(b'again'))
+        os.utime(self.storage.path(name), (0, 0))
+        self.storage.save('posts_images/b.jpg', ContentFile(b'again'))
+        self.assertGreater(os.path.getmtime(self.storage.path(name)), 0)
@@ -1,10 +1,15 @@
-"""Tests for the add meal and delete meal views."""
+"""Tests for the add meal, batch meal logging and delete meal views."""
+import json
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib import messages
-from datetime import date
-from recipes.models import User, Meal
+from datetime import date, timedelta
+from recipes.models import User, Meal, MealStreak
 from recipes.forms.meal_form import MealForm
+from recipes.services import UserStatsService
 from recipes.tests.helpers import reverse_with_next
 
 
@@ -173,3 +178,122 @@ class DeleteMealViewTestCase(TestCase):
         response = self.client.post(self.url)
         self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
 
+
+
+class LogMealsViewTestCase(TestCase):
+    """Tests for the batch meal logging view."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.get(username='@johndoe')
+        self.url = reverse('log_meals')
+        self.today = date.today()
+        self.meals = [
+            {'name': 'Oats', 'meal_type': 'Breakfast', 'date': self.today.isoformat(),
+             'calories': 300, 'protein_g': 10.0, 'carbs_g': 50.0, 'fat_g': 5.0},
+            {'name': 'Salad', 'meal_type': 'Lunch', 'date': self.today.isoformat(),
+             'calories': 400, 'protein_g': 20.0, 'carbs_g': 30.0, 'fat_g': 15.0},
+            {'name': 'Soup', 'meal_type': 'Dinner', 'date': (self.today - timedelta(days=1)).isoformat(),
+             'calories': 350, 'protein_g': 15.0, 'carbs_g': 40.0, 'fat_g': 10.0},
+        ]
+
+    def post_meals(self, meals):
+        return self.client.post(self.url, json.dumps({'meals': meals}), content_type='application/json')
+
+    def test_log_meals_url(self):
+        """Test that the batch meal URL resolves correctly."""
+        self.assertEqual(self.url, '/api/meals/')
+
+    def test_log_meals_redirects_when_not_logged_in(self):
+        """Test that unauthenticated requests are redirected to login."""
+        response = self.post_meals(self.meals)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Meal.objects.count(), 0)
+
+    def test_log_meals_rejects_get(self):
+        """Test that only POST is allowed."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_log_meals_creates_all_meals(self):
+        """Test that every meal in the batch is saved for the user."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.post_meals(self.meals)
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['created'], 3)
+        self.assertEqual(
+            sorted(data['meal_ids']),
+            sorted(Meal.objects.filter(user=self.user).values_list('id', flat=True)),
+        )
+
+    def test_log_meals_returns_updated_daily_totals(self):
+        """Test that the response carries the consumed totals of each touched day."""
+        self.client.login(username=self.user.username, password='Password123')
+        Meal.objects.create(
+            user=self.user, name='Snack', meal_type='Snack', date=self.today,
+            calories=100, protein_g=1.0, carbs_g=20.0, fat_g=1.0,
+        )
+        response = self.post_meals(self.meals)
+        totals = response.json()['daily_totals']
+        self.assertEqual([day['date'] for day in totals], [(self.today - timedelta(days=1)).isoformat(), self.today.isoformat()])
+        self.assertEqual(totals[0]['calories'], 350)
+        self.assertEqual(totals[1]['calories'], 800)
+        self.assertEqual(totals[1]['protein_g'], 31.0)
+
+    def test_log_meals_updates_streak(self):
+        """Test that the batch extends the stored meal streak."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.post_meals(self.meals)
+        streak = MealStreak.objects.get(user=self.user)
+        self.assertEqual((streak.current_streak, streak.last_logged_date), (2, self.today))
+
+    def test_log_meals_refreshes_cached_stats(self):
+        """Test that the profile stats count the batch even though bulk inserts send no signals."""
+        self.client.login(username=self.user.username, password='Password123')
+        UserStatsService(self.user).get_stats()
+        self.post_meals(self.meals)
+        self.assertEqual(UserStatsService(self.user).get_stats()['total_meals_logged'], 3)
+
+    def test_log_meals_inserts_in_bulk(self):
+        """Test that a larger batch takes the same number of queries as a small one."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.post_meals(self.meals[:1])
+        with CaptureQueriesContext(connection) as small:
+            self.post_meals(self.meals[:1])
+        with CaptureQueriesContext(connection) as large:
+            self.post_meals([self.meals[0]] * 20)
+        self.assertEqual(len(large), len(small))
+
+    def test_log_meals_rejects_whole_batch_on_invalid_meal(self):
+        """Test that one invalid meal fails the batch and reports its index."""
+        self.client.login(username=self.user.username, password='Password123')
+        invalid = dict(self.meals[1], meal_type='Brunch', calories='lots')
+        response = self.post_meals([self.meals[0], invalid])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual(errors[0]['index'], 1)
+        self.assertIn('meal_type', errors[0]['errors'])
+        self.assertIn('calories', errors[0]['errors'])
+        self.assertEqual(Meal.objects.count(), 0)
+
+    def test_log_meals_defaults_date_to_today(self):
+        """Test that a meal without a date is logged for today."""
+        self.client.login(username=self.user.username, password='Password123')
+        meal = {key: value for key, value in self.meals[2].items() if key != 'date'}
+        self.post_meals([meal])
+        self.assertEqual(Meal.objects.get(user=self.user).date, self.today)
+
+    def test_log_meals_rejects_malformed_requests(self):
+        """Test that bodies that aren't a non-empty meal list are rejected."""
+        self.client.login(username=self.user.username, password='Password123')
+        bodies = ['not json', '[]', '{"meals": []}', '{"meals": "Oats"}', json.dumps({'meals': [self.meals[0]] * 101})]
+        for body in bodies:
+            response = self.client.post(self.url, body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body[:20])
+        response = self.post_meals(['Oats'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Meal.objects.count(), 0)
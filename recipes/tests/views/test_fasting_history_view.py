@@ -1,8 +1,10 @@
 """Tests for the fasting history view."""
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 from recipes.models import User, Profile, FastingSession
 from recipes.tests.helpers import reverse_with_next
 
@@ -214,3 +216,43 @@ class FastingHistoryViewTestCase(TestCase):
         active_sessions = [s for s in table_data if s.get('is_active')]
         self.assertGreaterEqual(len(active_sessions), 1)
 
+
+    def create_sessions_last_month(self, hours):
+        """Create a completed fast of each length, all starting on the 1st of last month."""
+        month_start = (timezone.localdate().replace(day=1) - timedelta(days=1)).replace(day=1)
+        start = timezone.make_aware(datetime.combine(month_start, datetime.min.time()) + timedelta(hours=6))
+        for length in hours:
+            FastingSession.objects.create(
+                user=self.user,
+                start_date_time=start,
+                end_date_time=start + timedelta(hours=length),
+                target_duration=16,
+                is_active=False
+            )
+
+    def test_fasting_history_month_view_averages_each_week(self):
+        """Test that the month chart averages the completed fasts started in each week."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.create_sessions_last_month([14, 18])
+        response = self.client.get(self.url + '?view_type=month&date_offset=-1')
+        self.assertEqual(response.context['chart_data'][0], 16.0)
+        self.assertEqual(sum(response.context['chart_data'][1:]), 0)
+        self.assertEqual(len(response.context['table_data']), 2)
+
+    def test_fasting_history_month_view_query_count_is_fixed(self):
+        """Test that the month view reads its sessions in one query however many there are."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url + '?view_type=month&date_offset=-1')
+
+        self.create_sessions_last_month([16])
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url + '?view_type=month&date_offset=-1')
+
+        self.create_sessions_last_month([12 + i % 8 for i in range(60)])
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url + '?view_type=month&date_offset=-1')
+
+        self.assertEqual(len(response.context['table_data']), 61)
+        self.assertEqual(len(many), len(few))
+        session_queries = [q for q in many.captured_queries if '"recipes_fastingsession"' in q['sql']]
+        self.assertEqual(len(session_queries), 1)
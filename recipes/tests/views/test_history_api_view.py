@@ -0,0 +1,80 @@
+"""Tests for the history API view."""
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from recipes.models import User, DailyLog
+from recipes.tests.helpers import reverse_with_next
+
+
+class HistoryApiViewTestCase(TestCase):
+    """Tests for the history API view."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.get(username='@johndoe')
+        self.url = reverse('history_api', kwargs={'metric': 'water'})
+        self.today = timezone.localdate()
+        DailyLog.objects.create(user=self.user, date=self.today, amount_ml=1800)
+
+    def test_history_api_url(self):
+        """Test that the history API URL resolves correctly."""
+        self.assertEqual(self.url, '/api/history/water/')
+
+    def test_get_history_api_redirects_when_not_logged_in(self):
+        """Test that unauthenticated requests are redirected to login."""
+        response = self.client.get(self.url)
+        redirect_url = reverse_with_next('log_in', self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_default_range_is_last_seven_days(self):
+        """Test that without parameters the last seven days are returned by day."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['bucket'], 'day')
+        self.assertEqual(len(data['points']), 7)
+        self.assertEqual(data['points'][-1]['start'], self.today.isoformat())
+        self.assertEqual(data['points'][-1]['total_ml'], 1800)
+
+    def test_bucket_and_range_parameters(self):
+        """Test that from, to and bucket select the period and bucket size."""
+        self.client.login(username=self.user.username, password='Password123')
+        start = self.today - timedelta(days=27)
+        response = self.client.get(self.url, {'from': start.isoformat(), 'to': self.today.isoformat(), 'bucket': 'week'})
+        data = response.json()
+        self.assertEqual(data['from'], start.isoformat())
+        self.assertEqual(sum(point['days'] for point in data['points']), 28)
+
+    def test_response_is_privately_cacheable(self):
+        """Test that the browser may reuse a response but shared caches may not."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_unknown_metric_returns_404(self):
+        """Test that an unknown metric is not found."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(reverse('history_api', kwargs={'metric': 'steps'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_parameters_return_400(self):
+        """Test that malformed dates, unknown buckets and bad ranges are rejected."""
+        self.client.login(username=self.user.username, password='Password123')
+        long_ago = (self.today - timedelta(days=400)).isoformat()
+        for params in ({'from': 'yesterday'}, {'bucket': 'year'}, {'from': self.today.isoformat(), 'to': long_ago}, {'from': long_ago}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    def test_only_own_history_is_returned(self):
+        """Test that another user's logs are not included."""
+        other = User.objects.create_user(username='@other', email='other@example.org', password='Password123')
+        self.client.login(username=other.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['points'][-1]['total_ml'], 0)
@@ -0,0 +1,37 @@
+"""Tests for the media view."""
+import hashlib
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, RequestFactory
+from recipes.storage import select_image_storage
+from recipes.tests.helpers import TemporaryMediaMixin
+from recipes.views import serve_media
+
+
+class MediaViewTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for serving uploaded files."""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def serve(self, name):
+        return serve_media(self.factory.get(f'/media/{name}'), name, document_root=settings.MEDIA_ROOT)
+
+    def test_content_addressed_file_is_cached_forever(self):
+        """Test that a content-addressed file is served as public and immutable for a year."""
+        name = select_image_storage().save('posts_images/photo.jpg', ContentFile(b'photo'))
+        self.assertEqual(name, f'posts_images/{hashlib.sha256(b"photo").hexdigest()}.jpg')
+        response = self.serve(name)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_other_file_is_not_marked_immutable(self):
+        """Test that a file stored under its own name isn't cached as immutable."""
+        name = default_storage.save('images/legacy.jpg', ContentFile(b'legacy'))
+        response = self.serve(name)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Cache-Control'))
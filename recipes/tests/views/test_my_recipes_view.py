@@ -3,54 +3,6 @@ from django.test import TestCase
 from django.urls import reverse
 from recipes.models import User, Recipe
 from recipes.tests.helpers import reverse_with_next
-from recipes.views.my_recipes_view import parse_total_time_to_minutes
-
-
-class ParseTotalTimeToMinutesTest(TestCase):
-    """Test suite for the parse_total_time_to_minutes utility function."""
-
-    def test_empty_string(self):
-        """Test parsing an empty string returns 0."""
-        self.assertEqual(parse_total_time_to_minutes(''), 0)
-
-    def test_none_value(self):
-        """Test parsing None returns 0."""
-        self.assertEqual(parse_total_time_to_minutes(None), 0)
-
-    def test_minutes_only(self):
-        """Test parsing time with only minutes."""
-        self.assertEqual(parse_total_time_to_minutes('30 min'), 30)
-        self.assertEqual(parse_total_time_to_minutes('45 minutes'), 45)
-
-    def test_hours_only(self):
-        """Test parsing time with only hours."""
-        self.assertEqual(parse_total_time_to_minutes('1 hour'), 60)
-        self.assertEqual(parse_total_time_to_minutes('2 hours'), 120)
-
-    def test_hours_and_minutes(self):
-        """Test parsing time with both hours and minutes."""
-        self.assertEqual(parse_total_time_to_minutes('1 hour 30 min'), 90)
-        self.assertEqual(parse_total_time_to_minutes('2 hours 45 minutes'), 165)
-
-    def test_case_insensitive(self):
-        """Test that parsing is case insensitive."""
-        self.assertEqual(parse_total_time_to_minutes('1 HOUR 30 MIN'), 90)
-        self.assertEqual(parse_total_time_to_minutes('45 MINUTES'), 45)
-
-    def test_number_only(self):
-        """Test parsing string with only a number treats it as minutes."""
-        self.assertEqual(parse_total_time_to_minutes('30'), 30)
-        self.assertEqual(parse_total_time_to_minutes('120'), 120)
-
-    def test_no_number(self):
-        """Test parsing string with no number returns 0."""
-        self.assertEqual(parse_total_time_to_minutes('quick cook'), 0)
-        self.assertEqual(parse_total_time_to_minutes('no time'), 0)
-
-    def test_extra_spaces(self):
-        """Test parsing with extra spaces."""
-        self.assertEqual(parse_total_time_to_minutes('1   hour    30   min'), 90)
-        self.assertEqual(parse_total_time_to_minutes('45   minutes'), 45)
 
 
 class MyRecipesViewTestCase(TestCase):
@@ -157,7 +109,7 @@ class MyRecipesViewTestCase(TestCase):
 
     def test_sort_by_time_uses_parsing(self):
         """
-        Your view uses sorted(recipes_qs, key=parse_total_time_to_minutes).
+        The view orders by the parsed total_minutes column.
         Here we test that it actually orders 20 min < 45 min < 1 hour 10 min.
         """
         self.client.login(username=self.user.username, password='Password123')
@@ -166,6 +118,16 @@ class MyRecipesViewTestCase(TestCase):
         names = [r.name for r in page.object_list]
         self.assertEqual(names, ["Carrot Soup", "Apple Pie", "Banana Bread"])
 
+    def test_sort_by_time_puts_unreadable_times_last(self):
+        """Test that recipes whose time can't be parsed sort after every timed recipe."""
+        Recipe.objects.create(
+            name="Aaa Mystery", total_time="a while", ingredients="x", method="y", created_by=self.user,
+        )
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url, {'sort_by': 'time'})
+        names = [r.name for r in response.context['page'].object_list]
+        self.assertEqual(names[-1], "Aaa Mystery")
+
     def test_search_by_recipe_name(self):
         self.client.login(username=self.user.username, password='Password123')
         response = self.client.get(self.url, {'q': 'banana'})
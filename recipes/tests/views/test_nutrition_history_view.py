@@ -1,5 +1,8 @@
 """Tests for the nutrition history view."""
+from django.db import connection
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
@@ -13,6 +16,7 @@ class NutritionHistoryViewTestCase(TestCase):
     fixtures = ['recipes/tests/fixtures/default_user.json']
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.get(username='@johndoe')
         self.url = reverse('nutrition_history')
         # Create some daily logs and meals for testing
@@ -113,6 +117,15 @@ class NutritionHistoryViewTestCase(TestCase):
         # Should have data for days with meals
         self.assertGreater(sum(calories_actual), 0)
 
+    def test_nutrition_history_reads_daily_totals_not_meals(self):
+        """Test that the chart uses the per-day rollups instead of summing raw meals."""
+        self.client.login(username=self.user.username, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + '?days=7')
+        self.assertFalse(any('"recipes_meal"' in q['sql'] for q in queries.captured_queries))
+        self.assertEqual(response.context['calories_actual'][-1], 1500)
+        self.assertEqual(response.context['calories_actual'][0], 1800)
+
     def test_nutrition_history_shows_goal_calories(self):
         """Test that goal calories are fetched from daily logs."""
         self.client.login(username=self.user.username, password='Password123')
@@ -1,13 +1,14 @@
 """Tests for the profile view."""
 from django.contrib import messages
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from recipes.forms import AccountForm, ProfileForm, PasswordForm
 from recipes.models import User
-from recipes.tests.helpers import reverse_with_next
+from recipes.tests.helpers import TemporaryMediaMixin, reverse_with_next
 
 
-class ProfileViewTest(TestCase):
+class ProfileViewTest(TemporaryMediaMixin, TestCase):
     """Test suite for the profile view."""
 
     fixtures = [
@@ -16,8 +17,10 @@ class ProfileViewTest(TestCase):
     ]
 
     def setUp(self):
+        super().setUp()
         self.user = User.objects.get(username='@johndoe')
         self.url = reverse('profile')
+        cache.clear()
         self.account_form_input = {
             'action': 'update_account',
             'first_name': 'John2',
@@ -1,87 +1,9 @@
-"""Tests for the browse recipes view and parse_time_to_minutes function."""
+"""Tests for the browse recipes view."""
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from recipes.models import User, Recipe
-from recipes.views.recipes_view import parse_time_to_minutes
-
-
-class ParseTimeToMinutesTestCase(TestCase):
-    """Tests for the parse_time_to_minutes utility function."""
-
-    def test_parse_time_returns_none_for_none_input(self):
-        """parse_time_to_minutes should return None when given None."""
-        result = parse_time_to_minutes(None)
-        self.assertIsNone(result)
-
-    def test_parse_time_returns_none_for_empty_string(self):
-        """parse_time_to_minutes should return None when given empty string."""
-        result = parse_time_to_minutes('')
-        self.assertIsNone(result)
-
-    def test_parse_time_returns_none_for_whitespace_only(self):
-        """parse_time_to_minutes should return None for whitespace-only input."""
-        result = parse_time_to_minutes('   ')
-        self.assertIsNone(result)
-
-    def test_parse_time_minutes_format(self):
-        """parse_time_to_minutes should parse '25 minutes' correctly."""
-        result = parse_time_to_minutes('25 minutes')
-        self.assertEqual(result, 25)
-
-    def test_parse_time_minutes_format_with_uppercase(self):
-        """parse_time_to_minutes should handle uppercase input."""
-        result = parse_time_to_minutes('30 MINUTES')
-        self.assertEqual(result, 30)
-
-    def test_parse_time_minutes_format_with_whitespace(self):
-        """parse_time_to_minutes should handle leading/trailing whitespace."""
-        result = parse_time_to_minutes('  15 minutes  ')
-        self.assertEqual(result, 15)
-
-    def test_parse_time_hours_format(self):
-        """parse_time_to_minutes should parse '2 hours' correctly."""
-        result = parse_time_to_minutes('2 hours')
-        self.assertEqual(result, 120)
-
-    def test_parse_time_one_hour_format(self):
-        """parse_time_to_minutes should parse '1 hours' correctly."""
-        result = parse_time_to_minutes('1 hours')
-        self.assertEqual(result, 60)
-
-    def test_parse_time_hours_and_minutes_format(self):
-        """parse_time_to_minutes should parse '1 hours 30 minutes' correctly."""
-        result = parse_time_to_minutes('1 hours 30 minutes')
-        self.assertEqual(result, 90)
-
-    def test_parse_time_hours_and_minutes_large_value(self):
-        """parse_time_to_minutes should parse '2 hours 45 minutes' correctly."""
-        result = parse_time_to_minutes('2 hours 45 minutes')
-        self.assertEqual(result, 165)
-
-    def test_parse_time_invalid_format_returns_none(self):
-        """parse_time_to_minutes should return None for invalid format."""
-        result = parse_time_to_minutes('about 30 mins')
-        self.assertIsNone(result)
-
-    def test_parse_time_single_word_returns_none(self):
-        """parse_time_to_minutes should return None for single word input."""
-        result = parse_time_to_minutes('quick')
-        self.assertIsNone(result)
-
-    def test_parse_time_three_words_returns_none(self):
-        """parse_time_to_minutes should return None for three word input."""
-        result = parse_time_to_minutes('30 min total')
-        self.assertIsNone(result)
-
-    def test_parse_time_wrong_unit_returns_none(self):
-        """parse_time_to_minutes should return None for wrong unit."""
-        result = parse_time_to_minutes('30 seconds')
-        self.assertIsNone(result)
-
-    def test_parse_time_mixed_case_hours_minutes(self):
-        """parse_time_to_minutes should handle mixed case for hours and minutes."""
-        result = parse_time_to_minutes('1 HOURS 30 MINUTES')
-        self.assertEqual(result, 90)
 
 
 class RecipesViewTestCase(TestCase):
@@ -149,6 +71,22 @@ class RecipesViewTestCase(TestCase):
             created_by=self.user,
         )
 
+    def test_base_recipes_are_hidden(self):
+        """Test that recipes marked as base recipes don't appear on the browse page."""
+        base = Recipe.objects.create(
+            name="Caesar Salad", total_time="15 minutes", ingredients="lettuce", method="Toss.", source=Recipe.Source.BASE,
+        )
+        response = self.client.get(self.url)
+        self.assertNotIn(base.id, [r.id for r in response.context['page_obj']])
+
+    def test_user_recipe_sharing_a_base_recipe_name_is_shown(self):
+        """Test that a user's recipe is listed even if it has the same name as a base recipe."""
+        recipe = Recipe.objects.create(
+            name="Caesar Salad", total_time="15 minutes", ingredients="lettuce", method="Toss.", created_by=self.user,
+        )
+        response = self.client.get(self.url)
+        self.assertIn(recipe.id, [r.id for r in response.context['page_obj']])
+
     def test_recipes_url(self):
         """Test that the recipes URL is correct."""
         self.assertEqual(self.url, '/recipes/')
@@ -296,6 +234,24 @@ class RecipesSearchTestCase(TestCase):
         page_obj = response.context['page_obj']
         self.assertGreaterEqual(len(list(page_obj)), 1)
 
+    def test_search_ranks_name_matches_first(self):
+        """Test that a recipe named after the query comes before one that only mentions it."""
+        response = self.client.get(self.url, {'q': 'chicken'})
+        names = [r.name for r in response.context['page_obj']]
+        self.assertEqual(names[0], 'Spicy Chicken Tikka')
+
+    def test_search_results_have_highlighted_snippets(self):
+        """Test that search results show the matched words highlighted."""
+        response = self.client.get(self.url, {'q': 'dill'})
+        recipe = response.context['page_obj'][0]
+        self.assertIn('<mark>dill</mark>', recipe.search_snippet)
+        self.assertContains(response, '<mark>dill</mark>', html=False)
+
+    def test_search_with_only_punctuation_returns_empty(self):
+        """Test that a query with no words matches nothing instead of erroring."""
+        response = self.client.get(self.url, {'q': '?!'})
+        self.assertEqual(len(list(response.context['page_obj'])), 0)
+
     def test_search_with_empty_query_returns_all(self):
         """Test empty search query returns all recipes."""
         response = self.client.get(self.url, {'q': ''})
@@ -484,6 +440,14 @@ class RecipesPaginationTestCase(TestCase):
         page_obj = response.context['page_obj']
         self.assertEqual(len(list(page_obj)), 4)
 
+    def test_quick_meals_paginates_in_the_database(self):
+        """Test that quick-meals pages are sliced by SQL rather than by loading every recipe."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'sort_by': 'quick-meals', 'page': 2})
+        self.assertEqual(len(list(response.context['page_obj'])), 4)
+        recipe_selects = [q['sql'] for q in queries.captured_queries if 'FROM "recipes_recipe"' in q['sql'] and 'COUNT(' not in q['sql']]
+        self.assertTrue(all('LIMIT' in sql for sql in recipe_selects))
+
     def test_page_obj_has_correct_page_number(self):
         """Test that page_obj has correct page number."""
         response = self.client.get(self.url, {'page': 2})
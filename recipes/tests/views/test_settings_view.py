@@ -2,6 +2,8 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib import messages
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 import json
 from recipes.models import User, Profile
 from recipes.forms import SettingsForm
@@ -42,6 +44,17 @@ class SettingsViewTestCase(TestCase):
         self.assertIn('settings_form', response.context)
         self.assertTrue(isinstance(response.context['settings_form'], SettingsForm))
 
+    def test_get_settings_reads_profile_with_user(self):
+        """Test that the settings page reuses the profile loaded with the user."""
+        self.client.login(username=self.user.username, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        profile_reads = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT') and 'FROM "recipes_profile"' in query['sql']
+        ]
+        self.assertEqual(profile_reads, [])
+
     def test_settings_creates_profile_if_not_exists(self):
         """Test that settings view creates profile if it doesn't exist."""
         Profile.objects.filter(user=self.user).delete()
@@ -3,7 +3,7 @@ from django.contrib.auth.hashers import check_password
 from django.test import TestCase
 from django.urls import reverse
 from recipes.forms import SignUpForm
-from recipes.models import User
+from recipes.models import User, Profile
 from recipes.tests.helpers import LogInTester
 
 
@@ -78,6 +78,13 @@ class SignUpViewTestCase(TestCase, LogInTester):
         # User is not logged in after signup (they need to log in)
         self.assertFalse(self._is_logged_in())
 
+    def test_sign_up_creates_profile(self):
+        """Test that signing up creates the new user's profile with the default goals."""
+        self.client.post(self.url, self.form_input)
+        profile = Profile.objects.get(user__username='@janedoe')
+        self.assertEqual(profile.calorie_goal, 2000)
+        self.assertEqual(profile.fasting_goal, 16)
+
     def test_post_sign_up_redirects_when_logged_in(self):
         """Test that logged in users posting to sign up are redirected."""
         self.client.login(username=self.user.username, password="Password123")
@@ -1,12 +1,18 @@
 """Tests for the social feed views."""
 import json
+from datetime import timedelta
 from io import BytesIO
 from PIL import Image
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from recipes.models import User, Post, Like, Save, Comment, Rating, Follow, Tag
-from recipes.tests.helpers import reverse_with_next
+from recipes.services import TaskQueueService
+from recipes.tests.helpers import TemporaryMediaMixin, create_image_upload, reverse_with_next
+from recipes.views.social_feed import FEED_PAGE_SIZE, COMMENT_PREVIEW_SIZE, COMMENT_PAGE_SIZE, SAVED_SIDEBAR_SIZE
 
 
 def create_test_image():
@@ -103,6 +109,15 @@ class FeedViewTestCase(TestCase):
         for post in posts:
             self.assertTrue(hasattr(post, 'is_liked_by_user'))
 
+    def test_feed_does_not_count_interactions(self):
+        """Test that rendering the feed issues no COUNT queries."""
+        Like.objects.create(user=self.user, post=self.post1)
+        Comment.objects.create(user=self.user, post=self.post1, text="Hi")
+        self.client.login(username=self.user.username, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in queries.captured_queries))
+
     def test_posts_have_is_saved_attribute(self):
         """Test that posts have is_saved_by_user attribute."""
         self.client.login(username=self.user.username, password='Password123')
@@ -111,6 +126,53 @@ class FeedViewTestCase(TestCase):
         for post in posts:
             self.assertTrue(hasattr(post, 'is_saved_by_user'))
 
+    def test_feed_query_count_does_not_grow_with_interactions(self):
+        """Test that viewer state is annotated rather than fetched per post or per table."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.url)
+
+        Follow.objects.create(follower=self.user, followed=self.other_user)
+        for i in range(5):
+            post = Post.objects.create(author=self.other_user, title=f"Extra {i}")
+            Like.objects.create(user=self.user, post=post)
+            Save.objects.create(user=self.user, post=post)
+            Rating.objects.create(user=self.user, post=post, score=3)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(queries), len(baseline))
+        saved = response.context['saved_posts']
+        self.assertTrue(all(p.is_saved_by_user and p.is_followed_by_user for p in saved))
+
+
+class FeedImageRenditionTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for the responsive images on feed cards."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.post = Post.objects.create(author=self.user, title="Post", image=create_image_upload(1600, 900))
+        self.client.login(username=self.user.username, password='Password123')
+
+    def test_feed_card_shows_placeholder_while_processing(self):
+        """Test that a post's upload isn't served until its renditions are ready."""
+        response = self.client.get(reverse('feed'))
+        self.assertContains(response, 'text=Processing+image')
+        self.assertNotContains(response, f'src="{self.post.image.url}"')
+
+    def test_feed_card_has_srcset(self):
+        """Test that a feed card offers the browser the image's renditions."""
+        TaskQueueService().run_pending()
+        self.post.refresh_from_db()
+        response = self.client.get(reverse('feed'))
+        self.assertContains(response, f'srcset="{self.post.image.srcset}"')
+        self.assertContains(response, self.post.image.rendition_url(320))
+        self.assertContains(response, 'sizes="(max-width: 576px) 100vw, 576px"')
+
 
 class ToggleLikeViewTestCase(TestCase):
     """Tests for toggle_like view."""
@@ -171,6 +233,16 @@ class ToggleLikeViewTestCase(TestCase):
         self.assertEqual(data['likes_count'], 0)
         self.assertFalse(Like.objects.filter(user=self.user, post=self.post).exists())
 
+    def test_toggle_like_updates_like_count(self):
+        """Test that toggle_like keeps the stored like_count in step."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.post(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.client.post(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
     def test_toggle_like_nonexistent_post_returns_404(self):
         """Test that toggle_like on nonexistent post returns 404."""
         self.client.login(username=self.user.username, password='Password123')
@@ -241,6 +313,16 @@ class ToggleSaveViewTestCase(TestCase):
         self.assertFalse(data['saved'])
         self.assertFalse(Save.objects.filter(user=self.user, post=self.post).exists())
 
+    def test_toggle_save_updates_save_count(self):
+        """Test that toggle_save keeps the stored save_count in step."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.post(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.save_count, 1)
+        self.client.post(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.save_count, 0)
+
     def test_toggle_save_nonexistent_post_returns_404(self):
         """Test that toggle_save on nonexistent post returns 404."""
         self.client.login(username=self.user.username, password='Password123')
@@ -292,6 +374,16 @@ class SubmitRatingViewTestCase(TestCase):
         self.assertEqual(data['score'], 5)
         self.assertTrue(Rating.objects.filter(user=self.user, post=self.post).exists())
 
+    def test_submit_rating_updates_ranking_score(self):
+        """Test that submit_rating recomputes the stored ranking score."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.post(self.url, {'score': 5}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.ranking_score, Post.compute_ranking_score(5, 1))
+        self.client.post(self.url, {'score': 1}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.ranking_score, Post.compute_ranking_score(1, 1))
+
     def test_submit_rating_updates_existing_rating(self):
         """Test that submit_rating updates existing rating."""
         self.client.login(username=self.user.username, password='Password123')
@@ -381,6 +473,19 @@ class SubmitCommentViewTestCase(TestCase):
         self.assertIn('comment_html', data)
         self.assertTrue(Comment.objects.filter(user=self.user, post=self.post).exists())
 
+    def test_submit_comment_updates_comment_count(self):
+        """Test that submit_comment increments the stored comment_count."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.post(
+            self.url,
+            {'text': 'Test comment'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        data = json.loads(response.content)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(data['comments_count'], 1)
+
     def test_submit_comment_empty_text(self):
         """Test that submit_comment rejects empty text."""
         self.client.login(username=self.user.username, password='Password123')
@@ -485,7 +590,7 @@ class ToggleFollowViewTestCase(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
-class CreatePostViewTestCase(TestCase):
+class CreatePostViewTestCase(TemporaryMediaMixin, TestCase):
     """Tests for create_post view."""
 
     fixtures = [
@@ -494,6 +599,7 @@ class CreatePostViewTestCase(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        super().setUp()
         self.user = User.objects.get(username='@johndoe')
         self.url = reverse('create_post')
 
@@ -655,6 +761,16 @@ class PostDetailViewTestCase(TestCase):
         self.assertFalse(post.is_followed_by_user)
         self.assertEqual(post.user_rating_score, 0)
 
+    def test_post_detail_reads_viewer_state_in_one_query(self):
+        """Test that the like, save, rating and follow state come from the post query itself."""
+        self.client.login(username=self.user.username, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        state_queries = [q['sql'] for q in queries.captured_queries if '"recipes_like"' in q['sql']]
+        self.assertEqual(len(state_queries), 1)
+        for table in ('"recipes_save"', '"recipes_rating"', '"recipes_follow"'):
+            self.assertIn(table, state_queries[0])
+
     def test_nonexistent_post_returns_404(self):
         """Test that nonexistent post returns 404."""
         self.client.login(username=self.user.username, password='Password123')
@@ -694,6 +810,9 @@ class FeedFiltersAndSortingTestCase(TestCase):
         )
         Rating.objects.create(user=self.user, post=self.post2, score=5)
         Rating.objects.create(user=self.other_user, post=self.post2, score=4)
+        Post.objects.filter(pk=self.post2.pk).update(
+            rating_total_score=9, rating_count=2, ranking_score=Post.compute_ranking_score(9, 2)
+        )
 
     def test_feed_sorted_by_newest(self):
         """Test that feed sorts by newest by default."""
@@ -713,6 +832,18 @@ class FeedFiltersAndSortingTestCase(TestCase):
         # post2 has ratings, post1 doesn't
         self.assertEqual(posts[0].id, self.post2.id)
 
+    def test_feed_top_rated_damps_single_votes(self):
+        """Test that one 5-star vote ranks below many high votes."""
+        lucky = Post.objects.create(author=self.other_user, title="Lucky", rating_total_score=5, rating_count=1,
+                                    ranking_score=Post.compute_ranking_score(5, 1))
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url, {'sort': 'top_rated'})
+        posts = list(response.context['posts'])
+        self.assertLess(
+            [p.id for p in posts].index(self.post2.id),
+            [p.id for p in posts].index(lucky.id)
+        )
+
     def test_feed_filter_by_cuisine(self):
         """Test that feed filters by cuisine."""
         self.client.login(username=self.user.username, password='Password123')
@@ -837,7 +968,7 @@ class SubmitRatingViewAdditionalTestCase(TestCase):
         self.assertEqual(rating.score, 5)
 
 
-class EditPostViewTestCase(TestCase):
+class EditPostViewTestCase(TemporaryMediaMixin, TestCase):
     """Tests for edit_post view."""
 
     fixtures = [
@@ -847,6 +978,7 @@ class EditPostViewTestCase(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        super().setUp()
         self.user = User.objects.get(username='@johndoe')
         self.other_user = User.objects.get(username='@janedoe')
         self.post = Post.objects.create(
@@ -988,7 +1120,7 @@ class DeletePostViewLoginRequiredTestCase(TestCase):
         self.assertEqual(response.status_code, 302)
 
 
-class CreatePostWithTagsTestCase(TestCase):
+class CreatePostWithTagsTestCase(TemporaryMediaMixin, TestCase):
     """Test create_post with various form configurations."""
 
     fixtures = [
@@ -997,6 +1129,7 @@ class CreatePostWithTagsTestCase(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        super().setUp()
         self.user = User.objects.get(username='@johndoe')
         self.url = reverse('create_post')
         # Create some tags
@@ -1082,6 +1215,20 @@ class FeedContextDataTestCase(TestCase):
         self.assertEqual(response.context['current_cuisine'], 'Italian')
         self.assertEqual(response.context['current_tag'], 'quick')
 
+    def test_saved_sidebar_is_limited_to_most_recent_saves(self):
+        """Test that the saved sidebar only holds the most recently saved posts."""
+        now = timezone.now()
+        posts = [
+            Post.objects.create(author=self.user, title=f"Saved {i}", caption="Saved post.")
+            for i in range(SAVED_SIDEBAR_SIZE + 1)
+        ]
+        for i, post in enumerate(posts):
+            save = Save.objects.create(user=self.user, post=post)
+            Save.objects.filter(id=save.id).update(created_at=now - timedelta(minutes=i))
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['saved_posts'], posts[:SAVED_SIDEBAR_SIZE])
+
 
 class ToggleLikeMultipleInteractionsTestCase(TestCase):
     """Test toggle_like with multiple likes."""
@@ -1162,4 +1309,253 @@ class FeedRedirectsUnauthenticatedTestCase(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 302)
         # Should redirect to login page
-        self.assertIn('/login/', response.url)
\ No newline at end of file
+        self.assertIn('/login/', response.url)
+
+class FeedPaginationTestCase(TestCase):
+    """Tests for keyset pagination of the feed."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.url = reverse('feed')
+        self.page_url = reverse('feed_page')
+        self.posts = [
+            Post.objects.create(author=self.other_user, title=f"Post {i}", caption="Paged post.")
+            for i in range(FEED_PAGE_SIZE + 3)
+        ]
+        self.client.login(username=self.user.username, password='Password123')
+
+    def test_feed_page_url(self):
+        """Test that feed_page URL is correct."""
+        self.assertEqual(self.page_url, '/feed/more/')
+
+    def test_first_page_is_limited(self):
+        """Test that the first paint only renders one page of posts."""
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['posts']), FEED_PAGE_SIZE)
+        self.assertIsNotNone(response.context['next_cursor'])
+
+    def test_no_cursor_when_everything_fits(self):
+        """Test that next_cursor is None when there is only one page."""
+        Post.objects.filter(id__in=[p.id for p in self.posts[:5]]).delete()
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_feed_page_returns_remaining_posts(self):
+        """Test that following the cursor returns the rest of the feed without overlap."""
+        first_page = self.client.get(self.url)
+        cursor = first_page.context['next_cursor']
+        response = self.client.get(
+            self.page_url, {'cursor': cursor},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertIsNone(data['next_cursor'])
+        for post in self.posts[:3]:
+            self.assertIn(f'id="post-{post.id}"', data['html'])
+        for post in first_page.context['posts']:
+            self.assertNotIn(f'id="post-{post.id}"', data['html'])
+
+    def test_feed_page_top_rated_continues_ordering(self):
+        """Test that top_rated pages continue after the ranking score in the cursor."""
+        for score, post in zip([5, 5, 4], self.posts[:3]):
+            self.client.post(
+                reverse('submit_rating', kwargs={'post_id': post.id}), {'score': score},
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+            )
+        first_page = self.client.get(self.url, {'sort': 'top_rated'})
+        first_ids = [p.id for p in first_page.context['posts']]
+        self.assertEqual(first_ids[:3], [self.posts[1].id, self.posts[0].id, self.posts[2].id])
+        response = self.client.get(
+            self.page_url, {'sort': 'top_rated', 'cursor': first_page.context['next_cursor']},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        data = json.loads(response.content)
+        for post_id in first_ids:
+            self.assertNotIn(f'id="post-{post_id}"', data['html'])
+        self.assertEqual(data['html'].count('id="post-'), 3)
+
+    def test_feed_page_requires_ajax(self):
+        """Test that feed_page requires an AJAX request."""
+        cursor = self.client.get(self.url).context['next_cursor']
+        response = self.client.get(self.page_url, {'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_feed_page_rejects_invalid_cursor(self):
+        """Test that feed_page rejects a malformed cursor."""
+        response = self.client.get(
+            self.page_url, {'cursor': 'not-a-cursor'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class FollowedTimelineTestCase(TemporaryMediaMixin, TestCase):
+    """Tests for the fan-out timeline behind the followed-only feed."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.third_user = User.objects.get(username='@petrapickles')
+        self.url = reverse('feed')
+        self.client.login(username=self.user.username, password='Password123')
+
+    def follow(self, author):
+        return self.client.post(
+            reverse('toggle_follow', kwargs={'author_id': author.id}),
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+    def followed_feed_ids(self, **params):
+        response = self.client.get(self.url, {'followed': 'true', **params})
+        return [p.id for p in response.context['posts']]
+
+    def test_create_post_appears_in_own_followed_feed(self):
+        """Test that create_post fans the post out to the author's timeline."""
+        self.client.post(reverse('create_post'), {
+            'title': 'Fresh Post',
+            'caption': 'Just cooked',
+            'image': create_test_image(),
+            'servings': 2,
+            'difficulty': 'Easy',
+        })
+        post = Post.objects.get(title='Fresh Post')
+        self.assertEqual(self.followed_feed_ids(), [post.id])
+
+    def test_follow_backfills_followed_feed(self):
+        """Test that following an author shows their existing posts."""
+        post = Post.objects.create(author=self.other_user, title="Earlier Post")
+        Post.objects.create(author=self.third_user, title="Stranger Post")
+        self.follow(self.other_user)
+        self.assertEqual(self.followed_feed_ids(), [post.id])
+
+    def test_unfollow_removes_posts_from_followed_feed(self):
+        """Test that unfollowing an author removes their posts."""
+        Post.objects.create(author=self.other_user, title="Earlier Post")
+        self.follow(self.other_user)
+        self.follow(self.other_user)
+        self.assertEqual(self.followed_feed_ids(), [])
+
+    def test_followed_feed_pages_through_timeline(self):
+        """Test that the followed-only feed pages with a cursor."""
+        posts = [Post.objects.create(author=self.other_user, title=f"Post {i}") for i in range(FEED_PAGE_SIZE + 2)]
+        self.follow(self.other_user)
+        first_page = self.client.get(self.url, {'followed': 'true'})
+        self.assertEqual(len(first_page.context['posts']), FEED_PAGE_SIZE)
+        response = self.client.get(
+            reverse('feed_page'),
+            {'followed': 'true', 'cursor': first_page.context['next_cursor']},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        data = json.loads(response.content)
+        self.assertIsNone(data['next_cursor'])
+        for post in posts[:2]:
+            self.assertIn(f'id="post-{post.id}"', data['html'])
+
+    def test_followed_feed_top_rated(self):
+        """Test that the followed-only feed can be sorted by rating."""
+        rated = Post.objects.create(author=self.other_user, title="Rated")
+        unrated = Post.objects.create(author=self.other_user, title="Unrated")
+        self.client.post(
+            reverse('submit_rating', kwargs={'post_id': rated.id}), {'score': 5},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.follow(self.other_user)
+        self.assertEqual(self.followed_feed_ids(sort='top_rated'), [rated.id, unrated.id])
+
+
+class CommentPreviewTestCase(TestCase):
+    """Tests for comment previews in the feed and the paginated comments endpoint."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        """Set up a post with more comments than one preview and one page hold."""
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.post = Post.objects.create(author=self.other_user, title="Busy Post")
+        self.comments = [
+            Comment.objects.create(user=self.other_user, post=self.post, text=f"Comment {i}")
+            for i in range(COMMENT_PAGE_SIZE + COMMENT_PREVIEW_SIZE + 2)
+        ]
+        Post.objects.filter(pk=self.post.pk).update(comment_count=len(self.comments))
+        self.url = reverse('post_comments', kwargs={'post_id': self.post.id})
+        self.client.login(username=self.user.username, password='Password123')
+
+    def get_comments(self, **params):
+        return self.client.get(self.url, params, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_post_comments_url(self):
+        """Test that post_comments URL is correct."""
+        self.assertEqual(self.url, f'/post/{self.post.id}/comments/')
+
+    def test_feed_embeds_only_latest_comments(self):
+        """Test that the feed prefetches only the newest comments of each post."""
+        response = self.client.get(reverse('feed'))
+        post = response.context['posts'][0]
+        self.assertEqual(
+            [c.id for c in post.preview_comments],
+            [c.id for c in reversed(self.comments[-COMMENT_PREVIEW_SIZE:])]
+        )
+        self.assertContains(response, 'data-action="load-comments"')
+        self.assertNotContains(response, 'Comment 0<')
+
+    def test_feed_hides_load_button_when_all_comments_shown(self):
+        """Test that the load button is omitted when the preview holds every comment."""
+        Comment.objects.exclude(id__in=[c.id for c in self.comments[:2]]).delete()
+        Post.objects.filter(pk=self.post.pk).update(comment_count=2)
+        response = self.client.get(reverse('feed'))
+        self.assertNotContains(response, 'data-action="load-comments"')
+
+    def test_post_comments_pages_older_comments(self):
+        """Test that comments before the anchor are returned a page at a time, oldest first."""
+        oldest_preview = self.comments[-COMMENT_PREVIEW_SIZE]
+        data = json.loads(self.get_comments(before=oldest_preview.id).content)
+        expected = self.comments[-COMMENT_PREVIEW_SIZE - COMMENT_PAGE_SIZE:-COMMENT_PREVIEW_SIZE]
+        self.assertEqual(data['html'].count('class="text-sm"'), COMMENT_PAGE_SIZE)
+        self.assertLess(data['html'].index(expected[0].text + '<'), data['html'].index(expected[-1].text + '<'))
+        self.assertEqual(data['next_before'], expected[0].id)
+
+        data = json.loads(self.get_comments(before=data['next_before']).content)
+        self.assertEqual(data['html'].count('class="text-sm"'), 2)
+        self.assertIsNone(data['next_before'])
+
+    def test_post_comments_without_anchor_returns_newest(self):
+        """Test that omitting before returns the newest page."""
+        data = json.loads(self.get_comments().content)
+        self.assertIn(self.comments[-1].text + '<', data['html'])
+
+    def test_post_comments_requires_ajax(self):
+        """Test that post_comments requires an AJAX request."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_comments_rejects_foreign_anchor(self):
+        """Test that an anchor from another post is rejected."""
+        other_post = Post.objects.create(author=self.user, title="Quiet Post")
+        other_comment = Comment.objects.create(user=self.user, post=other_post, text="Elsewhere")
+        response = self.get_comments(before=other_comment.id)
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_comments_nonexistent_post_returns_404(self):
+        """Test that post_comments on a nonexistent post returns 404."""
+        url = reverse('post_comments', kwargs={'post_id': 99999})
+        response = self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 404)
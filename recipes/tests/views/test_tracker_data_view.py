@@ -0,0 +1,94 @@
+"""Tests for the tracker export and import views."""
+from datetime import date
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import User, Meal
+from recipes.tests.helpers import reverse_with_next
+
+
+class TrackerDataViewTestCase(TestCase):
+    """Tests for the tracker export and import views."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.export_url = reverse('export_tracker_data')
+        self.import_url = reverse('import_tracker_data')
+        Meal.objects.create(
+            user=self.user, name="Soup", meal_type='Lunch', date=date.today(),
+            calories=400, protein_g=20.0, carbs_g=30.0, fat_g=10.0,
+        )
+
+    def test_tracker_data_urls(self):
+        """Test that the export and import URLs resolve correctly."""
+        self.assertEqual(self.export_url, '/tracker/export/')
+        self.assertEqual(self.import_url, '/tracker/import/')
+
+    def test_export_redirects_when_not_logged_in(self):
+        """Test that unauthenticated requests are redirected to login."""
+        response = self.client.get(self.export_url)
+        redirect_url = reverse_with_next('log_in', self.export_url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_export_jsonl_is_streamed_download(self):
+        """Test that the default export streams JSON Lines as an attachment."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.export_url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('foodle-tracker.jsonl', response['Content-Disposition'])
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('"dataset": "meals"', body)
+
+    def test_export_csv_of_one_dataset(self):
+        """Test that a CSV export holds the chosen dataset."""
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.export_url, {'format': 'csv', 'dataset': 'meals'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Soup', lines[1])
+
+    def test_export_rejects_unknown_format_or_dataset(self):
+        """Test that unknown formats and datasets are rejected."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.assertEqual(self.client.get(self.export_url, {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(self.export_url, {'format': 'csv', 'dataset': 'steps'}).status_code, 400)
+
+    def test_import_csv_upload(self):
+        """Test that an uploaded CSV is imported into the chosen dataset."""
+        self.client.login(username=self.user.username, password='Password123')
+        upload = SimpleUploadedFile(
+            'logs.csv',
+            b'\xef\xbb\xbfdate,amount_ml,water_goal,calorie_goal,protein_goal,carbs_goal,fat_goal\r\n'
+            b'2025-01-06,1500,2500,2000,150,200,60\r\n',
+        )
+        response = self.client.post(self.import_url, {'file': upload, 'dataset': 'daily_logs'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['imported']['daily_logs'], 1)
+        self.assertTrue(self.user.daily_logs.filter(date=date(2025, 1, 6), amount_ml=1500).exists())
+
+    def test_import_jsonl_upload_round_trips_export(self):
+        """Test that an exported file can be imported back without duplicating meals."""
+        self.client.login(username=self.user.username, password='Password123')
+        export = b''.join(self.client.get(self.export_url).streaming_content)
+        response = self.client.post(self.import_url, {'file': SimpleUploadedFile('tracker.jsonl', export)})
+        self.assertEqual(response.json()['imported']['skipped'], 1)
+        self.assertEqual(Meal.objects.count(), 1)
+
+    def test_import_reports_bad_line(self):
+        """Test that an invalid record is reported with its line number."""
+        self.client.login(username=self.user.username, password='Password123')
+        upload = SimpleUploadedFile('tracker.jsonl', b'{"dataset": "meals", "name": "Soup"}\n')
+        response = self.client.post(self.import_url, {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['line'], 1)
+
+    def test_import_requires_file_and_dataset(self):
+        """Test that a missing file or CSV dataset is rejected."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.assertEqual(self.client.post(self.import_url).status_code, 400)
+        upload = SimpleUploadedFile('meals.csv', b'date\n')
+        self.assertEqual(self.client.post(self.import_url, {'file': upload}).status_code, 400)
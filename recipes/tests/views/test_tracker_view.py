@@ -1,10 +1,14 @@
 """Tests for the tracker view."""
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from datetime import date, timedelta
 from recipes.models import User, Profile, DailyLog, FastingSession, Meal
+from recipes.services import UserStatsService
 from recipes.tests.helpers import reverse_with_next
+from recipes.views.tracker_view import get_accounting_date
 
 
 class TrackerViewTestCase(TestCase):
@@ -100,6 +104,46 @@ class TrackerViewTestCase(TestCase):
         daily_log = DailyLog.objects.get(user=self.user, date=date.today())
         self.assertEqual(daily_log.amount_ml, 0)
 
+    def test_first_water_of_the_day_copies_profile_goals(self):
+        """Test that the day's log is created from the profile goals on the first water entry."""
+        self.profile.calorie_goal = 1800
+        self.profile.save()
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.post(self.url, {'action': 'update_water', 'amount': 300})
+        daily_log = DailyLog.objects.get(user=self.user, date=get_accounting_date())
+        self.assertEqual(daily_log.amount_ml, 300)
+        self.assertEqual(daily_log.calorie_goal, 1800)
+
+    def test_update_water_is_a_single_update(self):
+        """Test that adding water to an existing log is one atomic UPDATE."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {'action': 'update_water', 'amount': 250})
+        log_queries = [q['sql'] for q in queries.captured_queries if '"recipes_dailylog"' in q['sql']]
+        self.assertEqual(len(log_queries), 1)
+        self.assertTrue(log_queries[0].startswith('UPDATE'))
+
+    def test_update_water_refreshes_profile_stats(self):
+        """Test that the cached water total is dropped when water is added in place."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.post(self.url, {'action': 'update_water', 'amount': 250})
+        self.assertEqual(UserStatsService(self.user).get_stats()['total_water_ml'], 250)
+        self.client.post(self.url, {'action': 'update_water', 'amount': 500})
+        self.assertEqual(UserStatsService(self.user).get_stats()['total_water_ml'], 750)
+
+    def test_tracker_query_count(self):
+        """Test that a tracker page load reads the profile with the user and each table once."""
+        Meal.objects.create(
+            user=self.user, name='Oats', meal_type='Breakfast', date=date.today(),
+            calories=300, protein_g=10, carbs_g=50, fat_g=5
+        )
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url)
+        # Session, user joined with profile, daily log, active fast and today's meals
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
     def test_update_goals(self):
         """Test updating daily goals."""
         self.client.login(username=self.user.username, password='Password123')
@@ -163,6 +207,14 @@ class TrackerViewTestCase(TestCase):
         self.assertFalse(session.is_active)
         self.assertIsNotNone(session.end_date_time)
 
+    def test_end_fast_refreshes_profile_stats(self):
+        """Test that ending a fast counts it in the cached profile stats."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.post(self.url, {'action': 'start_fast', 'target_duration': 16})
+        self.assertEqual(UserStatsService(self.user).get_stats()['completed_fasts'], 0)
+        self.client.post(self.url, {'action': 'end_fast'})
+        self.assertEqual(UserStatsService(self.user).get_stats()['completed_fasts'], 1)
+
     def test_update_fasting_goal(self):
         """Test updating fasting goal without starting a fast."""
         self.client.login(username=self.user.username, password='Password123')
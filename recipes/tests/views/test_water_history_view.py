@@ -1,4 +1,5 @@
 """Tests for the water history view."""
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -13,6 +14,7 @@ class WaterHistoryViewTestCase(TestCase):
     fixtures = ['recipes/tests/fixtures/default_user.json']
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.get(username='@johndoe')
         self.url = reverse('water_history')
         # Create some water intake records
@@ -11,6 +11,8 @@ from .tracker_view import *
 from .water_history_view import *
 from .nutrition_history_view import *
 from .fasting_history_view import *
+from .history_api_view import *
+from .tracker_data_view import *
 from .welcome_view import *
 from .social_feed import *
 from .add_meal_view import *
@@ -19,3 +21,4 @@ from .my_recipes_view import *
 from .add_recipe_view import *
 from .recipe_detail_view import *
 from .edit_recipe_view import *
+from .media_view import *
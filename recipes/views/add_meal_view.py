@@ -1,9 +1,16 @@
+import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from datetime import date
 from recipes.models import Meal
 from recipes.forms.meal_form import MealForm
+from recipes.services import MealLogService
+
+#Most meals a single batch request may log
+MAX_MEALS_PER_BATCH = 100
 
 
 @login_required
@@ -27,6 +34,50 @@ def add_meal(request):
     return render(request, 'recipes/add_meal.html', {'form': form})
 
 
+@login_required
+@require_POST
+def log_meals(request):
+    """
+    Log a batch of meals sent as JSON: {"meals": [{"name": ..., "meal_type": ..., ...}]}.
+
+    Every meal is validated with MealForm before any is saved, and all of them
+    are written in one transaction. Responds with the new meal ids and the
+    updated consumed totals of each day the batch touched.
+    """
+    try:
+        entries = json.loads(request.body).get('meals')
+    except (ValueError, AttributeError):
+        return JsonResponse({'error': 'Request body must be a JSON object'}, status=400)
+    if not isinstance(entries, list) or not entries:
+        return JsonResponse({'error': 'meals must be a non-empty list'}, status=400)
+    if len(entries) > MAX_MEALS_PER_BATCH:
+        return JsonResponse({'error': f'At most {MAX_MEALS_PER_BATCH} meals can be logged at once'}, status=400)
+
+    meals = []
+    errors = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            message = {'message': 'Each meal must be an object', 'code': 'invalid'}
+            errors.append({'index': index, 'errors': {'__all__': [message]}})
+            continue
+        # Use today if no date provided
+        form = MealForm({'date': date.today(), **entry})
+        if form.is_valid():
+            meals.append(form.save(commit=False))
+        else:
+            errors.append({'index': index, 'errors': form.errors.get_json_data()})
+    if errors:
+        return JsonResponse({'errors': errors}, status=400)
+
+    service = MealLogService()
+    meals = service.log_meals(request.user, meals)
+    return JsonResponse({
+        'created': len(meals),
+        'meal_ids': [meal.id for meal in meals],
+        'daily_totals': service.daily_totals(request.user, [meal.date for meal in meals]),
+    }, status=201)
+
+
 @login_required
 def delete_meal(request, meal_id):
     """View to delete a meal. Only allows users to delete their own meals."""
@@ -1,12 +1,29 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from collections import defaultdict
 from recipes.models import FastingSession
-from django.db.models import Avg
+from recipes.services.time_series_service import bucket_ranges, bucket_start
 import calendar
 from django.utils.dateparse import parse_datetime
 
+
+def _sessions_started_between(user, start_date, end_date):
+    """
+    Fetch the user's sessions that started on a local date in the range, oldest first.
+
+    Bounding start_date_time by local midnights, rather than filtering on its
+    date, lets the query seek the (user, start) index.
+    """
+    tz = timezone.get_current_timezone()
+    return list(FastingSession.objects.filter(
+        user=user,
+        start_date_time__gte=timezone.make_aware(datetime.combine(start_date, time.min), tz),
+        start_date_time__lt=timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz),
+    ).order_by('start_date_time'))
+
+
 @login_required
 def fasting_history(request):
     """
@@ -42,7 +59,7 @@ def fasting_history(request):
 
     today = timezone.localdate()
     #Get user's current goal to show as a baseline reference in charts
-    user_goal = request.user.profile.fasting_goal
+    user_goal = request.profile.fasting_goal
     
     chart_labels = []
     chart_data = [] #Actual duration
@@ -70,56 +87,26 @@ def fasting_history(request):
         
         show_next = end_date < today
         
-        #Filter by start_date_time range
-        sessions = FastingSession.objects.filter(
-            user=request.user,
-            start_date_time__date__range=[start_date, end_date],
-
-            
-        ).order_by('start_date_time')
+        sessions = _sessions_started_between(request.user, start_date, end_date)
 
-        #Map sessions to weeks
-        current_week_start = start_date
-        
-        while current_week_start <= end_date:
-            days_until_sunday = 6 - current_week_start.weekday()
+        #Group the sessions by week in one pass. Completed fasts are charted, as is the
+        #month's latest session even while it is still running.
+        last_session = sessions[-1] if sessions else None
+        hours_by_week = defaultdict(list)
+        for s in sessions:
+            if s.duration and (not s.is_active or s == last_session):
+                week_start = bucket_start(timezone.localdate(s.start_date_time), 'week')
+                hours_by_week[week_start].append(s.duration.total_seconds() / 3600)
 
-            current_week_end = min(current_week_start + timedelta(days=days_until_sunday), end_date)
+        #Weeks are clipped to the month
+        for week_start, week_end in bucket_ranges(start_date, end_date, 'week'):
+            week_hours = hours_by_week.get(bucket_start(week_start, 'week'), [])
+            avg_hours = round(sum(week_hours) / len(week_hours), 1) if week_hours else 0
             
-            #Find sessions starting in this week
-            last_session = sessions.last()
-            week_sessions = [s for s in sessions if current_week_start <= timezone.localdate(s.start_date_time) <= current_week_end and (not s.is_active or s == last_session)]
-            
-            #Calculate average duration
-            total_hours = 0
-            count = 0
-            for s in week_sessions:
-                if s.duration:
-                    total_hours += s.duration.total_seconds() / 3600
-                    count += 1
-            
-            avg_hours = round(total_hours / count, 1) if count > 0 else 0
-            
-            label = f"{current_week_start.strftime('%b %d')} - {current_week_end.strftime('%d')}"
+            label = f"{week_start.strftime('%b %d')} - {week_end.strftime('%d')}"
             chart_labels.append(label)
             chart_data.append(avg_hours)
             chart_goal_data.append(user_goal) 
-            
-            current_week_start = current_week_end + timedelta(days=1)
-
-        #For the table, pass all sessions in reverse order
-        for s in reversed(sessions):
-             duration_hours = s.duration.total_seconds() / 3600 if s.duration else 0
-             table_data.append({
-                'id': s.id,
-                'date': timezone.localdate(s.start_date_time),
-                'start_time': s.start_date_time,
-                'end_time': s.end_date_time,
-                'duration_str': f"{int(duration_hours)}h {int((duration_hours % 1) * 60)}m",
-                'goal': s.target_duration,
-                'met_goal': duration_hours >= s.target_duration,
-                'is_active': s.is_active
-            })
 
     else:
         # --- Weekly Logic for daily data ---
@@ -129,19 +116,13 @@ def fasting_history(request):
         
         show_next = end_date < today
         
-        sessions = FastingSession.objects.filter(
-            user=request.user,
-            start_date_time__date__range=[start_date, end_date],
-        ).order_by('start_date_time')
+        sessions = _sessions_started_between(request.user, start_date, end_date)
         
-        session_map = {}
+        session_map = defaultdict(list)
         for s in sessions:
             #Only chart completed sessions
             if not s.is_active:
-                day = timezone.localdate(s.start_date_time)
-                if day not in session_map:
-                    session_map[day] = []
-                session_map[day].append(s)
+                session_map[timezone.localdate(s.start_date_time)].append(s)
             
         for i in range(7):
             current_day = start_date + timedelta(days=i)
@@ -152,8 +133,6 @@ def fasting_history(request):
             goal_for_max = user_goal
             
             if day_sessions:
-
-
                 #Find longest fast
                 longest_session = max(day_sessions, key=lambda x: x.duration.total_seconds() if x.duration else 0)
                 if longest_session.duration:
@@ -163,20 +142,20 @@ def fasting_history(request):
             chart_labels.append(current_day.strftime('%a %d'))
             chart_data.append(max_duration)
             chart_goal_data.append(goal_for_max)
-        
-        #Table Data (All sessions in this week)
-        for s in reversed(sessions):
-            duration_hours = s.duration.total_seconds() / 3600 if s.duration else 0
-            table_data.append({
-                'id': s.id,
-                'date': timezone.localdate(s.start_date_time),
-                'start_time': s.start_date_time,
-                'end_time': s.end_date_time,
-                'duration_str': f"{int(duration_hours)}h {int((duration_hours % 1) * 60)}m",
-                'goal': s.target_duration,
-                'met_goal': duration_hours >= s.target_duration,
-                'is_active': s.is_active
-            })
+
+    #Table Data (All sessions in the period, newest first)
+    for s in reversed(sessions):
+        duration_hours = s.duration.total_seconds() / 3600 if s.duration else 0
+        table_data.append({
+            'id': s.id,
+            'date': timezone.localdate(s.start_date_time),
+            'start_time': s.start_date_time,
+            'end_time': s.end_date_time,
+            'duration_str': f"{int(duration_hours)}h {int((duration_hours % 1) * 60)}m",
+            'goal': s.target_duration,
+            'met_goal': duration_hours >= s.target_duration,
+            'is_active': s.is_active
+        })
 
     context = {
         'view_type': view_type,
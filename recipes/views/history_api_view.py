@@ -0,0 +1,50 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+from datetime import date, timedelta
+from recipes.services import TimeSeriesService
+from recipes.services.time_series_service import BUCKETS
+
+#Longest range a single request may cover, so one response stays small
+MAX_RANGE_DAYS = 366
+
+
+@login_required
+@require_GET
+def history_api(request, metric):
+    """
+    Return a tracker metric bucketed by day, week or month as JSON.
+
+    Query parameters are from and to (ISO dates, inclusive) and bucket. The
+    range defaults to the last seven days, bucketed by day.
+    """
+    if metric not in TimeSeriesService.METRICS:
+        raise Http404("Unknown metric")
+
+    try:
+        end = date.fromisoformat(request.GET['to']) if request.GET.get('to') else timezone.localdate()
+        start = date.fromisoformat(request.GET['from']) if request.GET.get('from') else end - timedelta(days=6)
+    except ValueError:
+        return JsonResponse({'error': 'Dates must be in YYYY-MM-DD format'}, status=400)
+
+    bucket = request.GET.get('bucket', 'day')
+    if bucket not in BUCKETS:
+        return JsonResponse({'error': f"Bucket must be one of: {', '.join(BUCKETS)}"}, status=400)
+    if start > end:
+        return JsonResponse({'error': 'from must not be after to'}, status=400)
+    if (end - start).days >= MAX_RANGE_DAYS:
+        return JsonResponse({'error': f'Range must not exceed {MAX_RANGE_DAYS} days'}, status=400)
+
+    points = TimeSeriesService(request.user).series(metric, start, end, bucket)
+    response = JsonResponse({
+        'metric': metric,
+        'bucket': bucket,
+        'from': start,
+        'to': end,
+        'points': points,
+    })
+    #Let the browser reuse a period it has already paged through
+    patch_cache_control(response, private=True, max_age=60)
+    return response
@@ -0,0 +1,14 @@
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+from recipes.storage import ContentAddressedStorage
+
+#A content-addressed name never changes content, so browsers may keep it for a year
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """Serve an uploaded file in development, marking content-addressed files as immutable."""
+    response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    if ContentAddressedStorage.is_content_addressed(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return response
@@ -1,38 +1,10 @@
-import re
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
 from recipes.models import Recipe, User
-from django.db.models import Q
+from recipes.services import RecipeSearchService
 from django.contrib import messages
-
-
-def parse_total_time_to_minutes(total_time_str: str) -> int:
-    if not total_time_str:
-        return 0
-
-    s = total_time_str.lower()
-
-    hours = 0
-    minutes = 0
-
-    # Look for hours
-    match_hours = re.search(r'(\d+)\s*hour', s)
-    if match_hours:
-        hours = int(match_hours.group(1))
-
-    # Look for minutes
-    match_minutes = re.search(r'(\d+)\s*min', s)
-    if match_minutes:
-        minutes = int(match_minutes.group(1))
-
-    # If we didn't find explicit 'hour' or 'min', just grab the first number as minutes
-    if hours == 0 and minutes == 0:
-        match_any = re.search(r'(\d+)', s)
-        if match_any:
-            minutes = int(match_any.group(1))
-
-    return hours * 60 + minutes
+from django.db.models import F
 
 
 @login_required
@@ -43,26 +15,23 @@ def my_recipes(request):
     sort_by = request.GET.get('sort_by', 'name')  # Default to alphabetical sorting by name
     letter_filter = request.GET.get('letter', '')  # Get the letter filter from the query params
     search_query = request.GET.get('q', '').strip()
+    search = RecipeSearchService()
 
     recipes_qs = Recipe.objects.filter(created_by=user)
 
     if search_query:
-        recipes_qs = recipes_qs.filter(
-            Q(name__icontains=search_query) |
-            Q(ingredients__icontains=search_query) |
-            Q(method__icontains=search_query)
-        ).distinct()
+        recipes_qs = search.search(recipes_qs, search_query)
 
     if sort_by == 'time':
-        # Apply the complex sorting using your custom function
-        recipes = sorted(
-            recipes_qs, # Apply sorted() to the filtered queryset!
-            key=lambda r: parse_total_time_to_minutes(r.total_time)
-        )
+        # Recipes with an unreadable time go last
+        recipes = recipes_qs.order_by(F('total_minutes').asc(nulls_last=True), 'name')
     elif sort_by == 'rating':
         recipes = recipes_qs.order_by('-average_rating')
     elif sort_by == 'difficulty':
         recipes = recipes_qs.order_by('difficulty')
+    elif search_query and 'sort_by' not in request.GET:
+        # Searching without picking a sort shows the best matches first
+        recipes = recipes_qs.order_by('search_rank', 'name')
     else:
         if letter_filter:
             recipes_qs = recipes_qs.filter(name__istartswith=letter_filter)
@@ -71,6 +40,9 @@ def my_recipes(request):
     paginator = Paginator(recipes, 12)  # Show 12 recipes per page
     page_number = request.GET.get('page', 1)
     page = paginator.get_page(page_number)
+    if search_query:
+        page.object_list = list(page.object_list)
+        search.attach_snippets(page.object_list, search_query)
     
     # Create a list of letters for the filter (A-Z)
     alphabet = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
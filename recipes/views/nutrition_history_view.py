@@ -1,9 +1,9 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
-from django.db.models import Sum
 from datetime import timedelta, date
-from recipes.models import DailyLog, Meal
+from recipes.models import DailyLog
+from recipes.services import TimeSeriesService
 
 
 @login_required
@@ -28,28 +28,19 @@ def nutrition_history(request):
         date__range=[start_date, today]
     ).order_by('date')
     
-    #Fetch meals for the period
-    meals = Meal.objects.filter(
-        user=request.user,
-        date__range=[start_date, today]
-    )
-    
     #Create a map of date -> daily log for quick lookup
     log_map = {log.date: log for log in daily_logs}
     
-    meals_by_date = {}
-    for meal in meals:
-        if meal.date not in meals_by_date:
-            meals_by_date[meal.date] = {
-                'calories': 0,
-                'protein': 0,
-                'carbs': 0,
-                'fat': 0,
-            }
-        meals_by_date[meal.date]['calories'] += meal.calories
-        meals_by_date[meal.date]['protein'] += meal.protein_g
-        meals_by_date[meal.date]['carbs'] += meal.carbs_g
-        meals_by_date[meal.date]['fat'] += meal.fat_g
+    #Per-day consumed totals for the period, from the DailyNutrition rollups
+    meals_by_date = {
+        point['start']: {
+            'calories': point['calories'],
+            'protein': point['protein_g'],
+            'carbs': point['carbs_g'],
+            'fat': point['fat_g'],
+        }
+        for point in TimeSeriesService(request.user).series('nutrition', start_date, today, 'day')
+    }
     
     #Build chart data
     chart_labels = []
@@ -1,5 +1,5 @@
 from django.contrib import messages
-from django.contrib.auth import login
+from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic.edit import FormView
 from django.urls import reverse
@@ -36,12 +36,12 @@ class PasswordView(LoginRequiredMixin, FormView):
         Handle successful password form submission.
 
         If the form validates successfully, the user's password is updated.
-        The user is then re-authenticated to maintain their session without
-        requiring them to log in again.
+        The session is then moved to the new password hash, keeping the backend
+        it was signed in with, so the user isn't asked to log in again.
         """
 
         form.save()
-        login(self.request, self.request.user)
+        update_session_auth_hash(self.request, self.request.user)
         return super().form_valid(form)
 
     def get_success_url(self):
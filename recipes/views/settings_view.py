@@ -3,7 +3,6 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView
 from django.http import JsonResponse
 from recipes.forms import SettingsForm
-from recipes.models import Profile
 
 
 class SettingsView(LoginRequiredMixin, TemplateView):
@@ -20,18 +19,13 @@ class SettingsView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         """Add settings form to the context."""
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        
-        # Get or create profile for the user
-        profile, _ = Profile.objects.get_or_create(user=user)
-        context['settings_form'] = SettingsForm(instance=profile)
+        context['settings_form'] = SettingsForm(instance=self.request.profile)
         
         return context
     
     def post(self, request, *args, **kwargs):
         """Handle form submission to update settings (supports AJAX)."""
-        user = request.user
-        profile, _ = Profile.objects.get_or_create(user=user)
+        profile = request.profile
         settings_form = SettingsForm(request.POST, instance=profile)
         
         # Check if this is an AJAX request
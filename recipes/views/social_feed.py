@@ -3,58 +3,107 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.views.decorators.http import require_POST
 from django.db import transaction
-from django.db.models import F, Q, Avg
+from django.db.models import F, Q, FilteredRelation, Prefetch
+from django.db.models.functions import Greatest
 from django.template.loader import render_to_string
 from recipes.models import Post, Like, Comment, Save, Rating, Follow, User, Tag
 from recipes.forms.post_form import PostForm 
-from recipes.helpers import is_liked_util, is_saved_util, is_followed_util, get_rating_util
+from recipes.services import TimelineService
+from recipes.helpers import decode_feed_cursor, encode_feed_cursor
 
-@login_required
-def feed(request):
+FEED_PAGE_SIZE = 10
+COMMENT_PREVIEW_SIZE = 3
+COMMENT_PAGE_SIZE = 10
+SAVED_SIDEBAR_SIZE = 20
+
+
+def _latest_comments_prefetch():
+    """Prefetch only the newest comments of each post, picked per post with a window function."""
+    latest = Comment.objects.select_related('user').order_by('-created_at', '-id')[:COMMENT_PREVIEW_SIZE]
+    return Prefetch('comments', queryset=latest, to_attr='preview_comments')
+
+
+def _feed_queryset(request):
+    """
+    Build the ordered feed queryset for the filters in the request's query string.
+
+    Returns the queryset and the (created_at, id) fields to page on. The
+    followed-only feed reads the viewer's materialised timeline, so it pages
+    on the timeline's own copy of those columns.
+    """
     show_followed_only = request.GET.get('followed') == 'true'
-    sort_by = request.GET.get('sort', 'newest')  # NEW
-    cuisine_filter = request.GET.get('cuisine', '')  # NEW
-    tag_filter = request.GET.get('tag', '')  # NEW
+    sort_by = request.GET.get('sort', 'newest')
+    cuisine_filter = request.GET.get('cuisine', '')
+    tag_filter = request.GET.get('tag', '')
 
     if show_followed_only:
-        followed_ids = Follow.objects.filter(follower=request.user).values_list('followed_id', flat=True)
-        posts = Post.objects.filter(Q(author__in=followed_ids) | Q(author=request.user)).select_related('author').prefetch_related('tags', 'comments__user')
+        posts = Post.objects.alias(
+            timeline=FilteredRelation('timeline_entries', condition=Q(timeline_entries__user=request.user))
+        ).alias(
+            timeline_created_at=F('timeline__created_at'),
+            timeline_post_id=F('timeline__post_id'),
+        ).filter(timeline_post_id__isnull=False)
+        keys = ('timeline_created_at', 'timeline_post_id')
     else:
-        posts = Post.objects.all().select_related('author').prefetch_related('tags', 'comments__user')
+        posts = Post.objects.all()
+        keys = ('created_at', 'id')
+    posts = posts.select_related('author').prefetch_related('tags', _latest_comments_prefetch()).with_viewer_state(request.user)
     if cuisine_filter:
         posts = posts.filter(cuisine=cuisine_filter)
     if tag_filter:
         posts = posts.filter(tags__name=tag_filter)
     if sort_by == 'top_rated':
-        posts = posts.annotate(calculated_average=Avg('ratings__score')).order_by('-calculated_average', '-created_at', '-id')
+        posts = posts.order_by('-ranking_score', *[f'-{key}' for key in keys])
     else:
-        posts = posts.order_by('-created_at', '-id')
+        posts = posts.order_by(*[f'-{key}' for key in keys])
+    return posts, keys
 
-    saved_posts = Post.objects.filter(saves__user=request.user).select_related('author').prefetch_related('tags', 'comments__user').order_by('-saves__created_at')
 
-    main_posts_list = list(posts)
-    saved_posts_list = list(saved_posts)
-    all_posts_combined = main_posts_list + saved_posts_list
-    
-    post_ids = {p.id for p in all_posts_combined} 
-    
-    liked_posts_set = set(Like.objects.filter(user=request.user, post_id__in=post_ids).values_list('post_id', flat=True))
-    saved_posts_set = set(Save.objects.filter(user=request.user, post_id__in=post_ids).values_list('post_id', flat=True))
-    user_ratings_dict = {r.post_id: r.score for r in Rating.objects.filter(user=request.user, post_id__in=post_ids)}
-    
-    author_ids = {p.author_id for p in all_posts_combined}
-    following_status = Follow.objects.filter(follower=request.user, followed_id__in=author_ids).values_list('followed_id', flat=True)
-    is_following_map = {author_id: True for author_id in following_status}
-    
-    def attach_attrs(post_list):
-        for post in post_list:
-            post.is_liked_by_user = post.id in liked_posts_set
-            post.is_saved_by_user = post.id in saved_posts_set
-            post.user_rating_score = user_ratings_dict.get(post.id, 0)
-            post.is_followed_by_user = is_following_map.get(post.author_id, False)
+def _paginate_feed(posts, keys, sort_by, cursor):
+    """
+    Return one page of posts after the cursor, plus the cursor for the next page.
+
+    Pages are keyed on (created_at, id), with the stored ranking score in front
+    for top_rated, so each page is a bounded range read however many posts exist.
+    """
+    position = decode_feed_cursor(cursor)
+    if position:
+        created_at, post_id = position['created_at'], position['id']
+        created_key, id_key = keys
+        after_position = Q(**{f'{created_key}__lt': created_at}) | Q(**{created_key: created_at, f'{id_key}__lt': post_id})
+        if sort_by == 'top_rated':
+            rating = position['rating'] if position['rating'] is not None else Post.RANKING_PRIOR_MEAN
+            after_position = Q(ranking_score__lt=rating) | (Q(ranking_score=rating) & after_position)
+        posts = posts.filter(after_position)
 
-    attach_attrs(main_posts_list)
-    attach_attrs(saved_posts_list)
+    page = list(posts[:FEED_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(page) > FEED_PAGE_SIZE:
+        page = page[:FEED_PAGE_SIZE]
+        last = page[-1]
+        next_cursor = encode_feed_cursor(last, last.ranking_score if sort_by == 'top_rated' else None)
+    return page, next_cursor
+
+
+def _adjust_counter(post, field, delta):
+    """Atomically shift one of the post's denormalised counters and reload it."""
+    Post.objects.filter(pk=post.pk).update(**{field: Greatest(F(field) + delta, 0)})
+    post.refresh_from_db(fields=[field])
+
+
+@login_required
+def feed(request):
+    show_followed_only = request.GET.get('followed') == 'true'
+    sort_by = request.GET.get('sort', 'newest')
+    cuisine_filter = request.GET.get('cuisine', '')
+    tag_filter = request.GET.get('tag', '')
+
+    posts, keys = _feed_queryset(request)
+    main_posts_list, next_cursor = _paginate_feed(posts, keys, sort_by, request.GET.get('cursor'))
+
+    saved_posts = Post.objects.filter(saves__user=request.user).select_related('author').with_viewer_state(request.user).order_by('-saves__created_at')
+    # The sidebar shows the most recent saves; posts saved from the feed are added to the top of it
+    saved_posts_list = list(saved_posts[:SAVED_SIDEBAR_SIZE])
 
     form = PostForm()
 
@@ -64,6 +113,7 @@ def feed(request):
     context = {
         'posts': main_posts_list,
         'saved_posts': saved_posts_list,
+        'next_cursor': next_cursor,
         'show_followed_only': show_followed_only,
         'form': form,
         'all_cuisines': all_cuisines,
@@ -74,6 +124,25 @@ def feed(request):
     }
     return render(request, 'recipes/feed.html', context)
 
+@login_required
+def feed_page(request):
+    """Return the next page of feed cards as an HTML fragment for infinite scroll."""
+    if not request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return HttpResponseBadRequest("Must be an AJAX request.")
+
+    cursor = request.GET.get('cursor', '')
+    if not decode_feed_cursor(cursor):
+        return HttpResponseBadRequest("Invalid cursor.")
+
+    posts, keys = _feed_queryset(request)
+    posts, next_cursor = _paginate_feed(posts, keys, request.GET.get('sort', 'newest'), cursor)
+
+    html = ''.join(
+        render_to_string('recipes/partials/post_card.html', {'post': post}, request=request)
+        for post in posts
+    )
+    return JsonResponse({'html': html, 'next_cursor': next_cursor})
+
 @login_required
 @require_POST
 def toggle_like(request, post_id):
@@ -87,15 +156,15 @@ def toggle_like(request, post_id):
         with transaction.atomic():
             like_query = Like.objects.filter(user=request.user, post=post)
             if like_query.exists():
-                like_query.delete()
+                removed, _ = like_query.delete()
+                _adjust_counter(post, 'like_count', -removed)
                 liked = False
             else:
                 Like.objects.create(user=request.user, post=post)
+                _adjust_counter(post, 'like_count', 1)
                 liked = True
             
-            current_count = post.likes.count()
-            
-            return JsonResponse({'liked': liked, 'likes_count': current_count})
+            return JsonResponse({'liked': liked, 'likes_count': post.like_count})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -111,12 +180,16 @@ def toggle_save(request, post_id):
     try:
         save_query = Save.objects.filter(user=request.user, post=post)
         if save_query.exists():
-            save_query.delete()
+            with transaction.atomic():
+                removed, _ = save_query.delete()
+                _adjust_counter(post, 'save_count', -removed)
             saved = False
 
             return JsonResponse({'saved': saved})
         else:
-            Save.objects.create(user=request.user, post=post)
+            with transaction.atomic():
+                Save.objects.create(user=request.user, post=post)
+                _adjust_counter(post, 'save_count', 1)
             saved = True
             
             sidebar_html = render_to_string('recipes/partials/saved_card.html', {'post': post}, request=request)
@@ -134,6 +207,7 @@ def delete_post(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     
     if request.user == post.author:
+        # Likes, comments and saves cascade with the post, taking its counters with them
         post.delete()
         
     return redirect('feed')
@@ -165,7 +239,8 @@ def submit_rating(request, post_id):
                 rating_obj.score = score
                 rating_obj.save()
             
-            post.save()
+            post.save(update_fields=['rating_total_score', 'rating_count'])
+            Post.objects.filter(pk=post.pk).update(ranking_score=Post.ranking_score_expression())
             post.refresh_from_db() 
             
             return JsonResponse({
@@ -189,16 +264,49 @@ def submit_comment(request, post_id):
         return HttpResponseBadRequest("Comment cannot be empty.")
         
     try:
-        new_comment = Comment.objects.create(user=request.user, post=post, text=text)
+        with transaction.atomic():
+            new_comment = Comment.objects.create(user=request.user, post=post, text=text)
+            _adjust_counter(post, 'comment_count', 1)
         html_comment = render_to_string('recipes/partials/comment_fragment.html', {'comment': new_comment})
         return JsonResponse({
             'success': True,
             'comment_html': html_comment,
-            'comments_count': post.comments.count()
+            'comments_count': post.comment_count
         })
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+@login_required
+def post_comments(request, post_id):
+    """Return a page of a post's comments older than the `before` comment as rendered fragments."""
+    if not request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return HttpResponseBadRequest("Must be an AJAX request.")
+
+    post = get_object_or_404(Post, id=post_id)
+    comments = post.comments.select_related('user').order_by('-created_at', '-id')
+
+    before_id = request.GET.get('before')
+    if before_id:
+        try:
+            anchor = post.comments.values('created_at', 'id').get(id=int(before_id))
+        except (ValueError, Comment.DoesNotExist):
+            return HttpResponseBadRequest("Invalid comment cursor.")
+        comments = comments.filter(
+            Q(created_at__lt=anchor['created_at']) | Q(created_at=anchor['created_at'], id__lt=anchor['id'])
+        )
+
+    page = list(comments[:COMMENT_PAGE_SIZE + 1])
+    next_before = None
+    if len(page) > COMMENT_PAGE_SIZE:
+        page = page[:COMMENT_PAGE_SIZE]
+        next_before = page[-1].id
+
+    html = ''.join(
+        render_to_string('recipes/partials/comment_fragment.html', {'comment': comment})
+        for comment in reversed(page)
+    )
+    return JsonResponse({'html': html, 'next_before': next_before})
+
 @login_required
 @require_POST
 def toggle_follow(request, author_id):
@@ -212,12 +320,16 @@ def toggle_follow(request, author_id):
     is_following = False
     try:
         follow_query = Follow.objects.filter(follower=request.user, followed=target_user)
-        if follow_query.exists():
-            follow_query.delete()
-            is_following = False
-        else:
-            Follow.objects.create(follower=request.user, followed=target_user)
-            is_following = True
+        timeline = TimelineService(request.user)
+        with transaction.atomic():
+            if follow_query.exists():
+                follow_query.delete()
+                timeline.unfollow(target_user)
+                is_following = False
+            else:
+                Follow.objects.create(follower=request.user, followed=target_user)
+                timeline.follow(target_user)
+                is_following = True
         return JsonResponse({'is_following': is_following})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -229,8 +341,10 @@ def create_post(request):
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
-            post.save()
-            form.save_m2m()
+            with transaction.atomic():
+                post.save()
+                form.save_m2m()
+                TimelineService(request.user).publish(post)
             return redirect('feed')
         else:
             # Form is invalid, redirect to feed
@@ -240,14 +354,11 @@ def create_post(request):
 
 @login_required
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    
-    post.is_liked_by_user = Like.objects.filter(user=request.user, post=post).exists()
-    post.is_saved_by_user = Save.objects.filter(user=request.user, post=post).exists()
-    post.is_followed_by_user = Follow.objects.filter(follower=request.user, followed=post.author).exists()
-    
-    user_rating = Rating.objects.filter(user=request.user, post=post).first()
-    post.user_rating_score = user_rating.score if user_rating else 0
+    comments = Comment.objects.select_related('user').order_by('created_at', 'id')
+    posts = Post.objects.select_related('author').prefetch_related(
+        'tags', Prefetch('comments', queryset=comments)
+    ).with_viewer_state(request.user)
+    post = get_object_or_404(posts, id=post_id)
 
     return render(request, 'recipes/post_detail.html', {'post': post})
 
@@ -0,0 +1,66 @@
+import io
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
+from recipes.services import TrackerTransferService
+from recipes.services.tracker_transfer_service import TrackerImportError
+
+
+@login_required
+@require_GET
+def export_tracker_data(request):
+    """
+    Stream the user's tracker history as a download.
+
+    ?format=jsonl (the default) exports every dataset as JSON Lines;
+    ?format=csv&dataset=<name> exports one dataset as CSV.
+    """
+    service = TrackerTransferService(request.user)
+    export_format = request.GET.get('format', 'jsonl')
+
+    if export_format == 'jsonl':
+        response = StreamingHttpResponse(service.export_jsonl(), content_type='application/x-ndjson')
+        filename = 'foodle-tracker.jsonl'
+    elif export_format == 'csv':
+        dataset = request.GET.get('dataset')
+        if dataset not in service.DATASETS:
+            return JsonResponse({'error': f"dataset must be one of: {', '.join(service.DATASETS)}"}, status=400)
+        response = StreamingHttpResponse(service.export_csv(dataset), content_type='text/csv')
+        filename = f'foodle-{dataset}.csv'
+    else:
+        return JsonResponse({'error': 'format must be jsonl or csv'}, status=400)
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+@require_POST
+def import_tracker_data(request):
+    """
+    Import tracker history from an uploaded file.
+
+    A .csv upload needs a dataset field naming what it holds; any other file is
+    read as JSON Lines. The file is read line by line and the import is all or
+    nothing. Responds with the number of records written per dataset.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'error': 'Upload a file in the file field'}, status=400)
+
+    service = TrackerTransferService(request.user)
+    lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        if upload.name.lower().endswith('.csv'):
+            dataset = request.POST.get('dataset')
+            if dataset not in service.DATASETS:
+                return JsonResponse({'error': f"dataset must be one of: {', '.join(service.DATASETS)}"}, status=400)
+            counts = service.import_csv(dataset, lines)
+        else:
+            counts = service.import_jsonl(lines)
+    except TrackerImportError as error:
+        return JsonResponse({'error': str(error), 'line': error.line}, status=400)
+    except UnicodeDecodeError:
+        return JsonResponse({'error': 'File must be UTF-8 text'}, status=400)
+
+    return JsonResponse({'imported': counts})
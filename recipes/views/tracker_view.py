@@ -1,9 +1,12 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum
 from django.utils import timezone
 from datetime import date, timedelta
-from recipes.models import Meal, Profile, DailyLog, FastingSession
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from recipes.models import Meal, DailyLog, FastingSession
+from recipes.services import TimeSeriesService, UserStatsService
 
 def get_accounting_date():
     """
@@ -17,21 +20,42 @@ def get_accounting_date():
         return now.date() - timedelta(days=1)
     return now.date()
 
+def _add_water(user, profile, day, amount):
+    """
+    Add water to the day's log in place, never going below zero.
+
+    The common case is a single UPDATE with an F() expression, so concurrent
+    requests can't overwrite each other. The first entry of a day inserts the
+    log instead, retrying as an update if another request inserted it first.
+    """
+    increment = {'amount_ml': Greatest(F('amount_ml') + amount, 0)}
+    todays_log = DailyLog.objects.filter(user=user, date=day)
+    if not todays_log.update(**increment):
+        try:
+            with transaction.atomic():
+                DailyLog.objects.create(
+                    user=user,
+                    date=day,
+                    calorie_goal=profile.calorie_goal,
+                    protein_goal=profile.protein_goal,
+                    carbs_goal=profile.carbs_goal,
+                    fat_goal=profile.fat_goal,
+                    water_goal=2500,
+                    amount_ml=max(0, amount)
+                )
+            return
+        except IntegrityError:
+            todays_log.update(**increment)
+    #update() sends no signals, so drop the cached views of the water total here
+    UserStatsService.invalidate(user.pk)
+    TimeSeriesService.invalidate(user.pk, 'water')
+
 @login_required
 def tracker(request):
     today = get_accounting_date()
     
-    #Get or create user profile, default is 2000 calories per day
-    profile, _ = Profile.objects.get_or_create(
-        user=request.user,
-        defaults={
-            'calorie_goal': 2000,
-            'protein_goal': 150,
-            'carbs_goal': 250,
-            'fat_goal': 70,
-            'fasting_goal': 16
-        }
-    )
+    #Loaded with the user by ProfileMiddleware and shared with the context processors
+    profile = request.profile
 
     #Handle POST requests
     if request.method == 'POST':
@@ -40,59 +64,30 @@ def tracker(request):
         #Handle water intake actions
         if action == 'update_water':
             amount = int(request.POST.get('amount', 0))
-            daily_log = DailyLog.objects.filter(user=request.user, date=today).first()
-            if not daily_log:
-                daily_log = DailyLog.objects.create(
-                    user=request.user,
-                    date=today,
-                    calorie_goal=profile.calorie_goal,
-                    protein_goal=profile.protein_goal,
-                    carbs_goal=profile.carbs_goal,
-                    fat_goal=profile.fat_goal,
-                    water_goal=2500,
-                    amount_ml=0
-                )
-            #Update amount, ensuring it doesn't go below 0
-            new_amount = daily_log.amount_ml + amount
-            daily_log.amount_ml = max(0, new_amount)
-            daily_log.save()
+            _add_water(request.user, profile, today, amount)
             return redirect('tracker')
         
         #Handle goal updates
         elif action == 'update_goals':
-            calorie_goal = int(request.POST.get('calorie_goal', 2500))
-            protein_goal = int(request.POST.get('protein_goal', 187))
-            carbs_goal = int(request.POST.get('carbs_goal', 250))
-            fat_goal = int(request.POST.get('fat_goal', 83))
+            goals = {
+                'calorie_goal': int(request.POST.get('calorie_goal', 2500)),
+                'protein_goal': int(request.POST.get('protein_goal', 187)),
+                'carbs_goal': int(request.POST.get('carbs_goal', 250)),
+                'fat_goal': int(request.POST.get('fat_goal', 83)),
+            }
             water_goal = int(request.POST.get('water_goal', 2500))
             
-            # Get or create DailyLog for today
-            daily_log, _ = DailyLog.objects.get_or_create(
+            #Update or create today's DailyLog with the new goals
+            DailyLog.objects.update_or_create(
                 user=request.user,
                 date=today,
-                defaults={
-                    'calorie_goal': profile.calorie_goal,
-                    'protein_goal': profile.protein_goal,
-                    'carbs_goal': profile.carbs_goal,
-                    'fat_goal': profile.fat_goal,
-                    'water_goal': 2500,
-                }
+                defaults={**goals, 'water_goal': water_goal},
             )
             
-            # Update DailyLog goals
-            daily_log.calorie_goal = calorie_goal
-            daily_log.protein_goal = protein_goal
-            daily_log.carbs_goal = carbs_goal
-            daily_log.fat_goal = fat_goal
-            daily_log.water_goal = water_goal
-            daily_log.save()
-            
             # Update Profile defaults (so tomorrow uses these as defaults)
-            profile.calorie_goal = calorie_goal
-            profile.protein_goal = protein_goal
-            profile.carbs_goal = carbs_goal
-            profile.fat_goal = fat_goal
-            profile.save()
+            for field, value in goals.items():
+                setattr(profile, field, value)
+            profile.save(update_fields=list(goals))
             
             return redirect('tracker')
         
@@ -133,6 +128,9 @@ def tracker(request):
                 is_active=False,
                 end_date_time=timezone.now()
             )
+            #update() sends no signals, so the completed fast has to drop the cached stats here
+            UserStatsService.invalidate(request.user.pk)
+            TimeSeriesService.invalidate(request.user.pk, 'fasting')
             return redirect('tracker')
     
     
@@ -179,27 +177,38 @@ def tracker(request):
         fasting_status['start_time'] = active_fasting.start_date_time.isoformat()
         fasting_status['start_timestamp'] = active_fasting.start_date_time.timestamp() * 1000
     
-    #Get today's meals
-    today_meals = Meal.objects.filter(
-        user=request.user,
-        date=today
-    )
-    
-    #Calculate totals from meals
-    totals = today_meals.aggregate(
-        total_calories=Sum('calories'),
-        total_protein=Sum('protein_g'),
-        total_carbs=Sum('carbs_g'),
-        total_fat=Sum('fat_g')
-    )
-    
+    #Sum today's macros while grouping the meals by type, so they are read in one query
+    meals_dict = {
+        'Breakfast': [],
+        'Lunch': [],
+        'Dinner': [],
+        'Snacks': [], 
+    }
     macros_consumed = {
-        'calories': int(totals['total_calories'] or 0),
-        'protein': float(totals['total_protein'] or 0),
-        'carbs': float(totals['total_carbs'] or 0) if totals['total_carbs'] is not None else 0.0,
-        'fat': float(totals['total_fat'] or 0) if totals['total_fat'] is not None else 0.0,
+        'calories': 0,
+        'protein': 0.0,
+        'carbs': 0.0,
+        'fat': 0.0,
     }
     
+    for meal in Meal.objects.filter(user=request.user, date=today):
+        macros_consumed['calories'] += meal.calories
+        macros_consumed['protein'] += meal.protein_g
+        macros_consumed['carbs'] += meal.carbs_g
+        macros_consumed['fat'] += meal.fat_g
+
+        meal_data = {
+            'id': meal.id,
+            'title': meal.name,
+            'calories': meal.calories,
+            'protein': meal.protein_g,
+            'carbs': meal.carbs_g,
+            'fat': meal.fat_g,
+        }
+
+        meal_type = 'Snacks' if meal.meal_type == 'Snack' else meal.meal_type
+        if meal_type in meals_dict:
+            meals_dict[meal_type].append(meal_data)
 
     daily_goals = {
         'calories': int(daily_log.calorie_goal or 2000),
@@ -231,28 +240,6 @@ def tracker(request):
     
     water_pct = min(100, max(0, int((water_intake / daily_goals['water']) * 100))) if daily_goals['water'] > 0 else 0
     
-    #Organize meals by type
-    meals_dict = {
-        'Breakfast': [],
-        'Lunch': [],
-        'Dinner': [],
-        'Snacks': [], 
-    }
-    
-    for meal in today_meals:
-        meal_data = {
-            'id': meal.id,
-            'title': meal.name,
-            'calories': meal.calories,
-            'protein': meal.protein_g,
-            'carbs': meal.carbs_g,
-            'fat': meal.fat_g,
-        }
-
-        meal_type = 'Snacks' if meal.meal_type == 'Snack' else meal.meal_type
-        if meal_type in meals_dict:
-            meals_dict[meal_type].append(meal_data)
-    
     context = {
         'daily_log': daily_log,
         'daily_goals': daily_goals,
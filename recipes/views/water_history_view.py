@@ -3,7 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from datetime import timedelta
 from recipes.models import DailyLog
-from django.db.models import Sum, Avg
+from recipes.services import TimeSeriesService
 import calendar
 
 @login_required
@@ -50,52 +50,22 @@ def water_history(request):
         # Guard for future navigation
         show_next = end_date < today
         
-        # Fetch all records for the month
-        intake_records = DailyLog.objects.filter(
-            user=request.user,
-            date__range=[start_date, end_date]
-        )
-        intake_map = {record.date: record.amount_ml for record in intake_records}
-        
-        # Aggregate by Week
-        # We iterate through the month week by week
-        current_week_start = start_date
-        
-        while current_week_start <= end_date:
-            # End of this partial week is either Sunday or Month End
-            days_until_sunday = 6 - current_week_start.weekday()
-            current_week_end = min(current_week_start + timedelta(days=days_until_sunday), end_date)
-            
-            # Calculate average for this specific week slice
-            total_ml = 0
-            days_count = 0
-            
-            iter_date = current_week_start
-            while iter_date <= current_week_end:
-                total_ml += intake_map.get(iter_date, 0)
-                days_count += 1
-                iter_date += timedelta(days=1)
-            
-            avg_intake = int(total_ml / days_count) if days_count > 0 else 0
-            
-            # Label
-            label = f"{current_week_start.strftime('%b %d')} - {current_week_end.strftime('%d')}"
+        # Average each week of the month, with the first and last weeks clipped to it
+        for point in TimeSeriesService(request.user).series('water', start_date, end_date, 'week'):
+            label = f"{point['start'].strftime('%b %d')} - {point['end'].strftime('%d')}"
             
             # Add to chart data
             chart_labels.append(label)
-            chart_data.append(avg_intake)
+            chart_data.append(point['average_ml'])
             
             # Add to table data
             table_data.append({
                 'range': label,
-                'avg_intake': avg_intake,
-                'total_intake': total_ml, # Optional extras
-                'days_count': days_count
+                'avg_intake': point['average_ml'],
+                'total_intake': point['total_ml'], # Optional extras
+                'days_count': point['days']
             })
             
-            # Move to next week
-            current_week_start = current_week_end + timedelta(days=1)
-            
     else:
         # --- Weekly Logic (Daily Data) ---
         
@@ -107,17 +77,10 @@ def water_history(request):
         # Guard for future navigation
         show_next = end_date < today
         
-        # Fetch data
-        intake_records = DailyLog.objects.filter(
-            user=request.user,
-            date__range=[start_date, end_date]
-        )
-        intake_map = {record.date: record.amount_ml for record in intake_records}
-        
         # Build 7 days of data
-        for i in range(7):
-            current_day = start_date + timedelta(days=i)
-            amount = intake_map.get(current_day, 0)
+        for point in TimeSeriesService(request.user).series('water', start_date, end_date, 'day'):
+            current_day = point['start']
+            amount = point['total_ml']
             
             # Chart Data
             chart_labels.append(current_day.strftime('%a %d'))